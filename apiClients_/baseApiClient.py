@@ -0,0 +1,99 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common_.utilities_ import commandTimer, customLogger
+from testData_.data import mainPageUrl
+
+# The same browser identity the UI tests use, so the site serves the same responses
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class BaseApiClient:
+    def __init__(self, baseUrl=mainPageUrl, cookies=None, poolSize=10, timeout=10):
+        """
+            Initialize an HTTP client for the requests the pages make, on a pooled requests.Session.
+
+            Args:
+                baseUrl (str): The site the relative paths are resolved against.
+                cookies (RequestsCookieJar): Cookies to start with, e.g. shared from a browser session.
+                poolSize (int): The number of keep-alive connections kept per host.
+                timeout (float): The timeout of every request in seconds.
+        """
+        self.baseUrl = baseUrl.rstrip("/")
+        self.timeout = timeout
+        self.poolSize = poolSize
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if cookies is not None:
+            self.session.cookies.update(cookies)
+
+    def share_cookies_from_driver(self, driver):
+        """
+            Copy the cookies of a browser session into the cookie jar, so the requests run as that visitor.
+        """
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+
+    def _request(self, method, path, **kwargs):
+        """
+            Send a request and return the response. The latency is recorded in the command histograms next to the
+            WebDriver commands. Network errors and timeouts are logged and end the check, like the page object helpers.
+        """
+        url = path if path.startswith("http") else f"{self.baseUrl}{path}"
+        startTime = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.Timeout as e:
+            customLogger.logger("ERROR", f"Error: Timeout waiting for the response of {method} {url}: {str(e)}")
+            exit(3)
+        except requests.RequestException as e:
+            customLogger.logger("ERROR", f"Error: The request {method} {url} failed: {str(e)}")
+            exit(5)
+        seconds = time.perf_counter() - startTime
+        commandTimer.record(f"http {method}", seconds, ("url", path.split("?")[0]), commandTimer.get_current_step())
+        customLogger.logger("INFO", "%s %s returned %s", method, url, response.status_code, event="api_request",
+                            method=method, url=url, status=response.status_code, durationMs=round(seconds * 1000, 3))
+        return response
+
+    def _get(self, path, **kwargs):
+        return self._request("GET", path, **kwargs)
+
+    def _post(self, path, **kwargs):
+        return self._request("POST", path, **kwargs)
+
+    def _run_concurrently(self, check, inputs, maxWorkers=8):
+        """
+            Run a check for many inputs at once. Every worker thread gets its own client (its own cookie jar, since the
+            checks change the visitor's state) seeded with this client's cookies; the connections are kept alive across
+            the inputs of a worker.
+
+            Args:
+                check (callable): Called as check(client, input) and returns the result of one input.
+                inputs (iterable): The inputs of the check.
+                maxWorkers (int): The number of inputs checked at the same time.
+
+            Returns:
+                dict: The result of every input.
+        """
+        workerClients = threading.local()
+
+        def run(value):
+            client = getattr(workerClients, "client", None)
+            if client is None:
+                client = workerClients.client = type(self)(self.baseUrl, self.session.cookies.copy(), self.poolSize,
+                                                           self.timeout)
+            return check(client, value)
+
+        inputs = list(inputs)
+        with ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix="api-check") as executor:
+            return dict(zip(inputs, executor.map(run, inputs)))
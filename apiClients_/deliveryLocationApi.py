@@ -0,0 +1,108 @@
+import html
+import json
+import re
+
+from apiClients_.baseApiClient import BaseApiClient
+from common_.utilities_ import customLogger
+
+
+class DeliveryLocationApi(BaseApiClient):
+    """
+        The GLUX (delivery location) requests behind the nav bar's "Deliver to" block and the location popup.
+    """
+    addressSelectionsPath = ("/portal-migration/hz/glow/get-rendered-address-selections?deviceType=desktop&pageType=Gateway"
+                             "&storeContext=NoStoreName&actionSource=desktop-modal")
+    addressChangePath = "/portal-migration/hz/glow/address-change?actionSource=glow"
+    locationLabelPath = "/portal-migration/hz/glow/get-location-label?storeContext=generic&pageType=Gateway&actionSource=desktop-modal"
+
+    # The token the home page hands to the popup's modal, and the token the popup uses for the address change
+    __modalTokenPattern = re.compile(r'anti-csrftoken-a2z(?:&quot;|")\s*:\s*(?:&quot;|")([^&"]+)')
+    __csrfTokenPattern = re.compile(r'CSRF_TOKEN\s*:\s*"([^"]+)"')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__csrfToken = None
+
+    def __get_csrf_token(self):
+        """
+            Get the CSRF token of the address change the same way the popup does: the home page carries the token of the
+            address selections modal, and the modal carries the token of the address change.
+        """
+        if self.__csrfToken is not None:
+            return self.__csrfToken
+        homePage = self._get("/").text
+        modalToken = self.__modalTokenPattern.search(homePage)
+        if modalToken is None:
+            customLogger.logger("ERROR", "Error: The home page has no token for the delivery location popup")
+            exit(2)
+        selections = self._get(self.addressSelectionsPath, headers={"anti-csrftoken-a2z": html.unescape(modalToken.group(1)),
+                                                                     "X-Requested-With": "XMLHttpRequest"}).text
+        csrfToken = self.__csrfTokenPattern.search(selections)
+        if csrfToken is None:
+            customLogger.logger("ERROR", "Error: The delivery location popup has no CSRF token for the address change")
+            exit(2)
+        self.__csrfToken = csrfToken.group(1)
+        return self.__csrfToken
+
+    def __change_address(self, payload):
+        """
+            Send an address change like the popup's Apply and Done buttons do and return the JSON answer.
+        """
+        payload = {**payload, "deviceType": "web", "storeContext": "generic", "pageType": "Gateway", "actionSource": "glow"}
+        response = self._post(self.addressChangePath, data=json.dumps(payload),
+                              headers={"anti-csrftoken-a2z": self.__get_csrf_token(), "Content-Type": "application/json",
+                                       "X-Requested-With": "XMLHttpRequest"})
+        try:
+            return response.json()
+        except ValueError:
+            return {}
+
+    def update_location_by_zip_code(self, zipCode):
+        """
+            Update the delivery location by a zip code.
+
+            Returns:
+                bool: True if the site accepted the zip code (the popup shows no validation message) and updated the
+                    address.
+        """
+        answer = self.__change_address({"locationType": "LOCATION_INPUT", "zipCode": str(zipCode)})
+        if not answer.get("isValidAddress"):
+            return False
+        if "isAddressUpdated" not in answer:
+            customLogger.logger("ERROR", f"Error: The address change of the zip code {zipCode} accepted it but did not say "
+                                         f"whether the address was updated: {answer}")
+            exit(2)
+        return bool(answer["isAddressUpdated"])
+
+    def update_location_by_country_code(self, countryCode):
+        """
+            Update the delivery location by a country code (e.g. 'CA'), like selecting a country in the popup.
+        """
+        answer = self.__change_address({"locationType": "COUNTRY", "district": countryCode, "countryCode": countryCode})
+        return bool(answer.get("isValidAddress", answer.get("isAddressUpdated")))
+
+    def get_delivery_location_label(self):
+        """
+            Get the text of the nav bar's delivery location line, e.g. 'Los Angeles 90001'.
+        """
+        try:
+            label = self._get(self.locationLabelPath, headers={"X-Requested-With": "XMLHttpRequest"}).json()
+        except ValueError:
+            return ""
+        text = label.get("deliveryLine2") or label.get("deliveryShortLine") or ""
+        # The site pads the line with invisible characters
+        return re.sub("[\u200b-\u200d\ufeff]", "", html.unescape(text)).strip()
+
+    def check_zip_codes(self, zipCodes, maxWorkers=8):
+        """
+            Update the delivery location by every zip code concurrently and read the resulting delivery location line.
+            Every worker thread is a separate visitor, so the zip codes of different workers do not overwrite each other.
+
+            Returns:
+                dict: {zipCode: {"isValid": bool, "deliveryLocation": str}}
+        """
+        def check(client, zipCode):
+            isValid = client.update_location_by_zip_code(zipCode)
+            return {"isValid": isValid, "deliveryLocation": client.get_delivery_location_label() if isValid else None}
+
+        return self._run_concurrently(check, zipCodes, maxWorkers)
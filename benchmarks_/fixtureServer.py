@@ -0,0 +1,42 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures_")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    def __init__(self, directory=FIXTURES_DIRECTORY, host="127.0.0.1", port=0):
+        """
+            Initialize a local HTTP server for the stand-in site (the nav bar and the GLUX popup of the home page).
+        """
+        self.__server = ThreadingHTTPServer((host, port), functools.partial(_QuietHandler, directory=directory))
+        self.__server.daemon_threads = True
+
+    @property
+    def url(self):
+        """
+            The URL of the stand-in home page.
+        """
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}/index.html"
+
+    def start(self):
+        """
+            Start serving in a background thread.
+        """
+        threading.Thread(target=self.__server.serve_forever, name="fixture-server", daemon=True).start()
+        return self
+
+    def stop(self):
+        """
+            Stop serving.
+        """
+        self.__server.shutdown()
+        self.__server.server_close()
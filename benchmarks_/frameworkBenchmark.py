@@ -0,0 +1,258 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.events import EventFiringWebDriver
+
+from benchmarks_.fixtureServer import FixtureServer
+from common_.utilities_ import commandTimer, customLogger, driverPool, profileTemplate, projectPaths
+from common_.utilities_.customListener import CustomListener
+from pages_.basePage import BasePage
+from pages_.navigationBar_.navigationBar import NavigationBar
+from pages_.navigationBar_.updateDeliveryLocationPopup import UpdateDeliveryLocationPopup
+from testData_.data import zipCodeData
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results_")
+HISTORY_FILE = os.path.join(RESULTS_DIRECTORY, "history.jsonl")
+BASELINE_FILE = os.path.join(RESULTS_DIRECTORY, "baseline.json")
+# Calls per sample for the micro benchmarks that do not touch the browser
+MICRO_BATCH = 1000
+# The profile template of the time-to-first-navigation benchmark, primed with the stand-in site
+BENCHMARK_TEMPLATE_NAME = "benchmark"
+
+_benchmarks = []
+
+
+def benchmark(name, needsBrowser=False, perCall=1):
+    """
+        Register a benchmark. The function gets the benchmark context and is timed once per sample.
+        perCall divides each sample, for functions that run the measured operation in a batch.
+    """
+    def register(function):
+        _benchmarks.append(SimpleNamespace(name=name, needsBrowser=needsBrowser, perCall=perCall, function=function))
+        return function
+    return register
+
+
+class BenchmarkContext:
+    def __init__(self, withBrowser):
+        """
+            Initialize what the benchmarks run against: the local stand-in site and a raw and an event firing driver.
+        """
+        self.fixtureServer = FixtureServer().start() if withBrowser else None
+        self.__templateBuilt = False
+        self.rawDriver = driverPool.launch_chrome() if withBrowser else None
+        self.driver = EventFiringWebDriver(self.rawDriver, CustomListener(self.rawDriver)) if withBrowser else None
+        self.fakeDriver = SimpleNamespace(capabilities={"browserName": "chrome", "browserVersion": "0", "platformName": "any"})
+
+    def build_template(self):
+        """
+            Build the benchmark profile template from the stand-in site, once per run and only when a benchmark that
+            starts from it is selected (the warm-up run of that benchmark absorbs the build).
+        """
+        if not self.__templateBuilt:
+            profileTemplate.build_template(primeUrls=(self.fixtureServer.url,), force=True, name=BENCHMARK_TEMPLATE_NAME)
+            self.__templateBuilt = True
+
+    def load_home_page(self):
+        self.rawDriver.get(self.fixtureServer.url)
+
+    def close(self):
+        if self.rawDriver is not None:
+            self.rawDriver.quit()
+        if self.fixtureServer is not None:
+            self.fixtureServer.stop()
+
+
+@benchmark("logger.enabled", perCall=MICRO_BATCH)
+def _logger_enabled(context):
+    for index in range(MICRO_BATCH):
+        customLogger.logger("INFO", "Benchmark message %s", index, event="benchmark")
+
+
+@benchmark("logger.disabled", perCall=MICRO_BATCH)
+def _logger_disabled(context):
+    for index in range(MICRO_BATCH):
+        customLogger.logger("DEBUG", "Benchmark message %s", index, event="benchmark")
+
+
+@benchmark("listener.find_hooks", perCall=MICRO_BATCH)
+def _listener_find_hooks(context):
+    listener = CustomListener(context.fakeDriver)
+    for _ in range(MICRO_BATCH):
+        listener.before_find(By.ID, "glow-ingress-line2", context.fakeDriver)
+        listener.after_find(By.ID, "glow-ingress-line2", context.fakeDriver)
+
+
+@benchmark("commandTimer.record", perCall=MICRO_BATCH)
+def _command_timer_record(context):
+    for _ in range(MICRO_BATCH):
+        commandTimer.record("find", 0.001, (By.ID, "glow-ingress-line2"), "NavigationBar.click_update_location_button")
+
+
+@benchmark("driver.startup", needsBrowser=True)
+def _driver_startup(context):
+    driverPool.launch_chrome().quit()
+
+
+def _launch_and_navigate(context, useProfileTemplate):
+    if useProfileTemplate:
+        context.build_template()
+    driver = driverPool.launch_chrome(useProfileTemplate=useProfileTemplate, templateName=BENCHMARK_TEMPLATE_NAME)
+    try:
+        driver.get(context.fixtureServer.url)
+    finally:
+        driver.quit()
+        profileTemplate.remove_clone(driver)
+
+
+@benchmark("driver.first_navigation", needsBrowser=True)
+def _first_navigation(context):
+    _launch_and_navigate(context, useProfileTemplate=False)
+
+
+@benchmark("driver.first_navigation.template", needsBrowser=True)
+def _first_navigation_from_template(context):
+    _launch_and_navigate(context, useProfileTemplate=True)
+
+
+@benchmark("helper.find_element.raw", needsBrowser=True)
+def _find_element_raw(context):
+    BasePage(context.rawDriver)._find_element((By.ID, "glow-ingress-line2"))
+
+
+@benchmark("helper.find_element", needsBrowser=True)
+def _find_element(context):
+    BasePage(context.driver)._find_element((By.ID, "glow-ingress-line2"))
+
+
+@benchmark("helper.click_to_element", needsBrowser=True)
+def _click_to_element(context):
+    page = BasePage(context.driver)
+    page._click_to_element(page._find_element((By.ID, "nav-hamburger-menu")))
+
+
+@benchmark("helper.fill_field", needsBrowser=True)
+def _fill_field(context):
+    page = BasePage(context.driver)
+    page._fill_field(page._find_element((By.ID, "twotabsearchtextbox")), "Agv pista GP RR")
+
+
+@benchmark("scenario.update_location_by_zip_code", needsBrowser=True)
+def _update_location_scenario(context):
+    context.load_home_page()
+    NavigationBar(context.driver).click_update_location_button()
+    popup = UpdateDeliveryLocationPopup(context.driver)
+    popup.fill_zip_code_field(zipCodeData["validZipCode"])
+    popup.click_apply_button()
+    popup.click_continue_button()
+    popup.wait_for_delivery_country_name(str(zipCodeData["validZipCode"]))
+
+
+def run_benchmarks(withBrowser=True, repeat=20, nameFilter=None):
+    """
+        Run the registered benchmarks and get their statistics in milliseconds.
+    """
+    context = BenchmarkContext(withBrowser)
+    results = {}
+    try:
+        for entry in _benchmarks:
+            if (entry.needsBrowser and not withBrowser) or (nameFilter and nameFilter not in entry.name):
+                continue
+            if entry.needsBrowser:
+                context.load_home_page()
+            # One warm-up run, then the measured samples (fewer for the slow browser launch)
+            entry.function(context)
+            samples = []
+            for _ in range(3 if entry.name.startswith("driver.") else repeat):
+                startTime = time.perf_counter()
+                entry.function(context)
+                samples.append((time.perf_counter() - startTime) * 1000 / entry.perCall)
+            samples.sort()
+            results[entry.name] = {
+                "n": len(samples),
+                "medianMs": round(statistics.median(samples), 4),
+                "p95Ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+                "minMs": round(samples[0], 4),
+            }
+    finally:
+        context.close()
+        # The benchmarks feed the command histograms; they are not timings of a test run
+        commandTimer.reset()
+    return results
+
+
+def _get_git_commit():
+    """
+        Get the current commit of the project, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=projectPaths.get_root_directory(),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def find_regressions(results, baseline, threshold):
+    """
+        Compare the medians against the baseline. A benchmark regressed when its median is more than threshold
+        (a fraction) slower than the baseline median.
+    """
+    regressions = []
+    for name, stats in results.items():
+        baselineStats = baseline.get(name)
+        if baselineStats and stats["medianMs"] > baselineStats["medianMs"] * (1 + threshold):
+            regressions.append({"name": name, "baselineMs": baselineStats["medianMs"], "medianMs": stats["medianMs"],
+                                "change": round(stats["medianMs"] / baselineStats["medianMs"] - 1, 3)})
+    return regressions
+
+
+def main(argv=None):
+    """
+        Command line entry point: python -m benchmarks_.frameworkBenchmark [--no-browser] [--save-baseline]
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the test framework against a local stand-in site.")
+    parser.add_argument("--no-browser", action="store_true", help="Only run the benchmarks that do not need Chrome.")
+    parser.add_argument("--repeat", type=int, default=20, help="The number of samples per benchmark.")
+    parser.add_argument("--filter", help="Only run the benchmarks whose name contains this text.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="The allowed slowdown against the baseline.")
+    parser.add_argument("--save-baseline", action="store_true", help="Save the results as the new baseline.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(not args.no_browser, args.repeat, args.filter)
+    os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+    with open(HISTORY_FILE, "a", encoding="utf-8") as file:
+        file.write(json.dumps({"time": datetime.now().isoformat(timespec="seconds"), "commit": _get_git_commit(),
+                               "python": sys.version.split()[0], "results": results}) + "\n")
+
+    for name, stats in results.items():
+        print(f'{name:<40} median {stats["medianMs"]:>10.4f} ms   p95 {stats["p95Ms"]:>10.4f} ms   n={stats["n"]}')
+
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"The baseline was saved to {BASELINE_FILE}")
+        return 0
+
+    try:
+        with open(BASELINE_FILE, encoding="utf-8") as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        print("There is no baseline yet, run with --save-baseline to create one.")
+        return 0
+    regressions = find_regressions(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression["name"]}: {regression["baselineMs"]} ms -> {regression["medianMs"]} ms '
+              f'(+{regression["change"]:.0%})')
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+import argparse
+import importlib
+import json
+import os
+import statistics
+import sys
+
+from benchmarks_.fixtureServer import FixtureServer
+from common_.utilities_ import driverPool, locatorRegistry, projectPaths
+from pages_.basePage import FIND_ELEMENTS_JS
+from pages_.navigationBar_.navigationBar import NavigationBar
+
+PROFILE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results_", "locatorProfile.json")
+# A query slower than this (in microseconds, per query inside the browser) is flagged as slow
+SLOW_QUERY_US = 50
+
+# Times every locator inside the browser and proposes an ID, NAME or CSS locator for its first match
+PROFILE_LOCATORS_JS = FIND_ELEMENTS_JS + """
+var locators = arguments[0], iterations = arguments[1], rounds = arguments[2];
+
+function time(by, value) {
+    var batches = [];
+    for (var round = 0; round < rounds; round++) {
+        var startTime = performance.now();
+        for (var i = 0; i < iterations; i++) { findElements(by, value); }
+        batches.push((performance.now() - startTime) * 1000 / iterations);
+    }
+    batches.sort(function (a, b) { return a - b; });
+    return batches[Math.floor(batches.length / 2)];
+}
+
+function isUnique(selector, element) {
+    var matches = document.querySelectorAll(selector);
+    return matches.length === 1 && matches[0] === element;
+}
+
+function getStep(node) {
+    var step = node.tagName.toLowerCase();
+    var parent = node.parentElement;
+    if (parent) {
+        var sameTag = Array.prototype.filter.call(parent.children, function (child) { return child.tagName === node.tagName; });
+        if (sameTag.length > 1) { step += ':nth-of-type(' + (sameTag.indexOf(node) + 1) + ')'; }
+    }
+    return step;
+}
+
+function suggest(element) {
+    if (element.id && isUnique('#' + CSS.escape(element.id), element)) { return ['id', element.id]; }
+    var name = element.getAttribute('name');
+    if (name && document.getElementsByName(name).length === 1) { return ['name', name]; }
+
+    // The path from the closest ancestor with an id (or the body), shortened to the anchor and the element if that is unique
+    var anchor = element.parentElement, steps = [];
+    while (anchor && anchor !== document.body && !anchor.id) { anchor = anchor.parentElement; }
+    var anchorSelector = anchor && anchor.id ? '#' + CSS.escape(anchor.id) : 'body';
+    var tag = element.tagName.toLowerCase();
+    var candidates = [anchorSelector + ' ' + getStep(element)];
+    ['aria-label', 'type', 'role'].forEach(function (attribute) {
+        var attributeValue = element.getAttribute(attribute);
+        if (attributeValue) { candidates.push(anchorSelector + ' ' + tag + '[' + attribute + '="' + CSS.escape(attributeValue) + '"]'); }
+    });
+    for (var i = 0; i < candidates.length; i++) {
+        if (isUnique(candidates[i], element)) { return ['css selector', candidates[i]]; }
+    }
+    for (var node = element; node && node !== anchor && node !== document.body; node = node.parentElement) {
+        steps.unshift(getStep(node));
+    }
+    return ['css selector', [anchorSelector].concat(steps).join(' > ')];
+}
+
+return locators.map(function (locator) {
+    var elements = findElements(locator[0], locator[1]);
+    var result = {count: elements.length, queryUs: time(locator[0], locator[1]), suggestion: null};
+    if (elements.length && locator[0] !== 'id') {
+        var suggestion = suggest(elements[0]);
+        if (suggestion[0] !== locator[0] || suggestion[1] !== locator[1]) {
+            result.suggestion = {by: suggestion[0], value: suggestion[1], count: findElements(suggestion[0], suggestion[1]).length,
+                                 queryUs: time(suggestion[0], suggestion[1])};
+        }
+    }
+    return result;
+});
+"""
+
+
+def import_page_objects():
+    """
+        Import every module in pages_/, so that all page classes register their locators.
+    """
+    pagesDirectory = projectPaths.get_root_directory() / "pages_"
+    for path in sorted(pagesDirectory.rglob("*.py")):
+        importlib.import_module(".".join(path.relative_to(pagesDirectory.parent).with_suffix("").parts))
+
+
+def profile_locators(driver, locators, iterations=200, rounds=5, slowQueryUs=SLOW_QUERY_US):
+    """
+        Run every locator many times inside the browser on the current page and record its cost and match count.
+
+        Args:
+            driver: The WebDriver instance, on the page the locators belong to.
+            locators (dict): The (By, value) locators to profile, by name (see locatorRegistry.get_all_locators).
+            iterations (int): The queries per timed batch.
+            rounds (int): The timed batches per locator; the median batch is kept.
+            slowQueryUs (float): The query time in microseconds above which a locator is flagged as slow.
+
+        Returns:
+            list: For every locator its name, 'by', 'value', 'count', 'queryUs', 'flags' (slow, ambiguous, missing,
+                positional, exact_class, duplicate) and a 'suggestion' (a faster or sturdier ID, NAME or CSS locator
+                of the same element with its 'count', 'queryUs' and 'speedup'), slowest first.
+    """
+    names = list(locators)
+    results = driver.execute_script(PROFILE_LOCATORS_JS, [list(locators[name]) for name in names], iterations, rounds)
+    duplicates = locatorRegistry.find_duplicates()
+    profile = []
+    for name, result in zip(names, results):
+        by, value = locators[name]
+        flags = locatorRegistry.get_fragility_flags((by, value))
+        if result["count"] == 0:
+            flags.append("missing")
+        elif result["count"] > 1:
+            flags.append("ambiguous")
+        if result["queryUs"] > slowQueryUs:
+            flags.append("slow")
+        if (by, value) in duplicates:
+            flags.append("duplicate")
+        suggestion = result["suggestion"]
+        if suggestion is not None:
+            suggestion["queryUs"] = round(suggestion["queryUs"], 3)
+            suggestion["speedup"] = round(result["queryUs"] / suggestion["queryUs"], 1) if suggestion["queryUs"] else None
+            # Only keep a suggestion that is faster, or that fixes a flagged locator
+            if not flags and (suggestion["speedup"] or 0) < 2:
+                suggestion = None
+        profile.append({"name": name, "by": by, "value": value, "count": result["count"],
+                        "queryUs": round(result["queryUs"], 3), "flags": flags, "suggestion": suggestion})
+    return sorted(profile, key=lambda entry: entry["queryUs"], reverse=True)
+
+
+def main(argv=None):
+    """
+        Command line entry point: python -m benchmarks_.locatorProfiler [--url URL] [--open-popup] [--filter Page]
+    """
+    parser = argparse.ArgumentParser(description="Profile the registered page object locators inside the browser.")
+    parser.add_argument("--url", help="The page to profile on (the local stand-in site by default).")
+    parser.add_argument("--open-popup", action="store_true", help="Open the delivery location popup before profiling.")
+    parser.add_argument("--filter", help="Only profile the locators whose 'PageClass.name' contains this text.")
+    parser.add_argument("--iterations", type=int, default=200, help="The queries per timed batch.")
+    parser.add_argument("--slow", type=float, default=SLOW_QUERY_US, help="The slow query threshold in microseconds.")
+    args = parser.parse_args(argv)
+
+    import_page_objects()
+    locators = {name: locator for name, locator in locatorRegistry.get_all_locators().items()
+                if not args.filter or args.filter in name}
+    fixtureServer = FixtureServer().start() if args.url is None else None
+    driver = driverPool.launch_chrome()
+    try:
+        driver.get(args.url or fixtureServer.url)
+        if args.open_popup:
+            NavigationBar(driver).click_update_location_button()
+        profile = profile_locators(driver, locators, args.iterations, slowQueryUs=args.slow)
+    finally:
+        driver.quit()
+        if fixtureServer is not None:
+            fixtureServer.stop()
+
+    os.makedirs(os.path.dirname(PROFILE_FILE), exist_ok=True)
+    with open(PROFILE_FILE, "w", encoding="utf-8") as file:
+        json.dump(profile, file, indent=2)
+    for entry in profile:
+        print(f'{entry["name"]:<55} {entry["queryUs"]:>9.3f} us  n={entry["count"]:<3} {",".join(entry["flags"])}')
+        if entry["suggestion"]:
+            suggestion = entry["suggestion"]
+            print(f'    -> ({suggestion["by"]}, {suggestion["value"]!r}) {suggestion["queryUs"]:.3f} us  x{suggestion["speedup"]}')
+    if profile:
+        print(f'Median query {statistics.median(entry["queryUs"] for entry in profile):.3f} us')
+    print(f"The profile was saved to {PROFILE_FILE}")
+    return 1 if any(set(entry["flags"]) & {"slow", "ambiguous"} for entry in profile) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
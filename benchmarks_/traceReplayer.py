@@ -0,0 +1,138 @@
+import argparse
+import os
+import sys
+import time
+
+from benchmarks_.fixtureServer import FixtureServer
+from common_.utilities_ import commandTrace, driverPool
+from common_.utilities_.commandTrace import CommandTraceRecorder
+
+# Commands that end or replace the session are not replayed
+SKIPPED_COMMANDS = {"newSession", "quit", "close"}
+
+
+def _map_element_ids(value, elementIds):
+    """
+        Replace the recorded element ids in command parameters by the ids of the same elements in the replay session.
+    """
+    if isinstance(value, str):
+        return elementIds.get(value, value)
+    if isinstance(value, dict):
+        return {key: _map_element_ids(item, elementIds) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_map_element_ids(item, elementIds) for item in value]
+    return value
+
+
+def replay_trace(driver, fileName, url=None, outputFileName=None):
+    """
+        Send the commands of a trace to a browser session back to back, as fast as the driver answers.
+        No test code runs in between: waits replay as the polls they were recorded as, and the element ids the recorded
+        finds returned are mapped to the ids the replayed finds return.
+
+        Args:
+            driver: The WebDriver instance to replay on.
+            fileName (str): The trace to replay.
+            url (str): The URL every navigation goes to (e.g. the local stand-in site), or None for the recorded URLs.
+            outputFileName (str): Where to write the trace of the replay, for compare, or None.
+
+        Returns:
+            dict: The number of replayed and skipped commands, the commands whose outcome differs from the recording
+                (they failed in only one of them), and the recorded and replayed command time and the wall time in ms.
+    """
+    header, commands = commandTrace.read_trace(fileName)
+    recorder = CommandTraceRecorder(driver, outputFileName, replayOf=header.get("test", fileName)) if outputFileName else None
+    if recorder is not None:
+        recorder.start()
+    executor = driver.command_executor
+    elementIds = {}
+    summary = {"commands": 0, "skipped": 0, "mismatches": [], "recordedMs": 0.0, "replayedMs": 0.0}
+    startTime = time.perf_counter()
+    try:
+        for index, entry in enumerate(commands):
+            if entry["c"] in SKIPPED_COMMANDS:
+                summary["skipped"] += 1
+                continue
+            params = _map_element_ids(entry["p"], elementIds)
+            if url is not None and entry["c"] == "get":
+                params["url"] = url
+            params["sessionId"] = driver.session_id
+            commandStartTime = time.perf_counter()
+            response = executor.execute(entry["c"], params)
+            summary["replayedMs"] += (time.perf_counter() - commandStartTime) * 1000
+            summary["recordedMs"] += entry["d"]
+            summary["commands"] += 1
+            error = commandTrace.get_error(response)
+            if error != entry.get("e"):
+                summary["mismatches"].append({"index": index, "command": commandTrace.get_command_key(entry),
+                                              "recordedError": entry.get("e"), "replayedError": error})
+            if error is None:
+                elementIds.update(zip(entry.get("r", ()), commandTrace.get_element_ids(response.get("value"))))
+    finally:
+        if recorder is not None:
+            recorder.stop()
+    summary["wallMs"] = round((time.perf_counter() - startTime) * 1000, 3)
+    summary["recordedMs"] = round(summary["recordedMs"], 3)
+    summary["replayedMs"] = round(summary["replayedMs"], 3)
+    return summary
+
+
+def _print_comparison(baseFileName, otherFileName, top):
+    comparison = commandTrace.compare_traces(commandTrace.read_trace(baseFileName)[1], commandTrace.read_trace(otherFileName)[1])
+    print(f'{"command":<28} {"base n":>7} {"base ms":>10} {"other n":>7} {"other ms":>10}')
+    for command, totals in sorted(comparison["byCommand"].items(), key=lambda item: -item[1]["baseMs"]):
+        print(f'{command:<28} {totals["baseCount"]:>7} {totals["baseMs"]:>10.1f} {totals["otherCount"]:>7} {totals["otherMs"]:>10.1f}')
+    print(f"\nLargest differences of {len(comparison['pairs'])} aligned commands:")
+    for pair in sorted(comparison["pairs"], key=lambda pair: -abs(pair["deltaMs"]))[:top]:
+        print(f'{pair["deltaMs"]:>+10.3f} ms  {pair["baseMs"]:>9.3f} -> {pair["otherMs"]:>9.3f}  {pair["key"][:80]}  {pair["step"] or ""}')
+    print(f'\nOnly in {baseFileName}: {len(comparison["onlyBase"])} commands, only in {otherFileName}: {len(comparison["onlyOther"])}')
+
+
+def main(argv=None):
+    """
+        Command line entry point:
+            python -m benchmarks_.traceReplayer replay TRACE [--keep-urls] [--output REPLAY_TRACE]
+            python -m benchmarks_.traceReplayer compare BASE_TRACE OTHER_TRACE
+    """
+    parser = argparse.ArgumentParser(description="Replay recorded WebDriver command traces and compare them.")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    replayParser = subparsers.add_parser("replay", help="Replay traces against the local stand-in site.")
+    replayParser.add_argument("traces", nargs="+")
+    replayParser.add_argument("--keep-urls", action="store_true", help="Navigate to the recorded URLs instead of the stand-in site.")
+    replayParser.add_argument("--output", help="The directory to write the traces of the replays to.")
+    compareParser = subparsers.add_parser("compare", help="Compare two traces command by command.")
+    compareParser.add_argument("base")
+    compareParser.add_argument("other")
+    compareParser.add_argument("--top", type=int, default=20, help="The number of largest differences to list.")
+    args = parser.parse_args(argv)
+
+    if args.action == "compare":
+        _print_comparison(args.base, args.other, args.top)
+        return 0
+
+    fixtureServer = None if args.keep_urls else FixtureServer().start()
+    driver = driverPool.launch_chrome()
+    mismatches = 0
+    try:
+        for fileName in args.traces:
+            outputFileName = None
+            if args.output:
+                outputFileName = os.path.join(args.output, os.path.basename(fileName).replace(commandTrace.TRACE_SUFFIX, "")
+                                              + ".replay" + commandTrace.TRACE_SUFFIX)
+            summary = replay_trace(driver, fileName, None if fixtureServer is None else fixtureServer.url, outputFileName)
+            mismatches += len(summary["mismatches"])
+            print(f'{os.path.basename(fileName)}: {summary["commands"]} commands, recorded {summary["recordedMs"]:.1f} ms, '
+                  f'replayed {summary["replayedMs"]:.1f} ms (wall {summary["wallMs"]:.1f} ms), '
+                  f'{len(summary["mismatches"])} outcome mismatches')
+            for mismatch in summary["mismatches"][:5]:
+                print(f'    #{mismatch["index"]} {mismatch["command"][:80]}: recorded {mismatch["recordedError"]}, '
+                      f'replayed {mismatch["replayedError"]}')
+    finally:
+        driver.quit()
+        if fixtureServer is not None:
+            fixtureServer.stop()
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+import asyncio
+import json
+import os
+import shutil
+import socket
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import ElementClickInterceptedException, JavascriptException, NoSuchElementException, \
+    StaleElementReferenceException, TimeoutException, WebDriverException
+
+from common_.utilities_ import customLogger, launchProfiles, profileTemplate, replayProxy
+
+# The W3C key a WebElement reference is serialized under
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+# The script timeout of every session, above the longest in-browser wait of the page objects
+SCRIPT_TIMEOUT_MS = 30000
+
+_ERRORS = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "element click intercepted": ElementClickInterceptedException,
+    "timeout": TimeoutException,
+    "script timeout": TimeoutException,
+    "javascript error": JavascriptException,
+}
+
+
+class _HttpConnectionPool:
+    def __init__(self, host, port, size=32):
+        """
+            Initialize a pool of keep-alive HTTP/1.1 connections to the driver server, built on asyncio streams.
+            At most size requests are in flight at once; the others wait for a free connection.
+        """
+        self.host = host
+        self.port = port
+        self.__idleConnections = []
+        self.__semaphore = asyncio.Semaphore(size)
+
+    async def __exchange(self, reader, writer, method, path, body):
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                     f"Content-Type: application/json;charset=utf-8\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+        await writer.drain()
+        statusLine = await reader.readline()
+        if not statusLine:
+            raise ConnectionResetError("The driver server closed the connection")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "content-length" in headers:
+            payload = await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            payload = b""
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                payload += chunk[:-2]
+        else:
+            payload = await reader.read()
+            headers["connection"] = "close"
+        return int(statusLine.split()[1]), headers, payload
+
+    async def request(self, method, path, body=None):
+        """
+            Send one request and get its status and JSON answer. A connection whose exchange is interrupted (e.g. the
+            task is cancelled) is closed instead of being reused, so no half-read answer is left in it.
+        """
+        async with self.__semaphore:
+            for attempt in range(2):
+                reused = bool(self.__idleConnections)
+                reader, writer = self.__idleConnections.pop() if reused else await asyncio.open_connection(self.host, self.port)
+                try:
+                    status, headers, payload = await self.__exchange(reader, writer, method, path, body)
+                except ConnectionError:
+                    writer.close()
+                    # The server closes idle keep-alive connections; retry once on a new one
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if headers.get("connection", "").lower() == "close":
+                    writer.close()
+                else:
+                    self.__idleConnections.append((reader, writer))
+                return status, json.loads(payload) if payload else {}
+
+    def close(self):
+        for _, writer in self.__idleConnections:
+            writer.close()
+        self.__idleConnections.clear()
+
+
+class AsyncChromeDriverService:
+    def __init__(self, executablePath=None, port=0):
+        """
+            Initialize a chromedriver process that serves any number of sessions.
+            The executable is CHROMEDRIVER_PATH, chromedriver on the PATH or the one Selenium Manager provides.
+        """
+        self.executablePath = executablePath or os.environ.get("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
+        self.port = port
+        self.__process = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self, timeout=20):
+        """
+            Start chromedriver and wait until it accepts sessions.
+        """
+        if self.executablePath is None:
+            from selenium.webdriver.common.selenium_manager import SeleniumManager
+            self.executablePath = await asyncio.to_thread(SeleniumManager().driver_location, webdriver.ChromeOptions())
+        if not self.port:
+            with socket.socket() as freeSocket:
+                freeSocket.bind(("127.0.0.1", 0))
+                self.port = freeSocket.getsockname()[1]
+        self.__process = await asyncio.create_subprocess_exec(self.executablePath, f"--port={self.port}",
+                                                              stdout=asyncio.subprocess.DEVNULL,
+                                                              stderr=asyncio.subprocess.DEVNULL)
+        pool = _HttpConnectionPool("127.0.0.1", self.port, 1)
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    _, answer = await pool.request("GET", "/status")
+                    if answer.get("value", {}).get("ready"):
+                        return self
+                except OSError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise WebDriverException(f"chromedriver did not start within {timeout} s")
+                await asyncio.sleep(0.1)
+        finally:
+            pool.close()
+
+    async def stop(self):
+        if self.__process is not None and self.__process.returncode is None:
+            self.__process.terminate()
+            await self.__process.wait()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exceptionInfo):
+        await self.stop()
+
+
+def get_chrome_capabilities(profileName=None):
+    """
+        Get the capabilities of a Chrome session like driverPool.launch_chrome starts it: the launch profile, the browser
+        console logs and the record/replay proxy. Every session gets a fixed window size instead of a maximize round
+        trip; sessions started from the profile template are not supported here.
+    """
+    profile = launchProfiles.get_profile(profileName)
+    options = webdriver.ChromeOptions()
+    profile.apply_to_options(options)
+    options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+    for argument in replayProxy.get_chrome_arguments() + ["--window-size=1920,1080"]:
+        options.add_argument(argument)
+    if profileTemplate.is_headless():
+        options.add_argument("--headless=new")
+    return options.to_capabilities()
+
+
+class AsyncWebElement:
+    def __init__(self, driver, elementId):
+        """
+            Initialize a reference to an element of an AsyncWebDriver session.
+        """
+        self.driver = driver
+        self.id = elementId
+
+    async def __element_command(self, method, command, body=None):
+        return await self.driver.execute(method, f"/element/{self.id}{command}", body)
+
+    async def click(self):
+        await self.__element_command("POST", "/click", {})
+
+    async def clear(self):
+        await self.__element_command("POST", "/clear", {})
+
+    async def send_keys(self, text):
+        await self.__element_command("POST", "/value", {"text": str(text)})
+
+    async def get_text(self):
+        return await self.__element_command("GET", "/text")
+
+    async def get_attribute(self, name):
+        return await self.__element_command("GET", f"/attribute/{name}")
+
+    async def is_displayed(self):
+        return await self.__element_command("GET", "/displayed")
+
+    async def is_enabled(self):
+        return await self.__element_command("GET", "/enabled")
+
+    def to_json(self):
+        return {ELEMENT_KEY: self.id}
+
+
+class AsyncWebDriver:
+    def __init__(self, pool, sessionId, capabilities):
+        """
+            Initialize an asyncio WebDriver session. Use AsyncWebDriver.create to start one.
+        """
+        self.pool = pool
+        self.session_id = sessionId
+        self.capabilities = capabilities
+
+    @classmethod
+    async def create(cls, serverUrl, capabilities=None, pool=None, profileName=None):
+        """
+            Start a new session on a driver server (see AsyncChromeDriverService).
+
+            Args:
+                serverUrl (str): The URL of the driver server.
+                capabilities (dict): The session capabilities, get_chrome_capabilities() by default.
+                pool (_HttpConnectionPool): The connections to share with other sessions on the same server, or None
+                    for connections of its own.
+                profileName (str): The launch profile whose blocked URLs are applied to the session.
+        """
+        if pool is None:
+            host, _, port = serverUrl.split("//", 1)[-1].rstrip("/").partition(":")
+            pool = _HttpConnectionPool(host, int(port or 80))
+        status, answer = await pool.request("POST", "/session",
+                                            {"capabilities": {"alwaysMatch": capabilities or get_chrome_capabilities(profileName)}})
+        value = answer.get("value", {})
+        if status >= 400:
+            raise WebDriverException(f"The session could not be created: {value.get('message', value)}")
+        driver = cls(pool, value["sessionId"], value.get("capabilities", {}))
+        await driver.execute("POST", "/timeouts", {"script": SCRIPT_TIMEOUT_MS, "implicit": 0})
+        patterns = launchProfiles.get_profile(profileName).get_blocked_patterns()
+        if patterns:
+            await driver.execute_cdp_cmd("Network.enable", {})
+            await driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return driver
+
+    def __wrap(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            return {key: self.__wrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.__wrap(item) for item in value]
+        return value
+
+    @staticmethod
+    def __unwrap(value):
+        if isinstance(value, AsyncWebElement):
+            return value.to_json()
+        if isinstance(value, (list, tuple)):
+            return [AsyncWebDriver.__unwrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: AsyncWebDriver.__unwrap(item) for key, item in value.items()}
+        return value
+
+    async def execute(self, method, command, body=None):
+        """
+            Send a command of this session and get its value, with element references wrapped in AsyncWebElement.
+            W3C errors are raised as the matching Selenium exceptions.
+        """
+        status, answer = await self.pool.request(method, f"/session/{self.session_id}{command}", body)
+        value = answer.get("value")
+        if status >= 400 or (isinstance(value, dict) and "error" in value):
+            error = value.get("error", "unknown error") if isinstance(value, dict) else "unknown error"
+            message = value.get("message", "") if isinstance(value, dict) else str(value)
+            raise _ERRORS.get(error, WebDriverException)(message)
+        return self.__wrap(value)
+
+    async def get(self, url):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def get_current_url(self):
+        return await self.execute("GET", "/url")
+
+    async def get_title(self):
+        return await self.execute("GET", "/title")
+
+    async def refresh(self):
+        await self.execute("POST", "/refresh", {})
+
+    async def find_elements(self, by, value):
+        """
+            Find elements by a Selenium (By, value) locator; ID, NAME and CLASS_NAME are sent as CSS selectors, like
+            Selenium does.
+        """
+        if by == "id":
+            by, value = "css selector", f'[id="{value}"]'
+        elif by == "name":
+            by, value = "css selector", f'[name="{value}"]'
+        elif by == "class name":
+            by, value = "css selector", f".{value}"
+        return await self.execute("POST", "/elements", {"using": by, "value": value})
+
+    async def execute_script(self, script, *args):
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": self.__unwrap(list(args))})
+
+    async def execute_async_script(self, script, *args):
+        return await self.execute("POST", "/execute/async", {"script": script, "args": self.__unwrap(list(args))})
+
+    async def execute_cdp_cmd(self, cmd, params):
+        return await self.execute("POST", "/goog/cdp/execute", {"cmd": cmd, "params": params})
+
+    async def delete_all_cookies(self):
+        await self.execute("DELETE", "/cookie")
+
+    async def quit(self):
+        """
+            End the session. Errors are logged, not raised, so a session can always be quit during a cancellation.
+        """
+        try:
+            await self.pool.request("DELETE", f"/session/{self.session_id}")
+        except (OSError, asyncio.TimeoutError) as e:
+            customLogger.logger("WARNING", "Warning: The session %s could not be quit: %s", self.session_id, e)
+
+
+async def run_sessions(scenario, inputs, maxSessions=8, timeout=120, serverUrl=None, capabilities=None, profileName=None):
+    """
+        Run an async scenario for every input on up to maxSessions browser sessions at once, from one event loop.
+        Every session is kept warm for the next input of its worker; after a failed or timed out input the session is
+        quit and the next input starts a new one. Cancelling the call quits all sessions.
+
+        Args:
+            scenario (callable): An async function called with an AsyncWebDriver and one input.
+            inputs (iterable): The inputs (hashable).
+            maxSessions (int): The number of sessions (and inputs) in flight at once.
+            timeout (float): The deadline of one input in seconds, session start included.
+            serverUrl (str): A running driver server, or None to start chromedriver for the run.
+            capabilities (dict): The session capabilities, get_chrome_capabilities(profileName) by default.
+            profileName (str): The launch profile of the sessions.
+
+        Returns:
+            dict: {input: the scenario's result, or the exception it raised}
+    """
+    inputs = list(inputs)
+    queue = asyncio.Queue()
+    for item in inputs:
+        queue.put_nowait(item)
+    results = {}
+    service = None
+    if serverUrl is None:
+        service = await AsyncChromeDriverService().start()
+        serverUrl = service.url
+    host, _, port = serverUrl.split("//", 1)[-1].rstrip("/").partition(":")
+    pool = _HttpConnectionPool(host, int(port or 80), size=max(maxSessions * 2, 8))
+
+    async def run_worker():
+        driver = None
+        try:
+            while not queue.empty():
+                item = queue.get_nowait()
+                startTime = time.perf_counter()
+                try:
+                    if driver is None:
+                        driver = await asyncio.wait_for(AsyncWebDriver.create(serverUrl, capabilities, pool, profileName), timeout)
+                    results[item] = await asyncio.wait_for(scenario(driver, item), timeout - (time.perf_counter() - startTime))
+                except Exception as e:
+                    results[item] = e
+                    customLogger.logger("ERROR", "Error: The scenario failed for %s: %r", item, e, event="async_session_error",
+                                        input=str(item), exception=type(e).__name__)
+                    if driver is not None:
+                        await asyncio.shield(driver.quit())
+                        driver = None
+        finally:
+            if driver is not None:
+                await asyncio.shield(driver.quit())
+
+    try:
+        await asyncio.gather(*(run_worker() for _ in range(min(maxSessions, len(inputs)))))
+    finally:
+        pool.close()
+        if service is not None:
+            await asyncio.shield(service.stop())
+    return {item: results.get(item) for item in inputs}
@@ -0,0 +1,282 @@
+import atexit
+import contextlib
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from common_.utilities_ import customLogger, projectPaths
+
+BUCKETS_PER_DOUBLING = 8
+MAX_REMEMBERED_ELEMENTS = 10000
+
+
+class LatencyHistogram:
+    def __init__(self):
+        """
+            Initialize an in-memory histogram with logarithmic buckets (8 per doubling, about 9% wide) over microseconds.
+            Adding a sample is a couple of arithmetic operations and a dict update.
+        """
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        """
+            Add one latency sample, in seconds.
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds < self.minimum:
+            self.minimum = seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+        index = int(math.log2(max(seconds * 1e6, 1.0)) * BUCKETS_PER_DOUBLING)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other):
+        """
+            Add all samples of another histogram to this one.
+        """
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def percentile(self, fraction):
+        """
+            Estimate a percentile (0.0 - 1.0) as the upper bound of the bucket it falls into, capped by the maximum.
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(2 ** ((index + 1) / BUCKETS_PER_DOUBLING) / 1e6, self.maximum)
+        return self.maximum
+
+    def to_dict(self):
+        """
+            Get the histogram as a JSON-serializable dict, including the summary statistics in milliseconds.
+        """
+        return {
+            "count": self.count,
+            "totalMs": round(self.total * 1000, 3),
+            "meanMs": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "minMs": round(self.minimum * 1000, 3) if self.count else 0.0,
+            "p50Ms": round(self.percentile(0.5) * 1000, 3),
+            "p95Ms": round(self.percentile(0.95) * 1000, 3),
+            "maxMs": round(self.maximum * 1000, 3),
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+            Rebuild a histogram from the dict produced by to_dict().
+        """
+        histogram = cls()
+        histogram.count = data["count"]
+        histogram.total = data["totalMs"] / 1000
+        histogram.minimum = data["minMs"] / 1000 if data["count"] else math.inf
+        histogram.maximum = data["maxMs"] / 1000
+        histogram.buckets = {int(index): count for index, count in data["buckets"].items()}
+        return histogram
+
+
+_histograms = {"command": {}, "locator": {}, "step": {}}
+_elementLocators = {}
+_stepClasses = ()
+# The page object step running in each thread: how deep step calls are nested, and the name and start of the outermost
+_stepScope = threading.local()
+
+
+def remember_locator(element, locator):
+    """
+        Remember which locator an element was found with, so later clicks and value changes on it are reported per locator.
+    """
+    if len(_elementLocators) >= MAX_REMEMBERED_ELEMENTS:
+        _elementLocators.clear()
+    _elementLocators[element.id] = locator
+
+
+def get_element_locator(element):
+    """
+        Get the locator an element was found with, or None if it was not found through a page object.
+    """
+    return _elementLocators.get(element.id)
+
+
+def register_step_class(stepClass):
+    """
+        Count the methods of a page object base class (and of every subclass) as steps. Used as a class decorator, so
+        the timer does not depend on where page objects live.
+    """
+    global _stepClasses
+    _stepClasses += (stepClass,)
+    return stepClass
+
+
+@contextlib.contextmanager
+def step_scope(name):
+    """
+        Mark the calling thread as running a page object step until the block ends. A step called by another step
+        belongs to the outermost one: it is reported under its name and shares its wait budget (see waitEngine).
+    """
+    depth = getattr(_stepScope, "depth", 0)
+    if depth == 0:
+        _stepScope.name = name
+        _stepScope.startTime = time.perf_counter()
+    _stepScope.depth = depth + 1
+    try:
+        yield
+    finally:
+        _stepScope.depth = depth
+
+
+def step(method):
+    """
+        Run a page object method as one step, see step_scope. BasePage applies it to every public page object method.
+    """
+    @functools.wraps(method)
+    def run_step(self, *args, **kwargs):
+        with step_scope(f"{type(self).__name__}.{method.__name__}"):
+            return method(self, *args, **kwargs)
+    return run_step
+
+
+def get_step_start_time():
+    """
+        Get when the step running in the calling thread started, or None outside page object steps.
+    """
+    return _stepScope.startTime if getattr(_stepScope, "depth", 0) else None
+
+
+def _find_step_frame():
+    """
+        Find the frame of the outermost page object method on the calling stack, or None outside page objects.
+        BasePage helpers are skipped in favour of the page object method calling them.
+    """
+    stepFrame = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_argcount and code.co_varnames[0] == "self" and isinstance(frame.f_locals.get("self"), _stepClasses):
+            stepFrame = frame
+        elif stepFrame is not None:
+            break
+        frame = frame.f_back
+    return stepFrame
+
+
+def get_current_step():
+    """
+        Get the page object method (e.g. 'NavigationBar.click_update_location_button') on the current call stack: the
+        open step, or else the outermost method of a registered page class (the asyncio pages are not wrapped in steps).
+    """
+    if getattr(_stepScope, "depth", 0):
+        return _stepScope.name
+    stepFrame = _find_step_frame()
+    if stepFrame is None:
+        return None
+    return f"{type(stepFrame.f_locals['self']).__name__}.{stepFrame.f_code.co_name}"
+
+
+def record(command, seconds, locator=None, step=None):
+    """
+        Record the latency of one WebDriver command under its command type, its locator and its page object step.
+    """
+    for group, key in (("command", command),
+                       ("locator", f"{command} {locator[0]}={locator[1]}" if locator else None),
+                       ("step", step)):
+        if key is None:
+            continue
+        histogram = _histograms[group].get(key)
+        if histogram is None:
+            histogram = _histograms[group][key] = LatencyHistogram()
+        histogram.add(seconds)
+
+
+def get_snapshot():
+    """
+        Get all histograms as a JSON-serializable dict grouped by command, locator and step.
+    """
+    return {group: {key: histogram.to_dict() for key, histogram in histograms.items()}
+            for group, histograms in _histograms.items()}
+
+
+def merge_snapshots(snapshots):
+    """
+        Merge the snapshots of several processes (e.g. parallel runner workers) into one.
+    """
+    merged = {"command": {}, "locator": {}, "step": {}}
+    for snapshot in snapshots:
+        for group, histograms in snapshot.items():
+            for key, data in histograms.items():
+                histogram = LatencyHistogram.from_dict(data)
+                if key in merged[group]:
+                    merged[group][key].merge(histogram)
+                else:
+                    merged[group][key] = histogram
+    return {group: {key: histogram.to_dict() for key, histogram in histograms.items()}
+            for group, histograms in merged.items()}
+
+
+def reset():
+    """
+        Drop all recorded timings.
+    """
+    for histograms in _histograms.values():
+        histograms.clear()
+    _elementLocators.clear()
+
+
+def format_report(snapshot, top=10):
+    """
+        Format the slowest locators and steps (by total time) of a snapshot as a text table.
+    """
+    lines = []
+    for group, title in (("command", "Commands"), ("locator", "Slowest locators"), ("step", "Slowest steps")):
+        lines.append(f"{title}:")
+        ranked = sorted(snapshot[group].items(), key=lambda item: item[1]["totalMs"], reverse=True)[:top]
+        for key, stats in ranked:
+            lines.append(f'  {stats["totalMs"]:>10.1f} ms total  {stats["count"]:>6} x  p50 {stats["p50Ms"]:>8.1f} ms  '
+                         f'p95 {stats["p95Ms"]:>8.1f} ms  max {stats["maxMs"]:>8.1f} ms  {key}')
+    return "\n".join(lines)
+
+
+def write_report(fileName=None, top=10, snapshot=None):
+    """
+        Write the timings of this process (or the given snapshot) as JSON next to a text summary of the slowest
+        locators and steps.
+    """
+    snapshot = snapshot or get_snapshot()
+    if fileName is None:
+        worker = os.environ.get("WORKER_ID", str(os.getpid()))
+        fileName = os.path.join(projectPaths.get_project_directory("reports_"),
+                                f'commandTimings_{datetime.now().strftime("%d_%m_%Y_%H-%M-%S")}_worker-{worker}.json')
+    with open(fileName, "w", encoding="utf-8") as file:
+        json.dump(snapshot, file, indent=2)
+    with open(os.path.splitext(fileName)[0] + ".txt", "w", encoding="utf-8") as file:
+        file.write(format_report(snapshot, top) + "\n")
+    customLogger.logger("INFO", "WebDriver command timings were written to %s", fileName, event="command_timings")
+    return fileName
+
+
+@atexit.register
+def _write_report_at_exit():
+    """
+        Dump the report at the end of the run if any command was timed.
+    """
+    if _histograms["command"]:
+        write_report()
@@ -0,0 +1,217 @@
+import difflib
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+
+from common_.utilities_ import commandTimer, projectPaths
+
+# The W3C key a WebElement reference is serialized under
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+TRACE_SUFFIX = ".trace.jsonl.gz"
+
+
+def get_trace_directory():
+    """
+        Get the directory traces are written to when COMMAND_TRACE is set: the directory it names, or reports_/traces_/
+        for COMMAND_TRACE=1. Returns None when tracing is disabled.
+    """
+    setting = os.environ.get("COMMAND_TRACE", "")
+    if setting in ("", "0"):
+        return None
+    if setting == "1":
+        return str(projectPaths.get_project_directory("reports_") / "traces_")
+    return setting
+
+
+def get_error(response):
+    """
+        Get the W3C error name of a raw command response (e.g. 'no such element'), or None for a successful command.
+    """
+    if not isinstance(response, dict) or response.get("status") in (None, 0):
+        return None
+    value = response.get("value")
+    if isinstance(value, str):
+        try:
+            value = json.loads(value).get("value", {})
+        except ValueError:
+            return "unknown error"
+    return value.get("error", "unknown error") if isinstance(value, dict) else "unknown error"
+
+
+def get_element_ids(value):
+    """
+        Get the ids of all element references in a command result or parameters, in traversal order.
+    """
+    if isinstance(value, dict):
+        if ELEMENT_KEY in value:
+            return [value[ELEMENT_KEY]]
+        return [elementId for item in value.values() for elementId in get_element_ids(item)]
+    if isinstance(value, list):
+        return [elementId for item in value for elementId in get_element_ids(item)]
+    return []
+
+
+class CommandTraceRecorder:
+    def __init__(self, driver, fileName, **header):
+        """
+            Initialize a recorder of the WebDriver commands a session sends, as a gzipped JSON lines trace.
+            The commands are taken from the command executor under the driver (and under EventFiringWebDriver), so the
+            trace has everything a replay needs: the locators, the typed text, the script arguments and the ids of the
+            found elements. Every script source is written once and referenced by number afterwards.
+
+            Args:
+                driver: The WebDriver instance (or an EventFiringWebDriver around it).
+                fileName (str): The trace file.
+                header: Extra fields of the first line (e.g. the test id).
+        """
+        self.driver = getattr(driver, "wrapped_driver", driver)
+        self.fileName = fileName
+        self.header = header
+        self.__file = None
+        self.__scripts = {}
+        self.__startTime = None
+        self.__lock = threading.Lock()
+
+    def start(self):
+        """
+            Start recording: every command sent until stop() is written to the trace.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.fileName)), exist_ok=True)
+        self.__file = gzip.open(self.fileName, "wt", encoding="utf-8")
+        capabilities = self.driver.capabilities
+        self.__write({"type": "header", "time": datetime.now().isoformat(timespec="seconds"),
+                      "browser": capabilities.get("browserName"), "browserVersion": capabilities.get("browserVersion"),
+                      **self.header})
+        self.__startTime = time.perf_counter()
+        executor = self.driver.command_executor
+        execute = executor.execute
+
+        def execute_and_record(command, params):
+            step = commandTimer.get_current_step()
+            startTime = time.perf_counter()
+            response = execute(command, params)
+            self.record(command, params, response, startTime, time.perf_counter(), step)
+            return response
+
+        executor.execute = execute_and_record
+        return self
+
+    def __write(self, entry):
+        self.__file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def record(self, command, params, response, startTime, endTime, step=None):
+        """
+            Write one command: its offset from the start and duration in ms, its parameters (without the session id),
+            its error if it failed and the ids of the elements it returned.
+        """
+        params = {key: value for key, value in (params or {}).items() if key != "sessionId"}
+        with self.__lock:
+            if self.__file is None:
+                return
+            if "script" in params:
+                script = params.pop("script")
+                if script not in self.__scripts:
+                    self.__scripts[script] = len(self.__scripts)
+                    self.__write({"type": "script", "ref": self.__scripts[script], "source": script})
+                params["scriptRef"] = self.__scripts[script]
+            entry = {"t": round((startTime - self.__startTime) * 1000, 3), "d": round((endTime - startTime) * 1000, 3),
+                     "c": command, "p": params}
+            error = get_error(response)
+            if error is not None:
+                entry["e"] = error
+            elementIds = get_element_ids(response.get("value")) if error is None and isinstance(response, dict) else []
+            if elementIds:
+                entry["r"] = elementIds
+            if step is not None:
+                entry["s"] = step
+            self.__write(entry)
+
+    def stop(self):
+        """
+            Stop recording and close the trace. Calling it again does nothing.
+        """
+        with self.__lock:
+            if self.__file is None:
+                return
+            self.driver.command_executor.__dict__.pop("execute", None)
+            self.__file.close()
+            self.__file = None
+
+
+def start_test_trace(driver, testId):
+    """
+        Start recording the commands of a test when COMMAND_TRACE is set, or return None.
+    """
+    directory = get_trace_directory()
+    if directory is None:
+        return None
+    return CommandTraceRecorder(driver, os.path.join(directory, f"{testId}{TRACE_SUFFIX}"), test=testId).start()
+
+
+def read_trace(fileName):
+    """
+        Read a trace, with the script references resolved.
+
+        Returns:
+            tuple: The header (dict) and the commands (list of dicts with 't', 'd', 'c', 'p' and optionally 'e', 'r', 's').
+    """
+    header, scripts, commands = {}, {}, []
+    with gzip.open(fileName, "rt", encoding="utf-8") as file:
+        for line in file:
+            entry = json.loads(line)
+            entryType = entry.get("type")
+            if entryType == "header":
+                header = entry
+            elif entryType == "script":
+                scripts[entry["ref"]] = entry["source"]
+            else:
+                if "scriptRef" in entry["p"]:
+                    entry["p"]["script"] = scripts[entry["p"].pop("scriptRef")]
+                commands.append(entry)
+    return header, commands
+
+
+def get_command_key(entry):
+    """
+        Get what identifies a command when two traces are aligned: the command with its locator or script.
+        Navigations are not told apart by URL, so that a replay against the stand-in site aligns with its recording.
+    """
+    params = entry["p"]
+    detail = params.get("using", "") + "=" + params.get("value", "") if "using" in params else ""
+    if "script" in params:
+        detail = f'script#{zlib.crc32(params["script"].encode("utf-8")):08x}'
+    return f'{entry["c"]} {detail}'.strip()
+
+
+def compare_traces(baseCommands, otherCommands):
+    """
+        Compare two traces command by command. The commands are aligned by their keys (see get_command_key), so
+        retried or extra commands in one trace do not shift the rest.
+
+        Returns:
+            dict: 'pairs' (every aligned command: key, base and other duration in ms and the difference), 'onlyBase' and
+                'onlyOther' (the unaligned commands) and 'byCommand' (the totals per command type).
+    """
+    matcher = difflib.SequenceMatcher(None, [get_command_key(entry) for entry in baseCommands],
+                                      [get_command_key(entry) for entry in otherCommands], autojunk=False)
+    pairs, onlyBase, onlyOther = [], [], []
+    for tag, baseStart, baseStop, otherStart, otherStop in matcher.get_opcodes():
+        if tag == "equal":
+            for base, other in zip(baseCommands[baseStart:baseStop], otherCommands[otherStart:otherStop]):
+                pairs.append({"key": get_command_key(base), "step": base.get("s"), "baseMs": base["d"],
+                              "otherMs": other["d"], "deltaMs": round(other["d"] - base["d"], 3)})
+        else:
+            onlyBase.extend(baseCommands[baseStart:baseStop])
+            onlyOther.extend(otherCommands[otherStart:otherStop])
+
+    byCommand = {}
+    for trace, name in ((baseCommands, "baseMs"), (otherCommands, "otherMs")):
+        for entry in trace:
+            totals = byCommand.setdefault(entry["c"], {"baseCount": 0, "otherCount": 0, "baseMs": 0.0, "otherMs": 0.0})
+            totals[name] = round(totals[name] + entry["d"], 3)
+            totals[name.replace("Ms", "Count")] += 1
+    return {"pairs": pairs, "onlyBase": onlyBase, "onlyOther": onlyOther, "byCommand": byCommand}
@@ -1,5 +1,14 @@
+import time
+
+from selenium.common.exceptions import ElementClickInterceptedException, NoSuchElementException, \
+    StaleElementReferenceException, TimeoutException
 from selenium.webdriver.support.events import AbstractEventListener
-from common_.utilities_ import customLogger
+from common_.utilities_ import commandTimer, customLogger, elementCache, failureArtifacts, launchProfiles, pageMetrics
+
+
+# Raised on purpose while the framework polls or checks a cached element (missing and stale elements, clicks on covered
+# elements, timed out in-browser waits); BasePage captures the artifacts itself when it gives up
+HANDLED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException, ElementClickInterceptedException, TimeoutException)
 
 
 class CustomListener(AbstractEventListener):
@@ -21,16 +30,45 @@ class CustomListener(AbstractEventListener):
         self.browserName = driver.capabilities['browserName']
         self.browserVersion = driver.capabilities['browserVersion']
         self.platformName = driver.capabilities['platformName']
+        self.__pendingCommand = None
 
-    # def before_navigate_to(self, url, driver):
-    #     """
-    #         Called before navigating to a new URL.
-    #
-    #         Args:
-    #             url (str): The URL to navigate to.
-    #             driver (webdriver.Chrome): The WebDriver instance.
-    #     """
-    #     customLogger.logger("INFO", f"Preparing to navigate to: {url} using {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+    def __start(self, command, locator=None):
+        """
+            Start timing a WebDriver command. The page object method issuing it is resolved now, while it is on the stack.
+        """
+        self.__pendingCommand = (command, locator, commandTimer.get_current_step(), time.perf_counter())
+
+    def __stop(self, failed=False):
+        """
+            Stop timing the pending WebDriver command, record it in the command histograms and return its duration in ms.
+            Failed commands are recorded separately (e.g. 'find (failed)'), so polling for missing elements stands out.
+        """
+        if self.__pendingCommand is None:
+            return None
+        command, locator, step, startTime = self.__pendingCommand
+        self.__pendingCommand = None
+        seconds = time.perf_counter() - startTime
+        commandTimer.record(f"{command} (failed)" if failed else command, seconds, locator, step)
+        return round(seconds * 1000, 3)
+
+    def __log(self, event, message, *args, **fields):
+        """
+            Queue an INFO message about a WebDriver event. The browser name, version and platform are appended to the
+            message arguments and written as structured fields, so the line is only formatted if INFO is enabled.
+        """
+        customLogger.logger("INFO", message, *args, self.browserName, self.browserVersion, self.platformName,
+                            event=event, browser=self.browserName, browserVersion=self.browserVersion, **fields)
+
+    def before_navigate_to(self, url, driver):
+        """
+            Called before navigating to a new URL.
+
+            Args:
+                url (str): The URL to navigate to.
+                driver (webdriver.Chrome): The WebDriver instance.
+        """
+        launchProfiles.measure_pending_navigation(driver)
+        self.__start("navigate_to")
 
     def after_navigate_to(self, url, driver):
         """
@@ -40,16 +78,21 @@ class CustomListener(AbstractEventListener):
                 url (str): The URL that was navigated to.
                 driver (webdriver.Chrome): The WebDriver instance.
         """
-        customLogger.logger("INFO", f"Successfully navigated to: {url} using {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+        elementCache.notify_navigation(driver)
+        durationMs = self.__stop()
+        launchProfiles.record_navigation(driver, url, durationMs)
+        pageMetrics.record_navigation(driver)
+        self.__log("navigate_to", "Successfully navigated to: %s using %s driver (Version %s) on %s", url, url=url, durationMs=durationMs)
 
-    # def before_navigate_back(self, driver):
-    #     """
-    #         Called before navigating back to the previous page.
-    #
-    #         Args:
-    #             driver (webdriver.Chrome): The WebDriver instance.
-    #     """
-    #     customLogger.logger("INFO", f"Preparing to navigate back from: {driver.current_url} in {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+    def before_navigate_back(self, driver):
+        """
+            Called before navigating back to the previous page.
+
+            Args:
+                driver (webdriver.Chrome): The WebDriver instance.
+        """
+        launchProfiles.measure_pending_navigation(driver)
+        self.__start("navigate_back")
 
     def after_navigate_back(self, driver):
         """
@@ -58,16 +101,20 @@ class CustomListener(AbstractEventListener):
             Args:
                 driver (webdriver.Chrome): The WebDriver instance.
         """
-        customLogger.logger("INFO", f"Successfully navigated back to: {driver.current_url} in {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+        elementCache.notify_navigation(driver)
+        durationMs = self.__stop()
+        pageMetrics.record_navigation(driver, "back")
+        self.__log("navigate_back", "Successfully navigated back in %s driver (Version %s) on %s", durationMs=durationMs)
+
+    def before_navigate_forward(self, driver):
+        """
+            Called before navigating forward to a page.
 
-    # def before_navigate_forward(self, driver):
-    #     """
-    #         Called before navigating forward to a page.
-    #
-    #         Args:
-    #             driver (webdriver.Chrome): The WebDriver instance.
-    #     """
-    #     customLogger.logger("INFO", f"Preparing to navigate forward from: {driver.current_url} in {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+            Args:
+                driver (webdriver.Chrome): The WebDriver instance.
+        """
+        launchProfiles.measure_pending_navigation(driver)
+        self.__start("navigate_forward")
 
     def after_navigate_forward(self, driver):
         """
@@ -76,18 +123,21 @@ class CustomListener(AbstractEventListener):
             Args:
                 driver (webdriver.Chrome): The WebDriver instance.
         """
-        customLogger.logger("INFO", f"Successfully navigated forward to: {driver.current_url} in {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+        elementCache.notify_navigation(driver)
+        durationMs = self.__stop()
+        pageMetrics.record_navigation(driver, "forward")
+        self.__log("navigate_forward", "Successfully navigated forward in %s driver (Version %s) on %s", durationMs=durationMs)
 
-    # def before_find(self, by, value, driver):
-    #     """
-    #         Called before attempting to find an element by a specific locator.
-    #
-    #         Args:
-    #             by: The locator strategy used to find the element.
-    #             value: The value of the locator.
-    #             driver (webdriver.Chrome): The WebDriver instance.
-    #     """
-    #     customLogger.logger("INFO", f"Preparing to find an element with the locator By: {by}, Value: {value} using {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+    def before_find(self, by, value, driver):
+        """
+            Called before attempting to find an element by a specific locator.
+
+            Args:
+                by: The locator strategy used to find the element.
+                value: The value of the locator.
+                driver (webdriver.Chrome): The WebDriver instance.
+        """
+        self.__start("find", (by, value))
 
     def after_find(self, by, value, driver):
         """
@@ -98,17 +148,17 @@ class CustomListener(AbstractEventListener):
                 value: The value of the locator.
                 driver (webdriver.Chrome): The WebDriver instance.
         """
-        customLogger.logger("INFO", "An element was successfully found using the locator By: {by}, Value: {value} in {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+        self.__log("find", "An element was successfully found using the locator By: %s, Value: %s in %s driver (Version %s) on %s", by, value, by=by, value=value, durationMs=self.__stop())
 
-    # def before_click(self, element, driver):
-    #     """
-    #         Called before clicking on an element.
-    #
-    #         Args:
-    #             element: The element to be clicked.
-    #             driver (webdriver.Chrome): The WebDriver instance.
-    #     """
-    #     customLogger.logger("INFO", f"Preparing to click on the element: {element} in {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+    def before_click(self, element, driver):
+        """
+            Called before clicking on an element.
+
+            Args:
+                element: The element to be clicked.
+                driver (webdriver.Chrome): The WebDriver instance.
+        """
+        self.__start("click", commandTimer.get_element_locator(element))
 
     def after_click(self, element, driver):
         """
@@ -118,17 +168,17 @@ class CustomListener(AbstractEventListener):
                 element: The element that was clicked.
                 driver (webdriver.Chrome): The WebDriver instance.
         """
-        customLogger.logger("INFO", f"The element '{element}' was successfully clicked in {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+        self.__log("click", "The element '%s' was successfully clicked in %s driver (Version %s) on %s", element, durationMs=self.__stop())
 
-    # def before_change_value_of(self, element, driver):
-    #     """
-    #         Called before changing the value of an element.
-    #
-    #         Args:
-    #             element: The element whose value will be changed.
-    #             driver (webdriver.Chrome): The WebDriver instance.
-    #     """
-    #     customLogger.logger("INFO", f"Preparing to change the value of the element: {element} in {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+    def before_change_value_of(self, element, driver):
+        """
+            Called before changing the value of an element.
+
+            Args:
+                element: The element whose value will be changed.
+                driver (webdriver.Chrome): The WebDriver instance.
+        """
+        self.__start("change_value_of", commandTimer.get_element_locator(element))
 
     def after_change_value_of(self, element, driver):
         """
@@ -138,17 +188,17 @@ class CustomListener(AbstractEventListener):
                 element: The element whose value was changed.
                 driver (webdriver.Chrome): The WebDriver instance.
         """
-        customLogger.logger("INFO", f"The value of the element '{element}' was successfully changed in {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+        self.__log("change_value_of", "The value of the element '%s' was successfully changed in %s driver (Version %s) on %s", element, durationMs=self.__stop())
 
-    # def before_execute_script(self, script, driver):
-    #     """
-    #         Called before executing a script in the browser.
-    #
-    #         Args:
-    #             script (str): The script to be executed.
-    #             driver (webdriver.Chrome): The WebDriver instance.
-    #     """
-    #     customLogger.logger("INFO", f"Preparing to execute the script: {script} in {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+    def before_execute_script(self, script, driver):
+        """
+            Called before executing a script in the browser.
+
+            Args:
+                script (str): The script to be executed.
+                driver (webdriver.Chrome): The WebDriver instance.
+        """
+        self.__start("execute_script")
 
     def after_execute_script(self, script, driver):
         """
@@ -158,16 +208,16 @@ class CustomListener(AbstractEventListener):
                 script (str): The script that was executed.
                 driver (webdriver.Chrome): The WebDriver instance.
         """
-        customLogger.logger("INFO", f"The script '{script}' was executed successfully in the {self.browserName} browser (Version {self.browserVersion}) on {self.platformName}")
+        self.__log("execute_script", "The script '%s' was executed successfully in the %s browser (Version %s) on %s", script, durationMs=self.__stop())
 
-    # def before_close(self, driver):
-    #     """
-    #         Called before closing the browser.
-    #
-    #         Args:
-    #             driver (webdriver.Chrome): The WebDriver instance.
-    #     """
-    #     customLogger.logger("INFO", f"Preparing to close the {self.browserName} browser (Version {self.browserVersion}) on {self.platformName}")
+    def before_close(self, driver):
+        """
+            Called before closing the browser.
+
+            Args:
+                driver (webdriver.Chrome): The WebDriver instance.
+        """
+        self.__start("close")
 
     def after_close(self, driver):
         """
@@ -176,16 +226,17 @@ class CustomListener(AbstractEventListener):
             Args:
                 driver (webdriver.Chrome): The WebDriver instance.
         """
-        customLogger.logger("INFO", f"The {self.browserName} browser (Version {self.browserVersion}) on {self.platformName} has been successfully closed.")
+        self.__log("close", "The %s browser (Version %s) on %s has been successfully closed.", durationMs=self.__stop())
+
+    def before_quit(self, driver):
+        """
+            Called before quitting the browser.
 
-    # def before_quit(self, driver):
-    #     """
-    #         Called before quitting the browser.
-    #
-    #         Args:
-    #             driver (webdriver.Chrome): The WebDriver instance.
-    #     """
-    #     customLogger.logger("INFO", f"Preparing to quit the browser (Version {self.browserVersion}) on {self.platformName}")
+            Args:
+                driver (webdriver.Chrome): The WebDriver instance.
+        """
+        launchProfiles.measure_pending_navigation(driver)
+        self.__start("quit")
 
     def after_quit(self, driver):
         """
@@ -194,14 +245,19 @@ class CustomListener(AbstractEventListener):
             Args:
                 driver (webdriver.Chrome): The WebDriver instance.
         """
-        customLogger.logger("INFO", f"The browser (Version {self.browserVersion}) on {self.platformName} has been successfully quit.")
+        self.__log("quit", "The %s browser (Version %s) on %s has been successfully quit.", durationMs=self.__stop())
 
     def on_exception(self, exception, driver):
         """
             Called when an exception occurs during WebDriver operations.
+            A screenshot, the page source, the console logs and the URL are captured for the failure, unless the
+            framework handles the exception (HANDLED_EXCEPTIONS).
 
             Args:
                 exception (Exception): The exception that occurred.
                 driver (webdriver.Chrome): The WebDriver instance.
         """
-        customLogger.logger("INFO", f"Exception occurred: {str(exception)} in {self.browserName} driver (Version {self.browserVersion}) on {self.platformName}")
+        self.__log("exception", "Exception occurred: %s in %s driver (Version %s) on %s", exception,
+                   exception=type(exception).__name__, durationMs=self.__stop(failed=True))
+        if not isinstance(exception, HANDLED_EXCEPTIONS):
+            failureArtifacts.capture(driver, type(exception).__name__, exception=str(exception))
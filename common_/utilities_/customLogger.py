@@ -1,47 +1,211 @@
-from pathlib import Path
+import atexit
+import json
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from logging.handlers import QueueListener, RotatingFileHandler
 
+from common_.utilities_ import projectPaths
 
-def _get_root_directory():
+LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+_minimumLevel = LEVELS.get(os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO)
+_defaultFileName = None
+_backends = {}
+_backendsLock = threading.Lock()
+_isShutDown = False
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        """
+            Format a log record as one JSON object per line, including the structured fields passed to logger().
+            A field named like one of the core keys (e.g. time or worker) is written as 'fields.<name>' instead of
+            overwriting it.
+        """
+        entry = {
+            "time": f'{self.formatTime(record, "%Y-%m-%dT%H:%M:%S")}.{int(record.msecs):03d}',
+            "level": record.levelname,
+            "worker": record.worker,
+            "pid": record.process,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for name, value in record.fields.items():
+            entry[f"fields.{name}" if name in entry else name] = value
+        return json.dumps(entry, default=str)
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    def __init__(self, fileName, maxBytes=0, backupCount=0, rotateSeconds=0):
+        """
+            Initialize a file handler that rolls the file over when it grows past maxBytes or gets older than rotateSeconds.
+            A limit of 0 disables that kind of rotation.
+        """
+        super().__init__(fileName, mode="a", maxBytes=maxBytes, backupCount=backupCount, encoding="utf-8", delay=True)
+        self.rotateSeconds = rotateSeconds
+        self.__openedAt = time.time()
+
+    def shouldRollover(self, record):
+        if self.rotateSeconds and time.time() - self.__openedAt >= self.rotateSeconds:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.__openedAt = time.time()
+
+
+class _LogBackend:
+    def __init__(self, fileName, synchronous=False):
+        """
+            Initialize a queue and a background thread that formats and writes the queued records to the file.
+            A synchronous backend (used after the process-wide shutdown) has no thread and writes every record at once.
+        """
+        os.makedirs(os.path.dirname(fileName), exist_ok=True)
+        handler = SizeAndTimeRotatingFileHandler(fileName,
+                                                 maxBytes=int(os.environ.get("LOG_MAX_BYTES", "0")),
+                                                 backupCount=int(os.environ.get("LOG_BACKUP_COUNT", "5")),
+                                                 rotateSeconds=int(os.environ.get("LOG_ROTATE_SECONDS", "0")))
+        handler.setFormatter(JsonLinesFormatter())
+
+        self.pid = os.getpid()
+        self.queue = queue.SimpleQueue()
+        self.listener = QueueListener(self.queue, handler)
+        # Serializes flush and stop: both restart or end the background thread, which another thread may be doing too
+        self.lock = threading.Lock()
+        self.stopped = synchronous
+        if not synchronous:
+            self.listener.start()
+
+    def put(self, record):
+        """
+            Queue a record for the background thread, or write it right away once the thread is stopped.
+        """
+        self.queue.put(record)
+        # Checked after the put: a record queued while stop() ran is written here instead of being left in the queue
+        if self.stopped:
+            self.__write_queued()
+
+    def __write_queued(self):
+        while True:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            self.listener.handle(record)
+
+    def flush(self):
+        """
+            Wait until every queued record has been written, then keep the background thread running.
+        """
+        with self.lock:
+            if not self.stopped:
+                self.listener.stop()
+                self.listener.start()
+
+    def stop(self):
+        """
+            Write the remaining records, stop the background thread and close the file.
+        """
+        with self.lock:
+            if self.stopped:
+                return
+            self.stopped = True
+            self.listener.stop()
+            self.__write_queued()
+            for handler in self.listener.handlers:
+                handler.close()
+
+
+def get_default_file_name():
+    """
+        Get the log file of the current process. The name is built on first use, so every process (and every worker
+        of the parallel runner, identified by WORKER_ID) writes to its own file.
     """
-        Get the root directory of the project based on the current file's location.
+    global _defaultFileName
+    if _defaultFileName is None:
+        worker = os.environ.get("WORKER_ID", str(os.getpid()))
+        _defaultFileName = os.path.join(projectPaths.get_root_directory(), 'logs_',
+                                        f'log_{datetime.now().strftime("%d_%m_%Y_%H-%M-%S")}_worker-{worker}.jsonl')
+    return _defaultFileName
+
+
+def _get_backend(fileName):
+    """
+        Get the backend writing to the given file, starting it on first use (and again in a forked process).
+        After the shutdown at exit, no thread would be left to stop a new one, so the new backends write synchronously.
     """
-    try:
-        projectName = "amazon_automation"
-        currentPath = Path(__file__)
-        projectRootPath = Path((str(currentPath).split(projectName))[0]) / projectName
+    backend = _backends.get(fileName)
+    if backend is not None and backend.pid == os.getpid():
+        return backend
+    with _backendsLock:
+        backend = _backends.get(fileName)
+        if backend is None or backend.pid != os.getpid():
+            backend = _LogBackend(fileName, synchronous=_isShutDown)
+            _backends[fileName] = backend
+        return backend
 
-        return projectRootPath
 
-    except FileNotFoundError as e:
-        logger("ERROR", f"Error: The directory was not found: {str(e)}")
-        exit(6)
-    except Exception as e:
-        logger("ERROR", f"Error: An unexpected error occurred: {str(e)}")
-        exit(5)
+def set_level(level):
+    """
+        Set the minimum level that is logged. Messages below it are dropped before they are formatted.
+    """
+    global _minimumLevel
+    _minimumLevel = LEVELS[level]
+
+
+def is_enabled(level):
+    """
+        Check if messages at the given level are logged.
+    """
+    return LEVELS.get(level, 0) >= _minimumLevel
 
 
-def logger(level, message, fileName=os.path.join(_get_root_directory(), 'logs_', f'log_{datetime.now().strftime("%d_%m_%Y_%H-%M-%S")}.log')):
+def logger(level, message, *args, fileName=None, **fields):
     """
-        Log messages at different log levels (INFO, DEBUG, WARNING, ERROR, CRITICAL) with exception handling.
+        Log messages at different log levels (INFO, DEBUG, WARNING, ERROR, CRITICAL) as JSON lines.
+        The caller only puts the record on a queue: %-style args are merged into the message and the line is written
+        by a background thread, and nothing is done at all when the level is disabled.
+        Extra keyword arguments are written as structured fields of the JSON line (see JsonLinesFormatter).
+        fileName is keyword-only: a third positional argument is a %-style argument of the message.
     """
-    try:
-        logging.basicConfig(level=logging.INFO, filename=fileName, filemode="a",
-                            format="%(asctime)-12s %(levelname)s %(message)s",
-                            datefmt="%d-%m-%Y %H:%M:%S")
+    levelNumber = LEVELS.get(level)
+    if levelNumber is None or levelNumber < _minimumLevel:
+        return
 
-        if level == "INFO":
-            logging.info(message)
-        elif level == "DEBUG":
-            logging.debug(message)
-        elif level == "WARNING":
-            logging.warning(message)
-        elif level == "ERROR":
-            logging.error(message)
-        elif level == "CRITICAL":
-            logging.critical(message)
-    except Exception as e:
-        logger("ERROR", f"Error: An error occurred while logging: {str(e)}")
-        exit(7)
+    record = logging.LogRecord("amazon_automation", levelNumber, "", 0, message, args, None)
+    record.worker = os.environ.get("WORKER_ID")
+    record.fields = fields
+    _get_backend(fileName or get_default_file_name()).put(record)
+
+
+def flush():
+    """
+        Block until every queued message has been written to its file.
+    """
+    for backend in list(_backends.values()):
+        if backend.pid == os.getpid():
+            backend.flush()
+
+
+@atexit.register
+def _shutdown():
+    """
+        Write the remaining messages and stop the background threads when the process exits. Messages logged later
+        (e.g. by other exit handlers) are written synchronously.
+    """
+    global _isShutDown
+    _isShutDown = True
+    for backend in list(_backends.values()):
+        if backend.pid == os.getpid():
+            backend.stop()
@@ -0,0 +1,74 @@
+import csv
+import itertools
+import json
+import os
+
+from common_.utilities_ import projectPaths
+
+
+def resolve_data_file(fileName):
+    """
+        Get the path of a data file, relative to testData_/ unless it is absolute.
+    """
+    if os.path.isabs(fileName):
+        return fileName
+    return os.path.join(projectPaths.get_root_directory(), "testData_", fileName)
+
+
+def count_rows(fileName):
+    """
+        Count the data rows of a CSV (without the header) or JSON lines file, reading it line by line. The rows are
+        counted the way stream_rows reads them, so blank lines are not rows.
+    """
+    with open(resolve_data_file(fileName), encoding="utf-8", newline="") as file:
+        if fileName.endswith(".csv"):
+            return sum(1 for _ in csv.DictReader(file))
+        return sum(1 for line in file if line.strip())
+
+
+def get_row_range(fileName, rows=None, shard=None):
+    """
+        Get the [start, stop) row range this process runs.
+
+        Args:
+            fileName (str): The data file.
+            rows (str): An explicit range 'start:stop' (either end may be empty). DATA_ROWS by default.
+            shard (str): 'index/count': the index-th of count contiguous, equally long ranges. DATA_SHARD by default.
+                Only used without an explicit range; counting the rows takes one pass over the file.
+    """
+    rows = rows if rows is not None else os.environ.get("DATA_ROWS")
+    shard = shard if shard is not None else os.environ.get("DATA_SHARD")
+    if rows:
+        start, _, stop = rows.partition(":")
+        return int(start or 0), int(stop) if stop else None
+    if shard:
+        index, count = (int(part) for part in shard.split("/"))
+        total = count_rows(fileName)
+        return total * index // count, total * (index + 1) // count
+    return 0, None
+
+
+def stream_rows(fileName, start=0, stop=None):
+    """
+        Yield the rows of a CSV (dicts keyed by the header) or JSON lines file one at a time, with their row numbers.
+        The file is never loaded as a whole, so the data sets can be as large as needed.
+
+        Args:
+            fileName (str): The data file, relative to testData_/ unless it is absolute.
+            start (int): The first row number (0 is the first data row).
+            stop (int): The row number to stop before, or None for the end of the file.
+
+        Raises:
+            ValueError: A JSON line of the range is not an object.
+    """
+    with open(resolve_data_file(fileName), encoding="utf-8", newline="") as file:
+        if fileName.endswith(".csv"):
+            yield from itertools.islice(enumerate(csv.DictReader(file)), start, stop)
+            return
+        # The lines before the range are skipped without being parsed
+        lines = (line for line in file if line.strip())
+        for rowNumber, line in itertools.islice(enumerate(lines), start, stop):
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError(f"Row {rowNumber} of {fileName} is not a JSON object: {line.strip()[:100]}")
+            yield rowNumber, row
@@ -0,0 +1,598 @@
+import argparse
+import base64
+import collections
+import hmac
+import ipaddress
+import json
+import math
+import os
+import socket
+import sys
+import threading
+import time
+import traceback
+import unittest
+from datetime import datetime
+
+from common_.utilities_ import customLogger, failureArtifacts, parallelRunner, preconditionGraph, projectPaths
+from common_.utilities_.parallelRunner import RecordingResult, get_traceback_file_name
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+# The shared secret agents send in their hello message; a coordinator listening beyond the loopback interface requires it
+TOKEN_VARIABLE = "DISTRIBUTED_TOKEN"
+# Agents send a heartbeat (with their new log lines) this often; an agent silent for the timeout is considered lost
+HEARTBEAT_SECONDS = 2.0
+HEARTBEAT_TIMEOUT_SECONDS = 30.0
+# A test whose agent was lost this many times while running it is reported as an error instead of being requeued again
+MAX_ATTEMPTS = 2
+
+
+def _send(connection, lock, message):
+    """
+        Send one message as a JSON line. Several threads send on one connection, so every send holds its lock.
+    """
+    data = (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+    with lock:
+        connection.sendall(data)
+
+
+class _AgentState:
+    def __init__(self, agentId, host, connection):
+        """
+            Initialize what the coordinator knows about a connected agent.
+
+            Attributes:
+                assigned (list): The tests handed to the agent that have not finished, in the agent's order.
+                current (str): The test the agent is running.
+                idle (bool): The agent has no tests left and waits for more.
+                stealPending (bool): The agent was asked to give back tests and has not answered yet.
+        """
+        self.agentId = agentId
+        self.host = host
+        self.connection = connection
+        self.sendLock = threading.Lock()
+        self.assigned = []
+        self.current = None
+        self.idle = False
+        self.stealPending = False
+        self.lastSeen = time.monotonic()
+        self.finishedTests = 0
+        self.lost = False
+        self.done = False
+
+    def count_unstarted(self):
+        return len(self.assigned) - (1 if self.current in self.assigned else 0)
+
+
+def is_loopback_host(host):
+    """
+        Check whether a host name or address only accepts connections from this machine.
+    """
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class Coordinator:
+    def __init__(self, testIds, host=DEFAULT_HOST, port=DEFAULT_PORT, runDirectory=None,
+                 heartbeatTimeout=HEARTBEAT_TIMEOUT_SECONDS, token=None):
+        """
+            Initialize the coordinator of a distributed run: it hands the tests out over TCP to worker agents on any
+            number of hosts and collects their results, logs and failure artifacts.
+
+            Every idle agent gets its share of the queue (the queue split over the connected agents). When the queue
+            is empty, an idle agent steals: the agent with the most unstarted tests gives back half of them. The tests
+            of a lost agent (closed connection or no heartbeat within heartbeatTimeout) go back to the front of the queue.
+
+            Args:
+                testIds (list): The tests to run, in the order they should be handed out.
+                host (str): The interface to listen on, only this machine by default.
+                port (int): The port to listen on, 0 for any free port.
+                runDirectory (str): Where the agents' logs and artifacts are written, under agents_/<agent id>/.
+                heartbeatTimeout (float): The seconds without a message after which an agent is considered lost.
+                token (str): The secret an agent must send to join, DISTRIBUTED_TOKEN by default. Agents run the tests
+                    they are given and write files into the run directory, so it is required on any other interface.
+
+            Raises:
+                ValueError: If the coordinator would listen beyond the loopback interface without a token.
+        """
+        self.__token = token if token is not None else os.environ.get(TOKEN_VARIABLE)
+        if not self.__token and not is_loopback_host(host):
+            raise ValueError(f"The coordinator listens on {host} and needs a shared token: set {TOKEN_VARIABLE} on the "
+                             f"coordinator and on every agent")
+        self.runDirectory = runDirectory or os.path.join(projectPaths.get_project_directory("reports_"),
+                                                         f'distributed_{datetime.now().strftime("%d_%m_%Y_%H-%M-%S")}')
+        self.heartbeatTimeout = heartbeatTimeout
+        self.__server = socket.create_server((host, port))
+        self.__condition = threading.Condition()
+        # A test id is handed out and reported once
+        self.__queue = collections.deque(dict.fromkeys(testIds))
+        self.__total = len(self.__queue)
+        self.__attempts = {}
+        self.__results = []
+        self.__finished = set()
+        self.__agents = {}
+        self.__stats = {"steals": 0, "stolenTests": 0, "requeuedTests": 0, "lostAgents": 0}
+        self.__closed = False
+
+    @property
+    def address(self):
+        """
+            The (host, port) the coordinator listens on.
+        """
+        return self.__server.getsockname()[:2]
+
+    def start(self):
+        """
+            Start accepting agents and watching their heartbeats in background threads.
+        """
+        threading.Thread(target=self.__accept, name="coordinator-accept", daemon=True).start()
+        threading.Thread(target=self.__watch_heartbeats, name="coordinator-heartbeats", daemon=True).start()
+        return self
+
+    def __accept(self):
+        while not self.__closed:
+            try:
+                connection, address = self.__server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.__serve, args=(connection, address), name=f"coordinator-{address[0]}:{address[1]}",
+                             daemon=True).start()
+
+    def __watch_heartbeats(self):
+        """
+            Drop the connection of every agent that has been silent for longer than the heartbeat timeout; its handler
+            then requeues its tests.
+        """
+        while not self.__closed:
+            time.sleep(min(1.0, self.heartbeatTimeout / 4))
+            with self.__condition:
+                silentAgents = [agent for agent in self.__agents.values() if not agent.lost and not agent.done
+                                and time.monotonic() - agent.lastSeen > self.heartbeatTimeout]
+            for agent in silentAgents:
+                customLogger.logger("WARNING", "The agent %s sent no heartbeat for %s s", agent.agentId, self.heartbeatTimeout,
+                                    event="agent_timeout", agent=agent.agentId)
+                try:
+                    agent.connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def __serve(self, connection, address):
+        """
+            Handle the messages of one agent until it disconnects.
+        """
+        agent = None
+        try:
+            for line in connection.makefile("r", encoding="utf-8"):
+                message = json.loads(line)
+                if agent is None:
+                    agent = self.__register(message, connection, address)
+                    if agent is None:
+                        break
+                else:
+                    self.__handle(agent, message)
+        except (OSError, ValueError):
+            pass
+        finally:
+            if agent is not None:
+                self.__lose_agent(agent)
+            connection.close()
+
+    def __register(self, message, connection, address):
+        """
+            Register an agent from its hello message, or return None if the message is not a hello with the token.
+        """
+        token = message.get("token") or ""
+        if message.get("type") != "hello" or (self.__token and not hmac.compare_digest(token.encode(), self.__token.encode())):
+            customLogger.logger("WARNING", "Warning: A connection from %s was rejected: no hello with the shared token",
+                                address[0], event="agent_rejected", host=address[0])
+            return None
+        agent = _AgentState(message["agentId"], message.get("host", address[0]), connection)
+        with self.__condition:
+            self.__agents[agent.agentId] = agent
+        customLogger.logger("INFO", "The agent %s joined from %s", agent.agentId, agent.host, event="agent_joined",
+                            agent=agent.agentId, host=agent.host)
+        return agent
+
+    def __handle(self, agent, message):
+        messageType = message["type"]
+        if messageType == "log":
+            self.__write_agent_file(agent, message["file"], message["data"].encode("utf-8"), "ab")
+        elif messageType == "artifact":
+            self.__write_agent_file(agent, os.path.join("artifacts_", message["path"]), base64.b64decode(message["data"]), "wb")
+        with self.__condition:
+            agent.lastSeen = time.monotonic()
+            if messageType == "started":
+                agent.current = message["test"]
+            elif messageType == "finished":
+                testId = message["test"]
+                if testId in agent.assigned:
+                    agent.assigned.remove(testId)
+                agent.current = None
+                agent.finishedTests += 1
+                if testId not in self.__finished:
+                    self.__finished.add(testId)
+                    self.__results.extend({**result, "agent": agent.agentId} for result in message["results"])
+                self.__condition.notify_all()
+            elif messageType == "idle":
+                agent.idle = True
+            elif messageType == "released":
+                for testId in message["tests"]:
+                    agent.assigned.remove(testId)
+                self.__queue.extendleft(reversed(message["tests"]))
+                self.__stats["stolenTests"] += len(message["tests"])
+                agent.stealPending = False
+            elif messageType == "bye":
+                agent.done = True
+            else:
+                return
+            messages = self.__dispatch()
+        self.__send_all(messages)
+
+    def __write_agent_file(self, agent, relativePath, data, mode):
+        # The agent id and path come from the network; keep the files inside the agent's directory
+        agentDirectory = os.path.abspath(os.path.join(self.runDirectory, "agents_", os.path.basename(agent.agentId)))
+        path = os.path.abspath(os.path.join(agentDirectory, relativePath))
+        if not path.startswith(agentDirectory + os.sep):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode) as file:
+            file.write(data)
+
+    def __dispatch(self):
+        """
+            Hand out work to the idle agents: a share of the queue, or else a steal from the busiest agent.
+            Called with the lock held; returns the messages to send once it is released.
+        """
+        activeAgents = [agent for agent in self.__agents.values() if not agent.lost and not agent.done]
+        if len(self.__finished) == self.__total:
+            self.__condition.notify_all()
+            return [(agent, {"type": "done"}) for agent in activeAgents if agent.idle]
+        messages = []
+        for agent in activeAgents:
+            if not agent.idle:
+                continue
+            if self.__queue:
+                count = min(len(self.__queue), max(1, math.ceil(len(self.__queue) / len(activeAgents))))
+                tests = [self.__queue.popleft() for _ in range(count)]
+                agent.assigned.extend(tests)
+                agent.idle = False
+                messages.append((agent, {"type": "tests", "tests": tests}))
+                continue
+            victims = [victim for victim in activeAgents if not victim.stealPending and victim.count_unstarted() > 0]
+            if victims:
+                victim = max(victims, key=lambda victim: victim.count_unstarted())
+                victim.stealPending = True
+                self.__stats["steals"] += 1
+                messages.append((victim, {"type": "steal", "count": math.ceil(victim.count_unstarted() / 2)}))
+        return messages
+
+    def __send_all(self, messages):
+        for agent, message in messages:
+            try:
+                _send(agent.connection, agent.sendLock, message)
+            except OSError:
+                pass
+
+    def __lose_agent(self, agent):
+        """
+            Requeue the unfinished tests of an agent that disconnected without being done.
+            The test it was running counts as an attempt; after MAX_ATTEMPTS it is reported as an error.
+        """
+        with self.__condition:
+            if agent.done or agent.lost:
+                return
+            agent.lost = True
+            self.__stats["lostAgents"] += 1
+            requeued = []
+            for testId in agent.assigned:
+                if testId == agent.current:
+                    self.__attempts[testId] = self.__attempts.get(testId, 0) + 1
+                if self.__attempts.get(testId, 0) >= MAX_ATTEMPTS:
+                    self.__finished.add(testId)
+                    self.__results.append({"id": testId, "status": "error", "duration": 0.0, "agent": agent.agentId,
+                                           "traceback": f"The agent running the test was lost {MAX_ATTEMPTS} times"})
+                else:
+                    requeued.append(testId)
+            agent.assigned = []
+            self.__queue.extendleft(reversed(requeued))
+            self.__stats["requeuedTests"] += len(requeued)
+            messages = self.__dispatch()
+        customLogger.logger("WARNING", "The agent %s was lost, %s tests were requeued", agent.agentId, len(requeued),
+                            event="agent_lost", agent=agent.agentId, requeued=requeued)
+        self.__send_all(messages)
+
+    def wait(self, timeout=None):
+        """
+            Block until every test has a result.
+
+            Returns:
+                bool: False if the timeout passed first.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(lambda: len(self.__finished) == self.__total, timeout)
+
+    def get_report(self):
+        """
+            Get the results so far, with the statistics of the run and of every agent.
+        """
+        with self.__condition:
+            return {"results": list(self.__results), "queued": len(self.__queue), **self.__stats,
+                    "agents": [{"agentId": agent.agentId, "host": agent.host, "finishedTests": agent.finishedTests,
+                                "lost": agent.lost} for agent in self.__agents.values()]}
+
+    def stop(self):
+        """
+            Stop accepting agents and tell the connected ones that the run is over.
+        """
+        self.__closed = True
+        self.__server.close()
+        with self.__condition:
+            agents = [agent for agent in self.__agents.values() if not agent.lost and not agent.done]
+        self.__send_all([(agent, {"type": "done"}) for agent in agents])
+
+
+class WorkerAgent:
+    def __init__(self, coordinatorAddress, agentId=None, connectTimeout=30.0, token=None):
+        """
+            Initialize a worker agent: it runs the tests the coordinator hands it, one at a time, in this process, so
+            all of them share the process-wide driver pool and its warm browser.
+
+            Args:
+                coordinatorAddress (tuple): The (host, port) of the coordinator.
+                agentId (str): The unique name of the agent, '<host name>-<pid>' by default. It is the WORKER_ID of
+                    its logs and artifacts.
+                connectTimeout (float): How long to keep trying to reach the coordinator.
+                token (str): The coordinator's shared secret, DISTRIBUTED_TOKEN by default.
+        """
+        self.coordinatorAddress = coordinatorAddress
+        self.agentId = agentId or f"{socket.gethostname()}-{os.getpid()}"
+        self.connectTimeout = connectTimeout
+        self.__token = token if token is not None else os.environ.get(TOKEN_VARIABLE)
+        self.__connection = None
+        self.__sendLock = threading.Lock()
+        self.__streamLock = threading.Lock()
+        self.__condition = threading.Condition()
+        self.__tests = collections.deque()
+        self.__done = False
+        self.__logOffsets = {}
+        self.__sentArtifacts = set()
+
+    def __connect(self):
+        deadline = time.monotonic() + self.connectTimeout
+        while True:
+            try:
+                return socket.create_connection(self.coordinatorAddress, timeout=self.connectTimeout)
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+
+    def __send(self, message):
+        _send(self.__connection, self.__sendLock, message)
+
+    def __receive(self):
+        """
+            Handle the coordinator's messages: new tests, steal requests and the end of the run.
+        """
+        try:
+            for line in self.__connection.makefile("r", encoding="utf-8"):
+                message = json.loads(line)
+                with self.__condition:
+                    if message["type"] == "tests":
+                        self.__tests.extend(message["tests"])
+                    elif message["type"] == "steal":
+                        # The unstarted tests at the end of the local queue go back; the coordinator hands them out again
+                        released = [self.__tests.pop() for _ in range(min(message["count"], len(self.__tests)))][::-1]
+                        self.__send({"type": "released", "tests": released})
+                    elif message["type"] == "done":
+                        self.__done = True
+                    self.__condition.notify_all()
+        except (OSError, ValueError):
+            pass
+        with self.__condition:
+            self.__done = True
+            self.__condition.notify_all()
+
+    def __stream(self):
+        """
+            Send the new lines of the agent's log file and the new failure artifacts to the coordinator. A file that
+            cannot be read (rotated or removed meanwhile) is logged and tried again with the next batch; only a failed
+            send raises.
+        """
+        with self.__streamLock:
+            customLogger.flush()
+            logFileName = customLogger.get_default_file_name()
+            data = b""
+            offset = self.__logOffsets.get(logFileName, 0)
+            try:
+                if os.path.isfile(logFileName):
+                    if os.path.getsize(logFileName) < offset:
+                        # The file was rotated
+                        offset = 0
+                    with open(logFileName, "rb") as file:
+                        file.seek(offset)
+                        data = file.read()
+            except OSError as error:
+                customLogger.logger("WARNING", "The log file %s could not be streamed: %s", logFileName, error,
+                                    event="stream_failed")
+            # Only complete lines are sent; a partly written line is sent with the next batch
+            data = data[:data.rfind(b"\n") + 1]
+            if data:
+                self.__send({"type": "log", "file": os.path.basename(logFileName), "data": data.decode("utf-8")})
+                self.__logOffsets[logFileName] = offset + len(data)
+            failureArtifacts.flush()
+            if not failureArtifacts.get_stats()["writtenBytes"]:
+                return
+            artifactsDirectory = failureArtifacts.get_run_directory()
+            try:
+                fileNames = sorted(os.listdir(artifactsDirectory))
+            except OSError as error:
+                customLogger.logger("WARNING", "The artifacts in %s could not be listed: %s", artifactsDirectory, error,
+                                    event="stream_failed")
+                return
+            for fileName in fileNames:
+                if fileName in self.__sentArtifacts:
+                    continue
+                try:
+                    with open(os.path.join(artifactsDirectory, fileName), "rb") as file:
+                        data = base64.b64encode(file.read()).decode("ascii")
+                except OSError as error:
+                    customLogger.logger("WARNING", "The artifact %s could not be streamed: %s", fileName, error,
+                                        event="stream_failed")
+                    continue
+                self.__send({"type": "artifact", "path": fileName, "data": data})
+                self.__sentArtifacts.add(fileName)
+
+    def __send_heartbeats(self):
+        while not self.__done:
+            time.sleep(HEARTBEAT_SECONDS)
+            try:
+                self.__send({"type": "heartbeat"})
+                self.__stream()
+            except OSError:
+                return
+
+    def __run_test(self, testId):
+        result = RecordingResult()
+        try:
+            unittest.TestLoader().loadTestsFromName(testId).run(result)
+        except Exception:
+            result.records.append({"id": testId, "status": "error", "duration": 0.0, "traceback": traceback.format_exc()})
+        return result.records
+
+    def run(self):
+        """
+            Connect to the coordinator and run tests until it reports the run is over or the connection is lost.
+
+            Returns:
+                int: The number of tests this agent ran.
+        """
+        os.environ["WORKER_ID"] = self.agentId
+        os.environ.setdefault("DRIVER_POOL_SIZE", "1")
+        self.__connection = self.__connect()
+        self.__connection.settimeout(None)
+        self.__send({"type": "hello", "agentId": self.agentId, "host": socket.gethostname(), "pid": os.getpid(),
+                     "token": self.__token})
+        threading.Thread(target=self.__receive, name="agent-receive", daemon=True).start()
+        threading.Thread(target=self.__send_heartbeats, name="agent-heartbeat", daemon=True).start()
+
+        testCount = 0
+        try:
+            while True:
+                with self.__condition:
+                    if not self.__tests and not self.__done:
+                        self.__send({"type": "idle"})
+                        self.__condition.wait_for(lambda: self.__tests or self.__done)
+                    if not self.__tests:
+                        break
+                    # Reported before the lock is released, so the coordinator never asks for this test in a steal
+                    testId = self.__tests[0]
+                    self.__send({"type": "started", "test": testId})
+                    self.__tests.popleft()
+                records = self.__run_test(testId)
+                testCount += 1
+                self.__stream()
+                self.__send({"type": "finished", "test": testId, "results": records})
+            self.__stream()
+            self.__send({"type": "bye"})
+        except OSError:
+            customLogger.logger("WARNING", "The agent %s lost the coordinator", self.agentId, event="coordinator_lost")
+        finally:
+            self.__done = True
+            self.__connection.close()
+        return testCount
+
+
+def run_distributed(testIds, host=DEFAULT_HOST, port=DEFAULT_PORT, reportsDirectory=None, heartbeatTimeout=HEARTBEAT_TIMEOUT_SECONDS):
+    """
+        Coordinate a distributed run of the tests and write its report, like parallelRunner.run_in_parallel.
+        Start agents on any hosts with: python -m common_.utilities_.distributedRunner agent --coordinator HOST:PORT
+    """
+    reportsDirectory = reportsDirectory or projectPaths.get_project_directory("reports_")
+    durationsFile = os.path.join(reportsDirectory, "testDurations.json")
+    runDirectory = os.path.join(reportsDirectory, f'distributed_{datetime.now().strftime("%d_%m_%Y_%H-%M-%S")}')
+    os.makedirs(runDirectory, exist_ok=True)
+    # Tests sharing a precondition prefix are handed out together, so an agent continues from the state it reached
+    loader = unittest.TestLoader()
+    testIds = preconditionGraph.order_tests(testIds, lambda testId: next(iter(loader.loadTestsFromName(testId)), None))
+
+    startTime = time.perf_counter()
+    coordinator = Coordinator(testIds, host, port, runDirectory, heartbeatTimeout).start()
+    print(f"Waiting for agents on {coordinator.address[0]}:{coordinator.address[1]}", flush=True)
+    try:
+        coordinator.wait()
+    finally:
+        coordinator.stop()
+    report = coordinator.get_report()
+    results = report["results"]
+    parallelRunner.save_durations(durationsFile, parallelRunner.load_durations(durationsFile), results)
+    for result in results:
+        if result["traceback"]:
+            with open(os.path.join(runDirectory, get_traceback_file_name(result["id"])), "w", encoding="utf-8") as file:
+                file.write(result["traceback"])
+
+    wallTime = time.perf_counter() - startTime
+    serialTime = sum(result["duration"] for result in results)
+    report.update({
+        "wallTime": round(wallTime, 3),
+        "serialTime": round(serialTime, 3),
+        "speedup": round(serialTime / wallTime, 2) if wallTime else 0.0,
+        "summary": {status: sum(1 for result in results if result["status"] == status)
+                    for status in ("passed", "failed", "error", "skipped")},
+    })
+    with open(os.path.join(runDirectory, "report.json"), "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    report["reportFile"] = os.path.join(runDirectory, "report.json")
+    return report
+
+
+def main(argv=None):
+    """
+        Command line entry point:
+            python -m common_.utilities_.distributedRunner coordinator [--host 0.0.0.0] [--port 7777]
+            python -m common_.utilities_.distributedRunner agent --coordinator HOST:7777
+        Both read the shared token from DISTRIBUTED_TOKEN, which a coordinator on another interface than loopback needs.
+    """
+    parser = argparse.ArgumentParser(description="Run the test suite on worker agents across several hosts.")
+    subparsers = parser.add_subparsers(dest="role", required=True)
+    coordinatorParser = subparsers.add_parser("coordinator", help="Hand out the tests and collect the results.")
+    coordinatorParser.add_argument("--host", default=DEFAULT_HOST,
+                                   help=f"The interface to listen on (this machine only by default; any other one "
+                                        f"requires {TOKEN_VARIABLE}).")
+    coordinatorParser.add_argument("--port", type=int, default=DEFAULT_PORT, help="The port to listen on.")
+    coordinatorParser.add_argument("--start-directory", default="tests_", help="The directory to discover tests in.")
+    coordinatorParser.add_argument("--pattern", default="*Test.py", help="The file name pattern of test modules.")
+    coordinatorParser.add_argument("--heartbeat-timeout", type=float, default=HEARTBEAT_TIMEOUT_SECONDS,
+                                   help="The seconds without a heartbeat after which an agent's tests are requeued.")
+    agentParser = subparsers.add_parser("agent", help="Run the tests a coordinator hands out.")
+    agentParser.add_argument("--coordinator", required=True, help="The HOST:PORT of the coordinator.")
+    agentParser.add_argument("--agent-id", help="The unique name of the agent (host name and pid by default).")
+    args = parser.parse_args(argv)
+
+    if args.role == "agent":
+        host, _, port = args.coordinator.rpartition(":")
+        testCount = WorkerAgent((host, int(port)), args.agent_id).run()
+        print(f"The agent ran {testCount} tests.")
+        return 0
+
+    testIds = parallelRunner.discover_test_ids(args.start_directory, args.pattern)
+    if not testIds:
+        print("No tests were found.")
+        return 0
+    report = run_distributed(testIds, args.host, args.port, heartbeatTimeout=args.heartbeat_timeout)
+    summary = report["summary"]
+    print(f'Ran {len(report["results"])} tests on {len(report["agents"])} agents in {report["wallTime"]}s '
+          f'(serial time {report["serialTime"]}s, speedup x{report["speedup"]}): {summary}')
+    print(f'Steals: {report["steals"]} ({report["stolenTests"]} tests), lost agents: {report["lostAgents"]} '
+          f'({report["requeuedTests"]} tests requeued)')
+    print(f'Report: {report["reportFile"]}')
+    return 0 if summary["failed"] == 0 and summary["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
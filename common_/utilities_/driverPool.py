@@ -0,0 +1,291 @@
+import atexit
+import os
+import threading
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from common_.utilities_ import customLogger, launchProfiles, profileTemplate, replayProxy
+
+
+def launch_chrome(profileName=None, useProfileTemplate=None, templateName=profileTemplate.TEMPLATE_NAME):
+    """
+        Launch a new Chrome session the same way BaseTest used to do it for every test, with the given launch profile
+        (page load strategy and blocked requests, see launchProfiles).
+        The browser is routed through the record/replay proxy when REPLAY_PROXY_MODE is set.
+        With the profile template (CHROME_PROFILE_TEMPLATE=1 by default) the session starts from a clone of a primed
+        user data directory with a fixed window size instead of an empty profile and a maximize round trip.
+    """
+    profile = launchProfiles.get_profile(profileName)
+    useProfileTemplate = profileTemplate.is_enabled() if useProfileTemplate is None else useProfileTemplate
+    options = webdriver.ChromeOptions()
+    profile.apply_to_options(options)
+    # The browser console is saved with the failure artifacts
+    options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+    proxyArguments = replayProxy.get_chrome_arguments()
+    for argument in proxyArguments:
+        options.add_argument(argument)
+    cloneDirectory = None
+    if useProfileTemplate:
+        cloneDirectory = profileTemplate.clone_template(profileTemplate.build_template(extraArguments=proxyArguments,
+                                                                                    name=templateName))
+        for argument in profileTemplate.get_chrome_arguments() + [f"--user-data-dir={cloneDirectory}"]:
+            options.add_argument(argument)
+    elif profileTemplate.is_headless():
+        options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    driver.profileDirectory = cloneDirectory
+    profile.apply_to_driver(driver)
+    if not useProfileTemplate:
+        driver.maximize_window()
+    return driver
+
+
+class DriverPool:
+    def __init__(self, driverFactory=launch_chrome, maxIdle=1, resetUrl="about:blank"):
+        """
+            Initialize a pool of warm WebDriver sessions that are reused across tests.
+
+            Args:
+                driverFactory (callable): Creates and returns a new raw WebDriver session.
+                maxIdle (int): The maximum number of released sessions kept alive for the next lease.
+                resetUrl (str): The URL every session is navigated to when it is returned to the pool.
+
+            Attributes:
+                leases (int): The number of sessions handed out by the pool.
+                hits (int): The number of leases served by an already running session.
+                launches (int): The number of sessions started by the driver factory.
+                replacements (int): The number of broken sessions discarded by the health check or the reset.
+                recycles (int): The number of healthy sessions quit for their resource usage (see resourceMonitor).
+                launchSeconds (float): The total time spent in the driver factory.
+                resetSeconds (float): The total time spent resetting sessions between leases.
+        """
+        self.driverFactory = driverFactory
+        self.maxIdle = maxIdle
+        self.resetUrl = resetUrl
+
+        self.leases = 0
+        self.hits = 0
+        self.launches = 0
+        self.replacements = 0
+        self.recycles = 0
+        self.launchSeconds = 0.0
+        self.resetSeconds = 0.0
+
+        self.__idleDrivers = []
+        self.__leasedDrivers = set()
+        self.__dirtyDrivers = set()
+        self.__lock = threading.Lock()
+
+    def acquire(self, keepState=False):
+        """
+            Lease a healthy WebDriver session, reusing an idle one when possible and launching a new one otherwise.
+            A session released with keepState is reset now, unless this lease keeps the state as well.
+        """
+        while True:
+            with self.__lock:
+                driver = self.__idleDrivers.pop() if self.__idleDrivers else None
+                isDirty = driver in self.__dirtyDrivers
+                self.__dirtyDrivers.discard(driver)
+            if driver is None:
+                driver = self.__launch()
+                break
+            if not self.__is_healthy(driver):
+                self.__discard(driver)
+                continue
+            if isDirty and not keepState and not self.__try_reset(driver):
+                continue
+            with self.__lock:
+                self.hits += 1
+            break
+
+        with self.__lock:
+            self.leases += 1
+            self.__leasedDrivers.add(driver)
+        return driver
+
+    def release(self, driver, keepState=False):
+        """
+            Return a leased session to the pool after a fast reset, or quit it if the reset fails or the pool is full.
+            With keepState the reset is skipped, so the next lease that keeps the state too can continue from it
+            (see preconditionGraph); any other lease resets the session first.
+        """
+        with self.__lock:
+            self.__leasedDrivers.discard(driver)
+
+        if not keepState and not self.__try_reset(driver):
+            return
+
+        with self.__lock:
+            if len(self.__idleDrivers) < self.maxIdle:
+                self.__idleDrivers.append(driver)
+                if keepState:
+                    self.__dirtyDrivers.add(driver)
+                return
+        self.__quit(driver)
+
+    def discard(self, driver):
+        """
+            Quit a leased session instead of returning it to the pool, e.g. when a test left it in an unknown state.
+        """
+        with self.__lock:
+            self.__leasedDrivers.discard(driver)
+        self.__discard(driver)
+
+    def recycle(self, driver):
+        """
+            Quit a leased session that still works but has grown too big, so the next lease starts a fresh browser.
+        """
+        with self.__lock:
+            self.__leasedDrivers.discard(driver)
+            self.recycles += 1
+        self.__quit(driver)
+
+    def shutdown(self):
+        """
+            Quit every session owned by the pool and log the pool statistics.
+        """
+        with self.__lock:
+            drivers = self.__idleDrivers + list(self.__leasedDrivers)
+            self.__idleDrivers = []
+            self.__leasedDrivers = set()
+            self.__dirtyDrivers = set()
+        for driver in drivers:
+            self.__quit(driver)
+        if self.leases:
+            customLogger.logger("INFO", f"Driver pool statistics: {self.get_stats()}")
+
+    def get_stats(self):
+        """
+            Get the hit rate of the pool and the launch time it saved compared to one cold browser per test.
+        """
+        averageLaunchSeconds = self.launchSeconds / self.launches if self.launches else 0.0
+        return {
+            "leases": self.leases,
+            "hits": self.hits,
+            "hitRate": round(self.hits / self.leases, 3) if self.leases else 0.0,
+            "launches": self.launches,
+            "replacements": self.replacements,
+            "recycles": self.recycles,
+            "averageLaunchSeconds": round(averageLaunchSeconds, 3),
+            "averageResetSeconds": round(self.resetSeconds / self.leases, 3) if self.leases else 0.0,
+            "savedSeconds": round(self.hits * averageLaunchSeconds - self.resetSeconds, 3),
+        }
+
+    def __launch(self):
+        """
+            Start a new session with the driver factory and account for the launch time.
+        """
+        startTime = time.perf_counter()
+        driver = self.driverFactory()
+        with self.__lock:
+            self.launches += 1
+            self.launchSeconds += time.perf_counter() - startTime
+        return driver
+
+    def __is_healthy(self, driver):
+        """
+            Check that the session still responds and has an open window.
+        """
+        try:
+            return bool(driver.window_handles)
+        except WebDriverException:
+            return False
+
+    def __try_reset(self, driver):
+        """
+            Reset a session, replacing it if the reset fails. Returns whether the session can be used again.
+        """
+        startTime = time.perf_counter()
+        try:
+            self.__reset(driver)
+            return True
+        except WebDriverException as e:
+            customLogger.logger("WARNING", f"Warning: The session could not be reset and will be replaced: {str(e)}")
+            self.__discard(driver)
+            return False
+        finally:
+            with self.__lock:
+                self.resetSeconds += time.perf_counter() - startTime
+
+    def __reset(self, driver):
+        """
+            Bring a session back to a clean state: one tab, no cookies, the reset URL loaded and, in Chrome, all storage
+            (local and session storage, IndexedDB, cache storage, service workers) of the origins open in its tabs and
+            their frames cleared. Without CDP only the storage of the remaining tab's page can be cleared.
+        """
+        launchProfiles.measure_pending_navigation(driver)
+        useCdp = hasattr(driver, "execute_cdp_cmd")
+        origins = set()
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            if useCdp:
+                origins.update(_get_frame_origins(driver))
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        if useCdp:
+            origins.update(_get_frame_origins(driver))
+            for origin in sorted(origins):
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+            driver.delete_all_cookies()
+        driver.get(self.resetUrl)
+
+    def __discard(self, driver):
+        """
+            Quit a broken session and count it as replaced.
+        """
+        with self.__lock:
+            self.replacements += 1
+        self.__quit(driver)
+
+    def __quit(self, driver):
+        """
+            Quit a session, ignoring errors from sessions that are already gone.
+        """
+        launchProfiles.measure_pending_navigation(driver)
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            customLogger.logger("WARNING", f"Warning: The session could not be quit cleanly: {str(e)}")
+        profileTemplate.remove_clone(driver)
+
+
+def _get_frame_origins(driver):
+    """
+        Get the web origins of the current tab's page and all its frames from the CDP frame tree.
+    """
+    origins = set()
+    frameTrees = [driver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]]
+    while frameTrees:
+        frameTree = frameTrees.pop()
+        origin = frameTree["frame"].get("securityOrigin", "")
+        if origin.startswith(("http://", "https://")):
+            origins.add(origin)
+        frameTrees.extend(frameTree.get("childFrames", []))
+    return origins
+
+
+_sharedPools = {}
+_sharedPoolsLock = threading.Lock()
+
+
+def get_shared_pool(profileName=None):
+    """
+        Get the process-wide driver pool of a launch profile, creating it on first use.
+        The pool size can be set with DRIVER_POOL_SIZE.
+    """
+    profileName = launchProfiles.get_profile(profileName).name
+    with _sharedPoolsLock:
+        pool = _sharedPools.get(profileName)
+        if pool is None:
+            pool = DriverPool(driverFactory=lambda: launch_chrome(profileName),
+                              maxIdle=int(os.environ.get("DRIVER_POOL_SIZE", "1")))
+            _sharedPools[profileName] = pool
+            atexit.register(pool.shutdown)
+        return pool
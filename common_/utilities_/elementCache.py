@@ -0,0 +1,109 @@
+import atexit
+
+from common_.utilities_ import customLogger
+
+_navigationGenerations = {}
+_totals = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def notify_navigation(driver):
+    """
+        Mark every element cached for the driver's session as outdated. Called by CustomListener after each navigation.
+    """
+    sessionId = driver.session_id
+    _navigationGenerations[sessionId] = _navigationGenerations.get(sessionId, 0) + 1
+
+
+def get_navigation_generation(driver):
+    """
+        Get the number of navigations seen for the driver's session.
+    """
+    return _navigationGenerations.get(driver.session_id, 0)
+
+
+def get_totals():
+    """
+        Get the hits, misses and invalidations of all element caches of this process.
+    """
+    return dict(_totals)
+
+
+class ElementCache:
+    def __init__(self, driver):
+        """
+            Initialize an element handle cache for one page object, keyed by locator.
+
+            Args:
+                driver (webdriver.Chrome): The WebDriver instance the cached elements belong to.
+
+            Attributes:
+                hits (int): The number of lookups served from the cache.
+                misses (int): The number of lookups that had to find the element.
+                invalidations (int): The number of cached elements dropped because they were stale or outdated.
+        """
+        self.driver = driver
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.__elements = {}
+
+    def get(self, locator):
+        """
+            Get the cached element for the locator, or None if there is none or the page was navigated since it was found.
+        """
+        entry = self.__elements.get(locator)
+        if entry is None:
+            return None
+        if entry[1] != get_navigation_generation(self.driver):
+            self.invalidate(locator)
+            return None
+        return entry[0]
+
+    def count_hit(self):
+        """
+            Count a lookup that was served by a valid cached element.
+        """
+        self.hits += 1
+        _totals["hits"] += 1
+
+    def count_miss(self):
+        """
+            Count a lookup that had to find the element in the page.
+        """
+        self.misses += 1
+        _totals["misses"] += 1
+
+    def put(self, locator, element):
+        """
+            Cache the element found by the locator for the current page.
+        """
+        self.__elements[locator] = (element, get_navigation_generation(self.driver))
+
+    def invalidate(self, locator):
+        """
+            Drop the cached element of the locator, e.g. after a StaleElementReferenceException.
+        """
+        if self.__elements.pop(locator, None) is not None:
+            self.invalidations += 1
+            _totals["invalidations"] += 1
+
+    def clear(self):
+        """
+            Drop all cached elements.
+        """
+        self.__elements.clear()
+
+    def get_stats(self):
+        """
+            Get the hits, misses and invalidations of this cache.
+        """
+        return {"hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
+
+
+@atexit.register
+def _log_totals():
+    """
+        Log how many element lookups the caches removed when the process exits.
+    """
+    if _totals["hits"] or _totals["misses"]:
+        customLogger.logger("INFO", "Element cache statistics: %s", get_totals(), event="element_cache", **_totals)
@@ -0,0 +1,136 @@
+import atexit
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+
+from selenium.common.exceptions import WebDriverException
+
+from common_.utilities_ import commandTimer, customLogger, projectPaths
+
+ARTIFACTS_DIRECTORY = "artifacts_"
+# The total size of the artifacts one run may write, set with ARTIFACTS_MAX_BYTES
+MAX_RUN_BYTES = int(os.environ.get("ARTIFACTS_MAX_BYTES", str(200 * 1024 * 1024)))
+# One failure often raises several exceptions (the failed command, then the page object's exit); only the first is captured
+MIN_CAPTURE_INTERVAL_SECONDS = 1.0
+
+_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="failure-artifacts")
+_lock = threading.Lock()
+_lastCaptureTimes = {}
+_writtenBytes = 0
+_pendingWrites = set()
+_skippedCaptures = 0
+_runDirectory = None
+
+
+def get_run_directory():
+    """
+        Get the artifact directory of this run (one per process, so parallel workers do not share a size budget).
+    """
+    global _runDirectory
+    if _runDirectory is None:
+        runName = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_worker-{os.environ.get('WORKER_ID') or os.getpid()}"
+        _runDirectory = os.path.join(projectPaths.get_project_directory("reports_"), ARTIFACTS_DIRECTORY, runName)
+        os.makedirs(_runDirectory, exist_ok=True)
+    return _runDirectory
+
+
+def _read(function, *args):
+    try:
+        return function(*args)
+    except WebDriverException as e:
+        return f"Not available: {e.msg or type(e).__name__}"
+
+
+def capture(driver, reason, **fields):
+    """
+        Grab what is needed to diagnose a failure from the browser right now: a screenshot, the page source, the browser
+        console logs and the current URL. Decoding, compressing and writing them is left to a background thread.
+
+        Args:
+            driver (webdriver.Chrome): The session that failed (an event firing driver is unwrapped).
+            reason (str): What failed, e.g. the exception name.
+            fields: More context to save with the artifacts.
+
+        Returns:
+            str: The base path of the artifacts, or None if nothing was captured.
+    """
+    driver = getattr(driver, "wrapped_driver", driver)
+    sessionId = getattr(driver, "session_id", None)
+    now = time.monotonic()
+    with _lock:
+        lastCaptureTime = _lastCaptureTimes.get(sessionId)
+        if _writtenBytes >= MAX_RUN_BYTES or (lastCaptureTime is not None and now - lastCaptureTime < MIN_CAPTURE_INTERVAL_SECONDS):
+            return None
+        _lastCaptureTimes[sessionId] = now
+
+    step = commandTimer.get_current_step()
+    screenshot = _read(driver.get_screenshot_as_base64)
+    pageSource = _read(lambda: driver.page_source)
+    consoleLogs = _read(driver.get_log, "browser") if hasattr(driver, "get_log") else []
+    metadata = {"time": datetime.now().isoformat(timespec="milliseconds"), "reason": reason, "step": step,
+                "url": _read(lambda: driver.current_url), "session": sessionId, **fields}
+
+    basePath = os.path.join(get_run_directory(), f"{datetime.now().strftime('%H%M%S_%f')}_{reason}")
+    future = _writer.submit(_write, basePath, metadata, screenshot, pageSource, consoleLogs)
+    with _lock:
+        _pendingWrites.add(future)
+    future.add_done_callback(_pendingWrites.discard)
+    customLogger.logger("INFO", "Failure artifacts are written to %s", basePath, event="failure_artifacts", path=basePath,
+                        reason=reason, step=step)
+    return basePath
+
+
+def _write(basePath, metadata, screenshot, pageSource, consoleLogs):
+    """
+        Encode, compress and write the artifacts of one failure, keeping the run under its size budget.
+    """
+    global _writtenBytes, _skippedCaptures
+    files = {}
+    try:
+        files[".png"] = base64.b64decode(screenshot, validate=True)
+    except (ValueError, TypeError):
+        metadata["screenshot"] = screenshot
+    files[".html.gz"] = gzip.compress(str(pageSource).encode("utf-8"), compresslevel=6)
+    files[".json"] = json.dumps({**metadata, "consoleLogs": consoleLogs}, indent=2, default=str).encode("utf-8")
+    size = sum(len(content) for content in files.values())
+    with _lock:
+        if _writtenBytes + size > MAX_RUN_BYTES:
+            _skippedCaptures += 1
+            return
+        _writtenBytes += size
+    for extension, content in files.items():
+        with open(basePath + extension, "wb") as file:
+            file.write(content)
+
+
+def flush():
+    """
+        Block until the artifacts captured so far are written.
+    """
+    with _lock:
+        pendingWrites = list(_pendingWrites)
+    wait(pendingWrites)
+
+
+def get_stats():
+    """
+        Get the number of bytes written and of captures dropped because the run reached its size budget.
+    """
+    with _lock:
+        return {"writtenBytes": _writtenBytes, "skippedCaptures": _skippedCaptures, "maxBytes": MAX_RUN_BYTES}
+
+
+@atexit.register
+def _shutdown():
+    """
+        Wait for the pending writes before the process ends.
+    """
+    _writer.shutdown(wait=True)
+    if _skippedCaptures:
+        customLogger.logger("WARNING", "Warning: %s failure captures were dropped, the run reached ARTIFACTS_MAX_BYTES",
+                            _skippedCaptures, event="failure_artifacts", **get_stats())
@@ -0,0 +1,23 @@
+import contextlib
+
+
+@contextlib.contextmanager
+def locked(path, shared=False):
+    """
+        Hold a lock on the lock file '<path>.lock' while the block runs, so processes that share a file or directory
+        take turns with it.
+
+        Args:
+            path (str): The file or directory the lock guards.
+            shared (bool): Take a shared lock, which only waits for exclusive holders, instead of an exclusive one.
+                Windows has no shared locks in msvcrt, so there every lock is exclusive and shared holders take turns.
+    """
+    with open(f"{path}.lock", "a+") as lockFile:
+        try:
+            import fcntl
+            fcntl.flock(lockFile, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        except ImportError:
+            import msvcrt
+            lockFile.seek(0)
+            msvcrt.locking(lockFile.fileno(), msvcrt.LK_LOCK, 1)
+        yield
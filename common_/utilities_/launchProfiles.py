@@ -0,0 +1,205 @@
+import atexit
+import json
+import os
+
+from selenium.common.exceptions import WebDriverException
+
+from common_.utilities_ import customLogger, projectPaths
+
+# URL patterns (Network.setBlockedURLs wildcards) for the resource types a profile can block
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ts"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+}
+
+# Third-party and ad/tracking endpoints loaded by the Amazon home page that the nav bar and GLUX tests never touch
+THIRD_PARTY_PATTERNS = [
+    "*amazon-adsystem.com*", "*doubleclick.net*", "*googlesyndication.com*", "*/uedata*", "*fls-na.amazon.com*",
+    "*unagi.amazon.com*", "*aax-us-east*", "*/adv/*", "*/ads/*", "*/rd/uedata*",
+]
+
+# The profile that navigation savings are measured against
+REFERENCE_PROFILE = "default"
+NAVIGATION_COSTS_FILE = "navigationCosts.json"
+
+# Transferred bytes of the document and all its resources, or null while the document is still loading (an 'eager' or
+# 'none' navigation returns before the load event, and the resources loading then would not be counted) or if it is not
+# the document of the navigation (arguments[0] is its time origin, the page may have been left through a link)
+TRANSFER_SIZE_JS = """
+var navigation = performance.getEntriesByType('navigation')[0];
+if (!navigation || !navigation.loadEventEnd || performance.timeOrigin !== arguments[0]) { return null; }
+return [navigation].concat(performance.getEntriesByType('resource'))
+    .reduce(function (total, entry) { return total + (entry.transferSize || 0); }, 0);
+"""
+
+
+class LaunchProfile:
+    def __init__(self, name, pageLoadStrategy="normal", blockedResourceTypes=(), blockedUrlPatterns=(), chromeArguments=()):
+        """
+            Initialize a named browser launch profile.
+
+            Args:
+                name (str): The name test classes select the profile by.
+                pageLoadStrategy (str): 'normal' waits for every resource, 'eager' returns at DOMContentLoaded and 'none'
+                    returns as soon as the navigation is committed.
+                blockedResourceTypes (iterable): Resource types ('image', 'media', 'font') the browser does not load.
+                blockedUrlPatterns (iterable): URL wildcard patterns the browser does not load.
+                chromeArguments (iterable): Extra Chrome command line arguments.
+        """
+        self.name = name
+        self.pageLoadStrategy = pageLoadStrategy
+        self.blockedResourceTypes = tuple(blockedResourceTypes)
+        self.blockedUrlPatterns = tuple(blockedUrlPatterns)
+        self.chromeArguments = tuple(chromeArguments)
+
+    def get_blocked_patterns(self):
+        """
+            Get all blocked URL patterns, including the ones of the blocked resource types.
+        """
+        patterns = list(self.blockedUrlPatterns)
+        for resourceType in self.blockedResourceTypes:
+            patterns.extend(RESOURCE_TYPE_PATTERNS[resourceType])
+        return patterns
+
+    def apply_to_options(self, options):
+        """
+            Set the page load strategy and the launch arguments on ChromeOptions.
+            Images are also disabled through the content settings, which catches images without a file extension.
+        """
+        options.page_load_strategy = self.pageLoadStrategy
+        for argument in self.chromeArguments:
+            options.add_argument(argument)
+        if "image" in self.blockedResourceTypes:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+    def apply_to_driver(self, driver):
+        """
+            Block the profile's URL patterns through the DevTools protocol. The blocking lasts for the whole session.
+        """
+        driver.launchProfileName = self.name
+        patterns = self.get_blocked_patterns()
+        if patterns:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+LAUNCH_PROFILES = {
+    "default": LaunchProfile("default"),
+    "eager": LaunchProfile("eager", pageLoadStrategy="eager"),
+    "lean": LaunchProfile("lean", pageLoadStrategy="eager", blockedResourceTypes=("image", "media", "font"),
+                          blockedUrlPatterns=THIRD_PARTY_PATTERNS),
+    "minimal": LaunchProfile("minimal", pageLoadStrategy="none", blockedResourceTypes=("image", "media", "font"),
+                             blockedUrlPatterns=THIRD_PARTY_PATTERNS),
+}
+
+
+def get_profile(name=None):
+    """
+        Get a launch profile by name. LAUNCH_PROFILE overrides the name for the whole run, e.g. to measure the reference.
+    """
+    return LAUNCH_PROFILES[os.environ.get("LAUNCH_PROFILE") or name or REFERENCE_PROFILE]
+
+
+_navigationCosts = {}
+_pendingNavigations = {}
+
+
+def _get_costs(key):
+    return _navigationCosts.setdefault(key, {"count": 0, "totalMs": 0.0, "byteCount": 0, "totalBytes": 0})
+
+
+def record_navigation(driver, url, durationMs):
+    """
+        Record the time the navigation blocked the test under the driver's launch profile. Its transferred bytes are
+        counted by measure_pending_navigation once the page has loaded, so that profiles with different page load
+        strategies are compared on complete pages.
+    """
+    key = (getattr(driver, "launchProfileName", REFERENCE_PROFILE), url)
+    costs = _get_costs(key)
+    costs["count"] += 1
+    costs["totalMs"] += durationMs or 0.0
+    try:
+        _pendingNavigations[driver.session_id] = (key, driver.execute_script("return performance.timeOrigin;"))
+    except WebDriverException:
+        pass
+
+
+def measure_pending_navigation(driver):
+    """
+        Count the transferred bytes of the last recorded navigation of the session, before the page is left (the next
+        navigation, a reload or the end of the session). A page that has not fired its load event, or was already left, is
+        not counted.
+    """
+    driver = getattr(driver, "wrapped_driver", driver)
+    key, timeOrigin = _pendingNavigations.pop(driver.session_id, (None, None))
+    if key is None:
+        return
+    try:
+        transferBytes = driver.execute_script(TRANSFER_SIZE_JS, timeOrigin)
+    except WebDriverException:
+        return
+    if transferBytes is not None:
+        costs = _get_costs(key)
+        costs["byteCount"] += 1
+        costs["totalBytes"] += transferBytes
+
+
+def _load_costs(fileName):
+    try:
+        with open(fileName, encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def get_savings(costs):
+    """
+        Get the average milliseconds and bytes every profile saves per navigation compared to the reference profile,
+        for the URLs both were measured on. The bytes are averaged over the navigations measured after the load event
+        (None if either profile has none).
+    """
+    reference = costs.get(REFERENCE_PROFILE, {})
+    savings = {}
+    for profileName, urls in costs.items():
+        if profileName == REFERENCE_PROFILE:
+            continue
+        for url, stats in urls.items():
+            referenceStats = reference.get(url)
+            if not referenceStats or not stats["count"]:
+                continue
+            savedBytes = None
+            if referenceStats.get("byteCount") and stats.get("byteCount"):
+                savedBytes = int(referenceStats["totalBytes"] / referenceStats["byteCount"] - stats["totalBytes"] / stats["byteCount"])
+            savings.setdefault(profileName, {})[url] = {
+                "savedMsPerNavigation": round(referenceStats["totalMs"] / referenceStats["count"] - stats["totalMs"] / stats["count"], 1),
+                "savedBytesPerNavigation": savedBytes,
+            }
+    return savings
+
+
+@atexit.register
+def _save_navigation_costs():
+    """
+        Add this run's navigation costs to the history in reports_/ and log the savings of every profile.
+    """
+    if not _navigationCosts:
+        return
+    fileName = os.path.join(projectPaths.get_project_directory("reports_"), NAVIGATION_COSTS_FILE)
+    costs = _load_costs(fileName)
+    for (profileName, url), stats in _navigationCosts.items():
+        saved = costs.setdefault(profileName, {}).setdefault(url, {})
+        for field, value in stats.items():
+            saved[field] = saved.get(field, 0) + value
+    temporaryFileName = f"{fileName}.{os.getpid()}.tmp"
+    with open(temporaryFileName, "w", encoding="utf-8") as file:
+        json.dump(costs, file, indent=2)
+    os.replace(temporaryFileName, fileName)
+
+    for profileName, urls in get_savings(costs).items():
+        for url, saving in urls.items():
+            customLogger.logger("INFO", "The %s launch profile saves %s ms and %s bytes (measured after the load event) "
+                                "per navigation to %s",
+                                profileName, saving["savedMsPerNavigation"], saving["savedBytesPerNavigation"], url,
+                                event="launch_profile_savings", profile=profileName, url=url, **saving)
+    _navigationCosts.clear()
@@ -0,0 +1,71 @@
+import re
+
+# The locators page objects declare as class attributes, by page class and by name without the 'Locator' suffix
+_pageLocators = {}
+
+# XPath patterns that break when the page changes a little: a position in a list, or an exact class attribute match
+POSITIONAL_XPATH_PATTERN = re.compile(r"\[\s*\d+\s*\]")
+EXACT_CLASS_XPATH_PATTERN = re.compile(r"@class\s*=")
+
+
+def _get_short_name(attributeName):
+    """
+        Get the name of a locator attribute without the name mangling prefix and the 'Locator' suffix,
+        e.g. '_NavigationBar__searchFieldLocator' -> 'searchField'.
+    """
+    return attributeName.rsplit("__", 1)[-1][:-len("Locator")]
+
+
+def _is_locator(name, value):
+    return name.endswith("Locator") and isinstance(value, tuple) and len(value) == 2
+
+
+def register_page_locators(pageClass):
+    """
+        Register the locators a page class declares as class attributes (every '...Locator' (By, value) tuple).
+        Name-mangled private locators (e.g. NavigationBar.__searchFieldLocator) are included.
+    """
+    _pageLocators[pageClass.__name__] = {_get_short_name(name): value for name, value in vars(pageClass).items()
+                                         if _is_locator(name, value)}
+    return pageClass
+
+
+def get_page_locators(pageClass):
+    """
+        Get the locators of a page class, including the ones of its page base classes, by name.
+    """
+    locators = {}
+    for baseClass in reversed(pageClass.__mro__):
+        locators.update(_pageLocators.get(baseClass.__name__, {}))
+    return locators
+
+
+def get_all_locators():
+    """
+        Get every registered locator, keyed 'PageClass.name'.
+    """
+    return {f"{className}.{name}": locator for className, locators in _pageLocators.items()
+            for name, locator in locators.items()}
+
+
+def get_fragility_flags(locator):
+    """
+        Get the reasons a locator is likely to break without the element changing, from its text alone.
+    """
+    by, value = locator
+    flags = []
+    if by == "xpath" and POSITIONAL_XPATH_PATTERN.search(value):
+        flags.append("positional")
+    if by == "xpath" and EXACT_CLASS_XPATH_PATTERN.search(value):
+        flags.append("exact_class")
+    return flags
+
+
+def find_duplicates():
+    """
+        Get the locators that are declared under more than one name, as {(By, value): ['PageClass.name', ...]}.
+    """
+    names = {}
+    for name, locator in get_all_locators().items():
+        names.setdefault(tuple(locator), []).append(name)
+    return {locator: sharedNames for locator, sharedNames in names.items() if len(sharedNames) > 1}
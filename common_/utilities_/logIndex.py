@@ -0,0 +1,313 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from common_.utilities_ import projectPaths
+
+INDEX_FILE = "logIndex.sqlite"
+LOG_FILE_PATTERN = "*.jsonl*"
+# Rows written per transaction while indexing
+BATCH_SIZE = 5000
+# Stored as the index's user_version; an index written with another schema is rebuilt from the log files
+SCHEMA_VERSION = 2
+
+# The text fields are stored once in the names table and referenced by id, which keeps the index a fraction of the logs
+TEXT_COLUMNS = ("level", "worker", "event", "browser", "browserVersion", "locator", "exception")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    UNIQUE (device, inode)
+);
+CREATE TABLE IF NOT EXISTS names (
+    id INTEGER PRIMARY KEY,
+    text TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    fileId INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    time INTEGER,
+    level INTEGER,
+    worker INTEGER,
+    event INTEGER,
+    browser INTEGER,
+    browserVersion INTEGER,
+    locator INTEGER,
+    exception INTEGER,
+    durationMs REAL
+);
+CREATE INDEX IF NOT EXISTS entriesByTime ON entries (time);
+CREATE INDEX IF NOT EXISTS entriesByEvent ON entries (event, browser, browserVersion);
+CREATE INDEX IF NOT EXISTS entriesByLocator ON entries (locator, durationMs) WHERE locator IS NOT NULL;
+CREATE INDEX IF NOT EXISTS entriesByException ON entries (exception) WHERE exception IS NOT NULL;
+CREATE INDEX IF NOT EXISTS entriesByLevel ON entries (level);
+"""
+
+
+def get_index_file(logsDirectory):
+    return os.path.join(logsDirectory, INDEX_FILE)
+
+
+def connect(logsDirectory):
+    """
+        Open the index of a logs directory, creating it on first use.
+    """
+    connection = sqlite3.connect(get_index_file(logsDirectory))
+    if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        connection.executescript("DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS names; DROP TABLE IF EXISTS files;")
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    connection.executescript(SCHEMA)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class _NameIds:
+    def __init__(self, connection):
+        """
+            Initialize the mapping of the indexed text values to their ids in the names table.
+        """
+        self.connection = connection
+        self.ids = dict(connection.execute("SELECT text, id FROM names"))
+
+    def get(self, text):
+        if text is None:
+            return None
+        text = str(text)
+        nameId = self.ids.get(text)
+        if nameId is None:
+            nameId = self.ids[text] = self.connection.execute("INSERT INTO names (text) VALUES (?)", (text,)).lastrowid
+        return nameId
+
+
+def _to_milliseconds(isoTime):
+    """
+        Convert a local ISO time (or a prefix of one, e.g. '2023-10-01T12') to milliseconds, the indexed time format.
+    """
+    if not isoTime:
+        return None
+    try:
+        return int(datetime.fromisoformat(isoTime).timestamp() * 1000)
+    except ValueError:
+        return None
+
+
+def _to_row(nameIds, fileId, offset, entry):
+    """
+        Get the indexed columns of one log line. The message itself stays in the log file and is read back by offset.
+    """
+    locator = f'{entry["by"]}={entry["value"]}' if "by" in entry and "value" in entry else None
+    durationMs = entry.get("durationMs")
+    return (fileId, offset, _to_milliseconds(entry.get("time")), nameIds.get(entry.get("level")), nameIds.get(entry.get("worker")),
+            nameIds.get(entry.get("event")), nameIds.get(entry.get("browser")), nameIds.get(entry.get("browserVersion")),
+            nameIds.get(locator), nameIds.get(entry.get("exception")),
+            durationMs if isinstance(durationMs, (int, float)) else None)
+
+
+def _index_file(connection, nameIds, path, fileId, offset):
+    """
+        Index the complete lines of a log file from the byte offset it was indexed up to, streaming it line by line.
+        Returns the new offset and the number of indexed lines.
+    """
+    rows = []
+    count = 0
+    with open(path, "rb") as file:
+        file.seek(offset)
+        for line in file:
+            if not line.endswith(b"\n"):
+                # A line still being written is indexed by the next run
+                break
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                entry = None
+            if isinstance(entry, dict):
+                rows.append(_to_row(nameIds, fileId, offset, entry))
+            offset += len(line)
+            if len(rows) >= BATCH_SIZE:
+                connection.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                count += len(rows)
+                rows = []
+    connection.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return offset, count + len(rows)
+
+
+def update_index(logsDirectory):
+    """
+        Bring the index up to date with the log files: new lines of known files are appended and new files are indexed
+        from the start. Files are known by their device and inode, so a file renamed by the rotation keeps its lines
+        and only gets its new path; a truncated file is indexed again.
+
+        Returns:
+            int: The number of lines indexed.
+    """
+    connection = connect(logsDirectory)
+    known = {(device, inode): (fileId, path, offset)
+             for fileId, path, device, inode, offset in connection.execute("SELECT id, path, device, inode, offset FROM files")}
+    nameIds = _NameIds(connection)
+    total = 0
+    with connection:
+        for path in sorted(str(path) for path in Path(logsDirectory).glob(LOG_FILE_PATTERN)):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # Removed by the rotation since the directory was listed
+                continue
+            fileId, knownPath, offset = known.pop((stat.st_dev, stat.st_ino), (None, None, 0))
+            if fileId is None:
+                fileId = connection.execute("INSERT INTO files (path, device, inode, offset) VALUES (?, ?, ?, 0)",
+                                            (path, stat.st_dev, stat.st_ino)).lastrowid
+            elif knownPath != path:
+                connection.execute("UPDATE files SET path = ? WHERE id = ?", (path, fileId))
+            if stat.st_size < offset:
+                connection.execute("DELETE FROM entries WHERE fileId = ?", (fileId,))
+                offset = 0
+            if stat.st_size == offset:
+                continue
+            offset, count = _index_file(connection, nameIds, path, fileId, offset)
+            connection.execute("UPDATE files SET offset = ? WHERE id = ?", (offset, fileId))
+            total += count
+        # Log files that were deleted
+        for fileId, _, _ in known.values():
+            connection.execute("DELETE FROM entries WHERE fileId = ?", (fileId,))
+            connection.execute("DELETE FROM files WHERE id = ?", (fileId,))
+    connection.close()
+    return total
+
+
+def query(logsDirectory, event=None, level=None, browser=None, browserVersion=None, locator=None, exception=None,
+          since=None, until=None, slowest=False, limit=50):
+    """
+        Find log lines by the indexed fields. The matching lines are read back from the log files by offset.
+
+        Args:
+            browserVersion (str): A version prefix, e.g. '117' for every Chrome 117 build.
+            since, until (str): ISO times (or their prefixes) limiting the line times.
+            slowest (bool): Order by duration, the slowest first, instead of by time.
+
+        Returns:
+            list: The log entries (dicts) with their file.
+    """
+    connection = connect(logsDirectory)
+    conditions, parameters = [], []
+
+    def add_name_condition(column, values):
+        ids = [nameId for (nameId,) in connection.execute(
+            f'SELECT id FROM names WHERE text IN ({", ".join("?" * len(values))})', values)]
+        conditions.append(f'{column} IN ({", ".join(str(nameId) for nameId in ids) or "NULL"})')
+
+    for column, value in (("event", event), ("level", level), ("browser", browser), ("locator", locator),
+                          ("exception", exception)):
+        if value is not None:
+            add_name_condition(column, [value])
+    if browserVersion is not None:
+        # The version prefix is matched against the few distinct values in the names table, not against every line
+        versions = [text for (text,) in connection.execute("SELECT text FROM names WHERE text LIKE ?", (f"{browserVersion}%",))]
+        add_name_condition("browserVersion", versions)
+    if since is not None:
+        conditions.append("time >= ?")
+        parameters.append(_to_milliseconds(since))
+    if until is not None:
+        conditions.append("time < ?")
+        parameters.append(_to_milliseconds(until))
+    if slowest:
+        conditions.append("durationMs IS NOT NULL")
+    where = f'WHERE {" AND ".join(conditions)}' if conditions else ""
+    order = "durationMs DESC" if slowest else "time"
+    rows = connection.execute(f"SELECT files.path, entries.offset FROM entries JOIN files ON files.id = entries.fileId "
+                              f"{where} ORDER BY {order} LIMIT ?", parameters + [limit]).fetchall()
+    connection.close()
+
+    entries = []
+    openFiles = {}
+    try:
+        for path, offset in rows:
+            if path not in openFiles:
+                openFiles[path] = open(path, "rb")
+            openFiles[path].seek(offset)
+            entries.append({**json.loads(openFiles[path].readline()), "file": os.path.basename(path)})
+    finally:
+        for file in openFiles.values():
+            file.close()
+    return entries
+
+
+def count_by(logsDirectory, columns=("event", "level")):
+    """
+        Count the indexed lines grouped by the given columns.
+    """
+    connection = connect(logsDirectory)
+    names = dict((nameId, text) for nameId, text in connection.execute("SELECT id, text FROM names"))
+    columnNames = ", ".join(columns)
+    rows = connection.execute(f"SELECT {columnNames}, COUNT(*) FROM entries GROUP BY {columnNames} "
+                              f"ORDER BY COUNT(*) DESC").fetchall()
+    connection.close()
+    return [tuple(names.get(value) for value in row[:-1]) + (row[-1],) for row in rows]
+
+
+def main(argv=None):
+    """
+        Command line entry point:
+            python -m common_.utilities_.logIndex slowest-finds "id=glow-ingress-line2"
+            python -m common_.utilities_.logIndex exceptions --browser chrome --version 117
+            python -m common_.utilities_.logIndex query --level ERROR --since 2023-10-01
+    """
+    parser = argparse.ArgumentParser(description="Index the JSON lines logs in logs_/ and query them.")
+    parser.add_argument("--logs-directory", default=str(projectPaths.get_root_directory() / "logs_"))
+    parser.add_argument("--limit", type=int, default=20, help="The maximum number of lines to print.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("index", help="Only bring the index up to date.")
+    commands.add_parser("stats", help="Count the lines by event and level.")
+    slowestFinds = commands.add_parser("slowest-finds", help="The slowest finds of a locator across all runs.")
+    slowestFinds.add_argument("locator", help="The locator as 'by=value', e.g. 'id=glow-ingress-line2'.")
+    exceptions = commands.add_parser("exceptions", help="The exceptions, optionally of one browser (version).")
+    exceptions.add_argument("--browser")
+    exceptions.add_argument("--version", help="A browser version prefix, e.g. 117.")
+    search = commands.add_parser("query", help="Lines matching all the given fields.")
+    for option in ("--event", "--level", "--browser", "--version", "--locator", "--exception", "--since", "--until"):
+        search.add_argument(option)
+    search.add_argument("--slowest", action="store_true", help="Order by duration, the slowest first.")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.logs_directory):
+        print(f"There is no logs directory at {args.logs_directory}")
+        return 1
+    startTime = time.perf_counter()
+    indexed = update_index(args.logs_directory)
+    indexSeconds = time.perf_counter() - startTime
+
+    startTime = time.perf_counter()
+    if args.command == "index":
+        print(f"Indexed {indexed} new lines in {indexSeconds:.3f}s")
+        return 0
+    if args.command == "stats":
+        for event, level, count in count_by(args.logs_directory):
+            print(f"{count:>10}  {str(level):<8} {event}")
+        return 0
+    if args.command == "slowest-finds":
+        entries = query(args.logs_directory, event="find", locator=args.locator, slowest=True, limit=args.limit)
+    elif args.command == "exceptions":
+        entries = query(args.logs_directory, event="exception", browser=args.browser, browserVersion=args.version,
+                        limit=args.limit)
+    else:
+        entries = query(args.logs_directory, args.event, args.level, args.browser, args.version, args.locator,
+                        args.exception, args.since, args.until, args.slowest, args.limit)
+    for entry in entries:
+        duration = f'{entry["durationMs"]:>10.3f} ms  ' if isinstance(entry.get("durationMs"), (int, float)) else ""
+        print(f'{entry.get("time")}  {str(entry.get("level")):<8} {duration}{entry.get("message")}  [{entry["file"]}]')
+    print(f"{len(entries)} lines (indexing {indexed} new lines took {indexSeconds:.3f}s, "
+          f"the query {time.perf_counter() - startTime:.3f}s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
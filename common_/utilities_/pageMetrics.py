@@ -0,0 +1,325 @@
+import atexit
+import csv
+import glob
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from common_.utilities_ import customLogger, projectPaths
+
+# The metrics every navigation records, in the column order of the CSV export (durations in ms from the navigation start)
+METRICS = ("redirectMs", "dnsMs", "connectMs", "tlsMs", "ttfbMs", "responseMs", "domInteractiveMs", "domContentLoadedMs",
+           "loadMs", "fpMs", "fcpMs", "lcpMs", "cls", "transferBytes", "resourceCount", "resourceTransferBytes")
+# The metrics compared with the baseline of an earlier run
+REGRESSION_METRICS = ("ttfbMs", "domContentLoadedMs", "loadMs", "fcpMs", "lcpMs")
+# The baseline percentile a navigation is compared with, and the baseline navigations a URL needs to be compared at all
+BASELINE_PERCENTILE = 0.75
+BASELINE_MIN_COUNT = 3
+PERCENTILES = (0.5, 0.75, 0.95)
+SLOWEST_RESOURCES = 5
+
+# Reads the timings of the document in the current window. The largest contentful paint and the layout shifts are only
+# reported to observers; one registered with the buffered flag gets the entries recorded so far from takeRecords.
+# The layout shift score is the CLS definition: the largest sum of shifts without recent input in a session window
+# (shifts less than 1 s apart, at most 5 s long).
+PAGE_METRICS_JS = """
+function getBufferedEntries(type) {
+    try {
+        var observer = new PerformanceObserver(function () {});
+        observer.observe({type: type, buffered: true});
+        var entries = observer.takeRecords();
+        observer.disconnect();
+        return entries;
+    } catch (e) {
+        return [];
+    }
+}
+function round(value) { return value === null || value === undefined ? null : Math.round(value * 10) / 10; }
+
+var navigation = performance.getEntriesByType('navigation')[0];
+if (!navigation) { return null; }
+var result = {
+    url: location.href,
+    timeOrigin: performance.timeOrigin,
+    navigationType: navigation.type,
+    redirectMs: round(navigation.redirectEnd - navigation.redirectStart),
+    dnsMs: round(navigation.domainLookupEnd - navigation.domainLookupStart),
+    connectMs: round(navigation.connectEnd - navigation.connectStart),
+    tlsMs: round(navigation.secureConnectionStart > 0 ? navigation.connectEnd - navigation.secureConnectionStart : 0),
+    ttfbMs: round(navigation.responseStart),
+    responseMs: round(navigation.responseEnd - navigation.responseStart),
+    domInteractiveMs: round(navigation.domInteractive) || null,
+    domContentLoadedMs: round(navigation.domContentLoadedEventEnd) || null,
+    loadMs: round(navigation.loadEventEnd) || null,
+    transferBytes: navigation.transferSize
+};
+performance.getEntriesByType('paint').forEach(function (entry) {
+    result[entry.name === 'first-paint' ? 'fpMs' : 'fcpMs'] = round(entry.startTime);
+});
+var largestPaints = getBufferedEntries('largest-contentful-paint');
+result.lcpMs = largestPaints.length ? round(largestPaints[largestPaints.length - 1].startTime) : null;
+
+var cls = 0, windowValue = 0, windowStart = 0, previousTime = 0;
+getBufferedEntries('layout-shift').forEach(function (entry) {
+    if (entry.hadRecentInput) { return; }
+    if (windowValue && (entry.startTime - previousTime > 1000 || entry.startTime - windowStart > 5000)) {
+        windowValue = 0;
+    }
+    if (!windowValue) { windowStart = entry.startTime; }
+    windowValue += entry.value;
+    previousTime = entry.startTime;
+    cls = Math.max(cls, windowValue);
+});
+result.cls = Math.round(cls * 10000) / 10000;
+
+var resources = performance.getEntriesByType('resource');
+result.resourceCount = resources.length;
+result.resourceTransferBytes = resources.reduce(function (total, entry) { return total + (entry.transferSize || 0); }, 0);
+result.slowestResources = resources.slice().sort(function (a, b) { return b.duration - a.duration; })
+    .slice(0, arguments[0]).map(function (entry) {
+        return {name: entry.name, type: entry.initiatorType, durationMs: round(entry.duration), transferBytes: entry.transferSize};
+    });
+return result;
+"""
+
+_navigations = []
+_testNavigations = {}
+_currentTests = {}
+_lastTimeOrigins = {}
+_baseline = None
+# The last parsed PAGE_LOAD_BUDGETS value and its budgets
+_environmentBudgets = (None, {})
+_lock = threading.Lock()
+
+
+def is_enabled():
+    """
+        Check whether page metrics are collected; PAGE_METRICS=0 turns them off.
+    """
+    return os.environ.get("PAGE_METRICS", "1") != "0"
+
+
+def get_url_key(url):
+    """
+        Get the key navigations are aggregated under: the URL without its query string and fragment.
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}" if parts.scheme else url
+
+
+def start_test(driver, testId):
+    """
+        Attribute the following navigations of the driver's session to a test.
+    """
+    _currentTests[driver.session_id] = testId
+
+
+def record_navigation(driver, kind="navigate"):
+    """
+        Collect the Navigation Timing, Resource Timing, paint, largest contentful paint and layout shift numbers of the
+        page the driver just loaded. A navigation that did not load a new document (e.g. to a fragment, or a page
+        restored from the back/forward cache) is not recorded again.
+
+        Args:
+            driver: The WebDriver session, raw or wrapped in an EventFiringWebDriver (the script is not logged).
+            kind (str): How the page was loaded: 'navigate', 'refresh', 'back' or 'forward'.
+
+        Returns:
+            dict: The navigation, or None if it was not recorded.
+    """
+    if not is_enabled():
+        return None
+    driver = getattr(driver, "wrapped_driver", driver)
+    try:
+        metrics = driver.execute_script(PAGE_METRICS_JS, SLOWEST_RESOURCES)
+    except WebDriverException as e:
+        customLogger.logger("WARNING", "Warning: The page metrics could not be read: %s", e)
+        return None
+    if not metrics or _lastTimeOrigins.get(driver.session_id) == metrics["timeOrigin"]:
+        return None
+    _lastTimeOrigins[driver.session_id] = metrics.pop("timeOrigin")
+    navigation = {"time": round(time.time(), 3), "test": _currentTests.get(driver.session_id), "session": driver.session_id,
+                  "kind": kind, **metrics}
+    with _lock:
+        _navigations.append(navigation)
+        if navigation["test"] is not None:
+            _testNavigations.setdefault(navigation["test"], []).append(navigation)
+    customLogger.logger("INFO", "Page metrics of %s: TTFB %s ms, load %s ms, LCP %s ms, CLS %s", navigation["url"],
+                        navigation["ttfbMs"], navigation["loadMs"], navigation["lcpMs"], navigation["cls"],
+                        event="page_metrics", **{name: navigation.get(name) for name in ("test", "kind", "url") + METRICS})
+    return navigation
+
+
+def get_percentile(sortedValues, fraction):
+    """
+        Get a percentile (0.0 - 1.0) of sorted values by the nearest rank.
+    """
+    return sortedValues[max(math.ceil(fraction * len(sortedValues)) - 1, 0)]
+
+
+def aggregate(navigations, keyName):
+    """
+        Aggregate navigations by a field ('url' or 'test') into the count, percentiles and maximum of every metric.
+
+        Returns:
+            dict: {key: {metric: {'count', 'p50', 'p75', 'p95', 'max'}}}
+    """
+    values = {}
+    for navigation in navigations:
+        key = get_url_key(navigation["url"]) if keyName == "url" else str(navigation[keyName])
+        for metric in METRICS:
+            if navigation.get(metric) is not None:
+                values.setdefault(key, {}).setdefault(metric, []).append(navigation[metric])
+    aggregates = {}
+    for key, metrics in values.items():
+        for metric, metricValues in metrics.items():
+            metricValues.sort()
+            aggregates.setdefault(key, {})[metric] = {
+                "count": len(metricValues),
+                **{f"p{int(fraction * 100)}": get_percentile(metricValues, fraction) for fraction in PERCENTILES},
+                "max": metricValues[-1],
+            }
+    return aggregates
+
+
+def get_report(navigations=None):
+    """
+        Get the navigations of this process (or the given ones) with their aggregates per URL and per test.
+    """
+    if navigations is None:
+        with _lock:
+            navigations = list(_navigations)
+    return {"navigations": navigations, "byUrl": aggregate(navigations, "url"), "byTest": aggregate(navigations, "test")}
+
+
+def write_report(fileName=None, report=None):
+    """
+        Write the page metrics as JSON (navigations and aggregates) next to a CSV file with one row per navigation.
+    """
+    report = report or get_report()
+    if fileName is None:
+        worker = os.environ.get("WORKER_ID", str(os.getpid()))
+        fileName = os.path.join(projectPaths.get_project_directory("reports_"),
+                                f'pageMetrics_{datetime.now().strftime("%d_%m_%Y_%H-%M-%S")}_worker-{worker}.json')
+    with open(fileName, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    columns = ("time", "test", "session", "kind", "navigationType", "url") + METRICS
+    with open(os.path.splitext(fileName)[0] + ".csv", "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(report["navigations"])
+    customLogger.logger("INFO", "Page metrics of %s navigations were written to %s", len(report["navigations"]), fileName,
+                        event="page_metrics_report")
+    return fileName
+
+
+def _check_budget(source, metric, limit):
+    if metric not in METRICS:
+        raise ValueError(f"{source}: '{metric}' is not a page metric, use one of {', '.join(METRICS)}")
+    if isinstance(limit, bool) or not isinstance(limit, (int, float)) or math.isnan(limit):
+        raise ValueError(f"{source}: the budget of {metric} must be a number, not {limit!r}")
+
+
+def _parse_budgets(text):
+    """
+        Parse and check PAGE_LOAD_BUDGETS, e.g. 'lcpMs=2500,loadMs=5000,cls=0.1'.
+
+        Raises:
+            ValueError: An item is not 'metric=number' or names an unknown metric.
+    """
+    budgets = {}
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        metric, separator, limit = item.partition("=")
+        try:
+            budgets[metric.strip()] = float(limit if separator else "")
+        except ValueError:
+            raise ValueError(f"PAGE_LOAD_BUDGETS: '{item.strip()}' is not 'metric=number' "
+                             f"(e.g. 'lcpMs=2500,cls=0.1')") from None
+        _check_budget("PAGE_LOAD_BUDGETS", metric.strip(), budgets[metric.strip()])
+    return budgets
+
+
+def get_budgets(overrides=None):
+    """
+        Get the page load budgets: PAGE_LOAD_BUDGETS (e.g. 'lcpMs=2500,loadMs=5000,cls=0.1') updated with the
+        test class's own budgets. PAGE_LOAD_BUDGETS is parsed once per value.
+
+        Raises:
+            ValueError: PAGE_LOAD_BUDGETS or the overrides name an unknown metric or a budget that is not a number.
+    """
+    global _environmentBudgets
+    text = os.environ.get("PAGE_LOAD_BUDGETS", "")
+    if _environmentBudgets[0] != text:
+        _environmentBudgets = (text, _parse_budgets(text))
+    for metric, limit in (overrides or {}).items():
+        _check_budget("pageLoadBudgets", metric, limit)
+    return {**_environmentBudgets[1], **(overrides or {})}
+
+
+def load_baseline():
+    """
+        Load the per URL aggregates of the page metrics reports PAGE_LOAD_BASELINE names (a file or a glob pattern, e.g.
+        the reports of every worker of an earlier run), or None when it is not set.
+    """
+    global _baseline
+    pattern = os.environ.get("PAGE_LOAD_BASELINE")
+    if not pattern:
+        return None
+    if _baseline is None:
+        navigations = []
+        for fileName in sorted(glob.glob(pattern)):
+            with open(fileName, encoding="utf-8") as file:
+                navigations.extend(json.load(file)["navigations"])
+        _baseline = aggregate(navigations, "url")
+    return _baseline
+
+
+def pop_budget_violations(testId, budgets=None):
+    """
+        Check the navigations of a test against the page load budgets and against the baseline: a navigation is too
+        slow when a metric is PAGE_LOAD_MAX_REGRESSION times (1.5 by default) its baseline 75th percentile for the URL.
+        The navigations of the test are forgotten afterwards.
+
+        Returns:
+            list: The violations as readable strings, empty if the test is within its budgets.
+    """
+    with _lock:
+        navigations = _testNavigations.pop(testId, [])
+    budgets = get_budgets(budgets)
+    baseline = load_baseline() or {}
+    maxRegression = float(os.environ.get("PAGE_LOAD_MAX_REGRESSION", "1.5"))
+    violations = []
+    for navigation in navigations:
+        for metric, limit in budgets.items():
+            if navigation.get(metric) is not None and navigation[metric] > limit:
+                violations.append(f"{metric} of {navigation['url']} is {navigation[metric]} (budget {limit:g})")
+        urlBaseline = baseline.get(get_url_key(navigation["url"]), {})
+        for metric in REGRESSION_METRICS:
+            reference = urlBaseline.get(metric)
+            if navigation.get(metric) is None or not reference or reference["count"] < BASELINE_MIN_COUNT:
+                continue
+            percentileName = f"p{int(BASELINE_PERCENTILE * 100)}"
+            if navigation[metric] > reference[percentileName] * maxRegression:
+                violations.append(f"{metric} of {navigation['url']} is {navigation[metric]}, more than {maxRegression:g} "
+                                  f"times the baseline {percentileName} of {reference[percentileName]}")
+    if violations:
+        customLogger.logger("WARNING", "Warning: The test %s exceeded its page load budgets: %s", testId, violations,
+                            event="page_budget_violation", test=testId, violations=violations)
+    return violations
+
+
+@atexit.register
+def _write_report_at_exit():
+    """
+        Export the page metrics at the end of the run if any navigation was recorded.
+    """
+    if _navigations:
+        write_report()
@@ -0,0 +1,347 @@
+import argparse
+import glob
+import hashlib
+import heapq
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import traceback
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from common_.utilities_ import commandTimer, customLogger, failureArtifacts, preconditionGraph, projectPaths, resultCache
+
+DEFAULT_TEST_DURATION = 30.0
+DURATION_SMOOTHING = 0.5
+MAX_FILE_NAME_LENGTH = 150
+
+
+def discover_test_ids(startDirectory="tests_", pattern="*Test.py"):
+    """
+        Discover the ids of all test methods under the start directory.
+        The test folders are plain directories (no __init__.py), so the files are found by pattern and loaded by module name.
+    """
+    rootDirectory = projectPaths.get_root_directory()
+    loader = unittest.TestLoader()
+    testIds = []
+    for testFile in sorted((rootDirectory / startDirectory).rglob(pattern)):
+        moduleName = ".".join(testFile.relative_to(rootDirectory).with_suffix("").parts)
+        testIds.extend(_flatten_test_ids(loader.loadTestsFromName(moduleName)))
+    return testIds
+
+
+def _flatten_test_ids(suite):
+    """
+        Get the ids of all test cases in a (possibly nested) test suite.
+    """
+    if isinstance(suite, unittest.TestCase):
+        return [suite.id()]
+    testIds = []
+    for test in suite:
+        testIds.extend(_flatten_test_ids(test))
+    return testIds
+
+
+def load_durations(durationsFile):
+    """
+        Load the recorded test durations, returning an empty history if there is none yet.
+    """
+    try:
+        with open(durationsFile, encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_durations(durationsFile, durations, results):
+    """
+        Update the duration history with a moving average of the new results and save it.
+    """
+    for result in results:
+        # The rows of a data-driven test are not tests of their own to balance
+        if result.get("subTest"):
+            continue
+        previous = durations.get(result["id"])
+        if previous is None:
+            durations[result["id"]] = round(result["duration"], 3)
+        else:
+            durations[result["id"]] = round(previous + DURATION_SMOOTHING * (result["duration"] - previous), 3)
+    with open(durationsFile, "w", encoding="utf-8") as file:
+        json.dump(durations, file, indent=2, sort_keys=True)
+
+
+def get_traceback_file_name(testId):
+    """
+        Get a safe file name for the traceback of a test or sub-test (sub-test ids contain the row values, e.g.
+        "test_x (row=3, data={'zip': 'a/b'})"). Names that had to be changed or shortened keep a hash of the id, so they
+        stay unique.
+    """
+    name = re.sub(r"[^\w.()=,-]+", "_", testId)
+    if name != testId or len(name) > MAX_FILE_NAME_LENGTH:
+        name = f"{name[:MAX_FILE_NAME_LENGTH - 9]}_{hashlib.sha1(testId.encode('utf-8')).hexdigest()[:8]}"
+    return f"{name}.txt"
+
+
+def build_shards(testIds, workers, durations):
+    """
+        Split the tests into balanced shards using the longest-processing-time-first rule on the past durations.
+        Tests without history are assumed to take as long as the median known test.
+    """
+    known = sorted(durations[testId] for testId in testIds if testId in durations)
+    defaultDuration = known[len(known) // 2] if known else DEFAULT_TEST_DURATION
+
+    shards = [{"tests": [], "expectedDuration": 0.0} for _ in range(max(1, min(workers, len(testIds))))]
+    for testId in sorted(testIds, key=lambda testId: durations.get(testId, defaultDuration), reverse=True):
+        shard = min(shards, key=lambda shard: shard["expectedDuration"])
+        shard["tests"].append(testId)
+        shard["expectedDuration"] += durations.get(testId, defaultDuration)
+    return shards
+
+
+class RecordingResult(unittest.TestResult):
+    def __init__(self):
+        """
+            Initialize a test result that records the outcome and the duration of every test.
+        """
+        super().__init__()
+        self.records = []
+        self.__startTime = None
+
+    def startTest(self, test):
+        super().startTest(test)
+        self.__startTime = time.perf_counter()
+
+    def __record(self, test, status, err=None, isSubTest=False):
+        record = {
+            "id": test.id(),
+            "status": status,
+            "duration": time.perf_counter() - self.__startTime,
+            "traceback": self._exc_info_to_string(err, test) if err else None,
+        }
+        if isSubTest:
+            record["subTest"] = True
+        self.records.append(record)
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self.__record(test, "passed")
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self.__record(test, "failed", err)
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self.__record(test, "error", err)
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self.__record(test, "skipped")
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self.__record(test, "passed")
+
+    def addUnexpectedSuccess(self, test):
+        # A test marked as an expected failure that passed is a failure of the suite, as in unittest.TestResult
+        super().addUnexpectedSuccess(test)
+        self.__record(test, "failed")
+        self.records[-1]["traceback"] = "The test is marked as an expected failure but passed"
+
+    def addSubTest(self, test, subtest, err):
+        # Failed sub-tests (e.g. the rows of a data-driven test) are reported one by one; the test itself is not
+        # reported as passed when one of them failed
+        super().addSubTest(test, subtest, err)
+        if err is not None:
+            self.__record(subtest, "failed" if issubclass(err[0], test.failureException) else "error", err, isSubTest=True)
+
+
+def run_shard(workerId, testIds, firstTestIds=()):
+    """
+        Run one shard of tests in the current process. All tests of the shard share the process-wide driver pool,
+        so the worker keeps a single warm browser for its whole shard. The firstTestIds (e.g. the tests that failed
+        last time) run before the others of their precondition chain.
+    """
+    os.environ["WORKER_ID"] = str(workerId)
+    os.environ.setdefault("DRIVER_POOL_SIZE", "1")
+
+    startTime = time.perf_counter()
+    result = RecordingResult()
+    loader = unittest.TestLoader()
+    tests = []
+    for testId in testIds:
+        try:
+            tests.append((testId, loader.loadTestsFromName(testId)))
+        except Exception:
+            result.records.append({"id": testId, "status": "error", "duration": 0.0, "traceback": traceback.format_exc()})
+    # Tests sharing a precondition prefix run back to back, so each one continues from the state the previous one reached.
+    # order_tests keeps the order within a chain, so the first tests run first within their chain
+    firstTestIds = set(firstTestIds)
+    tests.sort(key=lambda test: test[0] not in firstTestIds)
+    for testId, test in preconditionGraph.order_tests(tests, lambda test: next(iter(test[1]), None)):
+        test.run(result)
+
+    commandTimings = commandTimer.get_snapshot()
+    commandTimer.reset()
+    preconditionStats = preconditionGraph.get_stats()
+    preconditionGraph.reset_stats()
+    customLogger.flush()
+    failureArtifacts.flush()
+    artifactsDirectory = failureArtifacts.get_run_directory() if failureArtifacts.get_stats()["writtenBytes"] else None
+    return {"workerId": workerId, "pid": os.getpid(), "duration": time.perf_counter() - startTime,
+            "results": result.records, "commandTimings": commandTimings, "preconditionStats": preconditionStats,
+            "logFile": customLogger.get_default_file_name(), "artifactsDirectory": artifactsDirectory}
+
+
+def _get_failed_shard_report(workerId, testIds, error):
+    """
+        Get the report of a shard whose worker died or raised: each of its tests is an error with the worker's error.
+    """
+    message = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+    return {"workerId": workerId, "pid": None, "duration": 0.0,
+            "results": [{"id": testId, "status": "error", "duration": 0.0, "traceback": message} for testId in testIds],
+            "commandTimings": {}, "preconditionStats": dict.fromkeys(preconditionGraph.get_stats(), 0),
+            "logFile": None, "artifactsDirectory": None}
+
+
+def _get_log_entry_time(line):
+    try:
+        return json.loads(line).get("time", "")
+    except ValueError:
+        return ""
+
+
+def merge_log_files(logFiles, mergedFile):
+    """
+        Merge the JSON lines logs of the workers into one file ordered by time. The rotated parts of a worker's log
+        (log.jsonl.2, log.jsonl.1) come before the log itself.
+
+        Returns:
+            list: The log files that were merged, rotated parts included.
+    """
+    mergedFiles = []
+    for logFile in logFiles:
+        rotatedFiles = [name for name in glob.glob(glob.escape(logFile) + ".*") if name.rsplit(".", 1)[1].isdigit()]
+        rotatedFiles.sort(key=lambda name: int(name.rsplit(".", 1)[1]), reverse=True)
+        mergedFiles.append([name for name in rotatedFiles + [logFile] if os.path.isfile(name)])
+
+    def read_lines(fileNames):
+        for fileName in fileNames:
+            with open(fileName, encoding="utf-8") as file:
+                yield from file
+
+    with open(mergedFile, "w", encoding="utf-8") as file:
+        file.writelines(heapq.merge(*(read_lines(fileNames) for fileNames in mergedFiles), key=_get_log_entry_time))
+    return [fileName for fileNames in mergedFiles for fileName in fileNames]
+
+
+def run_in_parallel(testIds, workers, reportsDirectory=None, incremental=None):
+    """
+        Run the tests across a process pool, one shard per worker, and merge the results into one report.
+        With incremental ('skip' or 'last', see resultCache.plan_run) the tests whose inputs did not change since they
+        passed are left out or run last, and the tests that failed last time run first.
+    """
+    reportsDirectory = reportsDirectory or projectPaths.get_project_directory("reports_")
+    durationsFile = os.path.join(reportsDirectory, "testDurations.json")
+    runDirectory = os.path.join(reportsDirectory, f'run_{datetime.now().strftime("%d_%m_%Y_%H-%M-%S")}')
+    os.makedirs(runDirectory, exist_ok=True)
+
+    plan = resultCache.plan_run(testIds, incremental, resultCache.get_site_fingerprint()) if incremental else None
+    if plan is not None:
+        testIds = plan["run"]
+    durations = load_durations(durationsFile)
+    shards = build_shards(testIds, workers, durations)
+    startTime = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [executor.submit(run_shard, workerId, shard["tests"], plan["failedFirst"] if plan else ())
+                   for workerId, shard in enumerate(shards)]
+        workerReports = []
+        # A worker that died (BrokenProcessPool) or raised only fails the tests of its own shard
+        for workerId, (shard, future) in enumerate(zip(shards, futures)):
+            try:
+                workerReports.append(future.result())
+            except Exception as error:
+                customLogger.logger("ERROR", "The worker of shard %s failed: %r", workerId, error, event="worker_failed",
+                                    shard=workerId)
+                workerReports.append(_get_failed_shard_report(workerId, shard["tests"], error))
+
+    results = [result for workerReport in workerReports for result in workerReport["results"]]
+    save_durations(durationsFile, durations, results)
+    if plan is not None:
+        resultCache.save_results(results, plan["keys"])
+
+    for result in results:
+        if result["traceback"]:
+            with open(os.path.join(runDirectory, get_traceback_file_name(result["id"])), "w", encoding="utf-8") as file:
+                file.write(result["traceback"])
+
+    commandTimings = commandTimer.merge_snapshots(workerReport["commandTimings"] for workerReport in workerReports)
+    if any(commandTimings.values()):
+        commandTimer.write_report(os.path.join(runDirectory, "commandTimings.json"), snapshot=commandTimings)
+    logFiles = merge_log_files([workerReport["logFile"] for workerReport in workerReports if workerReport["logFile"]],
+                               os.path.join(runDirectory, "log.jsonl"))
+
+    wallTime = time.perf_counter() - startTime
+    serialTime = sum(result["duration"] for result in results)
+    report = {
+        "workers": len(shards),
+        "wallTime": round(wallTime, 3),
+        "serialTime": round(serialTime, 3),
+        "speedup": round(serialTime / wallTime, 2) if wallTime else 0.0,
+        "summary": {status: sum(1 for result in results if result["status"] == status)
+                    for status in ("passed", "failed", "error", "skipped")},
+        "cached": plan["cached"] if plan else [],
+        "shards": [{"workerId": workerReport["workerId"], "pid": workerReport["pid"],
+                    "expectedDuration": round(shard["expectedDuration"], 3), "duration": round(workerReport["duration"], 3),
+                    "tests": shard["tests"]} for shard, workerReport in zip(shards, workerReports)],
+        "preconditionSteps": {key: sum(workerReport["preconditionStats"][key] for workerReport in workerReports)
+                              for key in workerReports[0]["preconditionStats"]},
+        "results": results,
+        "logFile": os.path.join(runDirectory, "log.jsonl"),
+        "logFiles": logFiles,
+        "artifactsDirectories": [workerReport["artifactsDirectory"] for workerReport in workerReports
+                                 if workerReport["artifactsDirectory"]],
+    }
+    with open(os.path.join(runDirectory, "report.json"), "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    report["reportFile"] = os.path.join(runDirectory, "report.json")
+    return report
+
+
+def main(argv=None):
+    """
+        Command line entry point: python -m common_.utilities_.parallelRunner --workers 4
+    """
+    parser = argparse.ArgumentParser(description="Run the test suite in parallel, one browser per worker process.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="The number of worker processes.")
+    parser.add_argument("--start-directory", default="tests_", help="The directory to discover tests in.")
+    parser.add_argument("--pattern", default="*Test.py", help="The file name pattern of test modules.")
+    parser.add_argument("--incremental", nargs="?", const="skip", choices=("skip", "last"),
+                        help="Skip (or run last) the tests that passed with unchanged inputs; run last run's failures first.")
+    args = parser.parse_args(argv)
+
+    testIds = discover_test_ids(args.start_directory, args.pattern)
+    if not testIds:
+        print("No tests were found.")
+        return 0
+
+    report = run_in_parallel(testIds, args.workers, incremental=args.incremental)
+    summary = report["summary"]
+    if report["cached"]:
+        print(f'{len(report["cached"])} tests passed last time with the same inputs and were skipped.')
+    print(f'Ran {len(report["results"])} tests on {report["workers"]} workers in {report["wallTime"]}s '
+          f'(serial time {report["serialTime"]}s, speedup x{report["speedup"]}): {summary}')
+    if report["preconditionSteps"]["tests"]:
+        print(f'Precondition steps: {report["preconditionSteps"]["executedSteps"]} run, '
+              f'{report["preconditionSteps"]["savedSteps"]} saved')
+    print(f'Report: {report["reportFile"]}')
+    return 0 if summary["failed"] == 0 and summary["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
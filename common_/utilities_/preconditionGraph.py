@@ -0,0 +1,167 @@
+import atexit
+import time
+
+from common_.utilities_ import customLogger
+
+
+class Precondition:
+    def __init__(self, name, setup, requires=None, restore=None, verify=None):
+        """
+            Initialize a named precondition, one step of the precondition graph.
+
+            Args:
+                name (str): The name tests declare the precondition by.
+                setup (callable): Reaches the state from the state of the required precondition, called with the driver.
+                requires (str): The precondition this one builds on, or None for a fresh browser session.
+                restore (callable): Brings the browser back to this state from any later state (e.g. by navigating),
+                    or None if that is not possible.
+                verify (callable): Checks cheaply that the browser is still in this state, or None if it cannot tell.
+        """
+        self.name = name
+        self.setup = setup
+        self.requires = requires
+        self.restore = restore
+        self.verify = verify
+
+
+_preconditions = {}
+# The preconditions reached in every browser session, by session id
+_sessionPaths = {}
+_stats = {"tests": 0, "baselineSteps": 0, "executedSteps": 0, "reusedSteps": 0}
+
+
+def register_precondition(name, requires=None, restore=None, verify=None):
+    """
+        Register the decorated function as the setup of a named precondition.
+    """
+    def register(setup):
+        _preconditions[name] = Precondition(name, setup, requires, restore, verify)
+        return setup
+    return register
+
+
+def requires_precondition(name):
+    """
+        Declare the precondition a test method starts from (a test class can declare it with its precondition attribute).
+    """
+    def declare(testMethod):
+        testMethod.precondition = name
+        return testMethod
+    return declare
+
+
+def get_path(name):
+    """
+        Get the chain of preconditions from a fresh session to the named one.
+    """
+    path = []
+    while name is not None:
+        if name not in _preconditions:
+            customLogger.logger("ERROR", f"Error: The precondition '{name}' is not registered")
+            exit(2)
+        if any(precondition.name == name for precondition in path):
+            customLogger.logger("ERROR", f"Error: The precondition '{name}' depends on itself")
+            exit(2)
+        path.append(_preconditions[name])
+        name = _preconditions[name].requires
+    return path[::-1]
+
+
+def get_test_precondition(test):
+    """
+        Get the precondition a test case declares on its method or its class, or None.
+    """
+    testMethod = getattr(test, getattr(test, "_testMethodName", ""), None)
+    return getattr(testMethod, "precondition", None) or getattr(test, "precondition", None)
+
+
+def get_test_path_names(test):
+    """
+        Get the names of the precondition chain of a test case, an empty tuple if it declares none.
+    """
+    name = get_test_precondition(test)
+    return tuple(precondition.name for precondition in get_path(name)) if name else ()
+
+
+def order_tests(tests, getTestCase=lambda test: test):
+    """
+        Order tests so that the ones sharing a precondition prefix run back to back: sorting by the precondition chain
+        puts every shared prefix in one block. The original order is kept within a chain.
+    """
+    return sorted(tests, key=lambda test: get_test_path_names(getTestCase(test)))
+
+
+def _get_session_id(driver):
+    return getattr(getattr(driver, "wrapped_driver", driver), "session_id", None)
+
+
+def forget(driver):
+    """
+        Forget the state of a session, e.g. after it was reset outside of the graph.
+    """
+    _sessionPaths.pop(_get_session_id(driver), None)
+
+
+def reach(driver, name):
+    """
+        Bring the session to the named precondition, reusing what the previous test of the session reached.
+        The steps the previous chain shares with this one are reused from the deepest one that still holds (verify),
+        or can be restored; only the steps below it are run.
+
+        Returns:
+            int: The number of steps that were run (setups and restores).
+    """
+    startTime = time.perf_counter()
+    path = get_path(name)
+    names = [precondition.name for precondition in path]
+    previousNames = _sessionPaths.pop(_get_session_id(driver), [])
+    sharedSteps = 0
+    while sharedSteps < min(len(names), len(previousNames)) and names[sharedSteps] == previousNames[sharedSteps]:
+        sharedSteps += 1
+
+    executedSteps = 0
+    startIndex = 0
+    for index in range(sharedSteps - 1, -1, -1):
+        precondition = path[index]
+        if precondition.verify is not None and precondition.verify(driver):
+            startIndex = index + 1
+            break
+        if precondition.restore is not None:
+            precondition.restore(driver)
+            executedSteps += 1
+            startIndex = index + 1
+            break
+    for precondition in path[startIndex:]:
+        precondition.setup(driver)
+        executedSteps += 1
+    _sessionPaths[_get_session_id(driver)] = names
+
+    _stats["tests"] += 1
+    _stats["baselineSteps"] += len(path)
+    _stats["executedSteps"] += executedSteps
+    _stats["reusedSteps"] += startIndex
+    customLogger.logger("INFO", "The precondition '%s' was reached in %s of %s steps", name, executedSteps, len(path),
+                        event="precondition", precondition=name, steps=len(path), executedSteps=executedSteps,
+                        reusedSteps=startIndex, durationMs=round((time.perf_counter() - startTime) * 1000, 3))
+    return executedSteps
+
+
+def get_stats():
+    """
+        Get the number of precondition steps the tests needed, how many were run and how many were saved.
+    """
+    return {**_stats, "savedSteps": _stats["baselineSteps"] - _stats["executedSteps"]}
+
+
+def reset_stats():
+    for key in _stats:
+        _stats[key] = 0
+
+
+@atexit.register
+def _log_stats():
+    """
+        Log the saved setup steps at the end of the run.
+    """
+    if _stats["tests"]:
+        customLogger.logger("INFO", f"Precondition graph statistics: {get_stats()}", event="precondition_stats", **get_stats())
@@ -0,0 +1,200 @@
+import atexit
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from common_.utilities_ import customLogger, fileLock, projectPaths
+from testData_.data import mainPageUrl
+
+TEMPLATES_DIRECTORY = "profileTemplates_"
+TEMPLATE_NAME = "chrome"
+TEMPLATE_INFO_FILE = "template.json"
+TEMPLATE_MAX_AGE_SECONDS = 24 * 3600
+WINDOW_SIZE = (1920, 1080)
+
+# Chrome arguments of the template and of every session cloned from it: no first-run work, no background traffic
+TEMPLATE_ARGUMENTS = [
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-client-side-phishing-detection",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--metrics-recording-only",
+    "--password-store=basic",
+    f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}",
+]
+
+# Files of a running Chrome that must not be copied into a clone
+LOCK_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+
+_cloneDirectories = set()
+
+
+def is_enabled():
+    """
+        Check whether sessions are launched from the profile template (CHROME_PROFILE_TEMPLATE=1).
+    """
+    return os.environ.get("CHROME_PROFILE_TEMPLATE", "0") == "1"
+
+
+def is_headless():
+    """
+        Check whether Chrome runs headless (CHROME_HEADLESS=1).
+    """
+    return os.environ.get("CHROME_HEADLESS", "0") == "1"
+
+
+def get_template_directory(name=TEMPLATE_NAME):
+    """
+        Get the directory of a named profile template.
+    """
+    return os.path.join(projectPaths.get_project_directory(TEMPLATES_DIRECTORY), name)
+
+
+def get_chrome_arguments():
+    """
+        Get the Chrome arguments shared by the template and its clones.
+    """
+    return TEMPLATE_ARGUMENTS + (["--headless=new"] if is_headless() else [])
+
+
+def _get_argument_names(arguments):
+    """
+        Get the names of Chrome arguments without their values: the address of the record/replay proxy changes with
+        every run, but a template primed through the proxy fits every run that uses it.
+    """
+    return sorted(argument.split("=", 1)[0] for argument in arguments)
+
+
+def _read_info(templateDirectory):
+    try:
+        with open(os.path.join(templateDirectory, TEMPLATE_INFO_FILE), encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _is_fresh(templateDirectory, maxAgeSeconds, extraArguments=(), createdAfter=0.0):
+    info = _read_info(templateDirectory)
+    if info is None:
+        return False
+    return (max(time.time() - maxAgeSeconds, createdAfter) <= info["createdAt"]
+            and info["arguments"] == get_chrome_arguments()
+            and info.get("extraArguments") == _get_argument_names(extraArguments))
+
+
+def build_template(primeUrls=(mainPageUrl,), extraArguments=(), maxAgeSeconds=TEMPLATE_MAX_AGE_SECONDS, force=False,
+                   name=TEMPLATE_NAME):
+    """
+        Build the profile template once: start Chrome on an empty user data directory with the template arguments,
+        load the prime URLs to fill the disk cache and quit cleanly so that everything is flushed to disk.
+        The template is built in a temporary directory and renamed into place under an exclusive lock, so parallel
+        workers never see half of it, never copy one that is being replaced, and only one of them rebuilds it.
+        The template is fresh while it is younger than maxAgeSeconds and was built with the same arguments.
+
+        Args:
+            primeUrls (iterable): The pages whose resources are put in the disk cache.
+            extraArguments (iterable): More Chrome arguments for the build, e.g. the record/replay proxy.
+            maxAgeSeconds (int): A template older than this is rebuilt.
+            force (bool): Rebuild even if the template is fresh.
+            name (str): The name of the template, so that e.g. the benchmarks keep their own.
+
+        Returns:
+            str: The template directory.
+    """
+    templateDirectory = get_template_directory(name)
+    if not force and _is_fresh(templateDirectory, maxAgeSeconds, extraArguments):
+        return templateDirectory
+
+    waitStartTime = time.time()
+    # Builds lock the template exclusively and clones shared, so a template is never replaced while a worker copies it
+    # and only one worker rebuilds a stale one
+    with fileLock.locked(templateDirectory):
+        # Another worker may have built it while this one waited for the lock
+        if _is_fresh(templateDirectory, maxAgeSeconds, extraArguments, createdAfter=waitStartTime if force else 0.0):
+            return templateDirectory
+        _build(templateDirectory, primeUrls, extraArguments, name)
+    return templateDirectory
+
+
+def _build(templateDirectory, primeUrls, extraArguments, name):
+    startTime = time.perf_counter()
+    buildDirectory = tempfile.mkdtemp(prefix=f"{name}-", dir=os.path.dirname(templateDirectory))
+    options = webdriver.ChromeOptions()
+    for argument in get_chrome_arguments() + list(extraArguments) + [f"--user-data-dir={buildDirectory}"]:
+        options.add_argument(argument)
+    driver = webdriver.Chrome(options=options)
+    try:
+        for url in primeUrls:
+            try:
+                driver.get(url)
+            except WebDriverException as e:
+                customLogger.logger("WARNING", "Warning: The template could not load %s: %s", url, str(e))
+    finally:
+        driver.quit()
+    with open(os.path.join(buildDirectory, TEMPLATE_INFO_FILE), "w", encoding="utf-8") as file:
+        json.dump({"createdAt": time.time(), "arguments": get_chrome_arguments(),
+                   "extraArguments": _get_argument_names(extraArguments), "primeUrls": list(primeUrls)}, file)
+
+    oldDirectory = f"{templateDirectory}.old-{os.getpid()}"
+    if os.path.isdir(templateDirectory):
+        os.replace(templateDirectory, oldDirectory)
+    os.replace(buildDirectory, templateDirectory)
+    shutil.rmtree(oldDirectory, ignore_errors=True)
+    customLogger.logger("INFO", "The Chrome profile template was built in %.3f s", time.perf_counter() - startTime,
+                        event="profile_template", buildSeconds=round(time.perf_counter() - startTime, 3))
+
+
+def clone_template(templateDirectory=None):
+    """
+        Clone the template into a new user data directory for one session. cp --reflink=auto shares the blocks
+        with the template on copy-on-write file systems (btrfs, XFS, APFS) and falls back to a plain copy elsewhere.
+
+        Returns:
+            str: The directory of the clone, removed with remove_clone when the session quits.
+    """
+    templateDirectory = templateDirectory or get_template_directory()
+    cloneDirectory = tempfile.mkdtemp(prefix="chrome-session-")
+    # Clones run at the same time under the shared lock, except on Windows, where the lock is exclusive (see fileLock)
+    with fileLock.locked(templateDirectory, shared=True):
+        try:
+            subprocess.run(["cp", "-a", "--reflink=auto", f"{templateDirectory}/.", cloneDirectory], check=True,
+                           capture_output=True)
+        except (OSError, subprocess.CalledProcessError):
+            shutil.copytree(templateDirectory, cloneDirectory, symlinks=True, dirs_exist_ok=True)
+    for fileName in LOCK_FILES:
+        path = os.path.join(cloneDirectory, fileName)
+        if os.path.lexists(path):
+            os.remove(path)
+    _cloneDirectories.add(cloneDirectory)
+    return cloneDirectory
+
+
+def remove_clone(driver):
+    """
+        Remove the user data directory a quit session was cloned into, if any.
+    """
+    cloneDirectory = getattr(driver, "profileDirectory", None)
+    if cloneDirectory in _cloneDirectories:
+        _cloneDirectories.discard(cloneDirectory)
+        shutil.rmtree(cloneDirectory, ignore_errors=True)
+
+
+@atexit.register
+def _remove_clones():
+    """
+        Remove the clones of sessions that were not quit through the driver pool.
+    """
+    for cloneDirectory in list(_cloneDirectories):
+        shutil.rmtree(cloneDirectory, ignore_errors=True)
+    _cloneDirectories.clear()
@@ -0,0 +1,17 @@
+from pathlib import Path
+
+
+def get_root_directory():
+    """
+        Get the root directory of the project based on the location of this file (common_/utilities_/).
+    """
+    return Path(__file__).resolve().parents[2]
+
+
+def get_project_directory(name):
+    """
+        Get a directory directly under the project root (e.g. 'logs_', 'reports_'), creating it if it does not exist.
+    """
+    directory = get_root_directory() / name
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
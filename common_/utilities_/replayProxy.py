@@ -0,0 +1,381 @@
+import hashlib
+import http.client
+import json
+import os
+import select
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from common_.utilities_ import customLogger, projectPaths
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = (RECORD, REPLAY)
+
+# Headers that only apply to one connection and must not be forwarded or stored
+HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection", "te",
+                      "trailer", "transfer-encoding", "upgrade", "content-length"}
+
+
+class RequestMatcher:
+    def __init__(self, keys=("method", "url", "query"), ignoredQueryParameters=(), headers=()):
+        """
+            Initialize the rule that decides which requests are the same for the recording.
+
+            Args:
+                keys (iterable): The request parts that identify a response: 'method', 'url' (scheme, host and path),
+                    'query' and 'body'.
+                ignoredQueryParameters (iterable): Query parameters left out of the key, e.g. cache busters or timestamps.
+                headers (iterable): Request headers that are part of the key, e.g. 'Accept-Language'.
+        """
+        self.keys = tuple(keys)
+        self.ignoredQueryParameters = set(ignoredQueryParameters)
+        self.headers = tuple(header.lower() for header in headers)
+
+    def get_key(self, method, url, headers, body):
+        """
+            Get the content hash identifying a request.
+        """
+        parts = urlsplit(url)
+        keyParts = {}
+        if "method" in self.keys:
+            keyParts["method"] = method.upper()
+        if "url" in self.keys:
+            keyParts["url"] = f"{parts.scheme}://{parts.netloc}{parts.path}"
+        if "query" in self.keys:
+            keyParts["query"] = urlencode(sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                                                 if name not in self.ignoredQueryParameters))
+        if "body" in self.keys:
+            keyParts["body"] = hashlib.sha256(body or b"").hexdigest()
+        for header in self.headers:
+            keyParts[f"header:{header}"] = headers.get(header, "")
+        return hashlib.sha256(json.dumps(keyParts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ContentStore:
+    def __init__(self, directory):
+        """
+            Initialize an on-disk, content-addressed store of recorded responses.
+            Bodies are saved once per content hash under objects/, and every request key points to its response metadata
+            (status, headers, body hash, recorded latency) under entries/.
+        """
+        self.directory = str(directory)
+        os.makedirs(os.path.join(self.directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(self.directory, "entries"), exist_ok=True)
+
+    def __write_atomically(self, path, data):
+        """
+            Write a file through a temporary file, so readers never see a partial file.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporaryPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporaryPath, "wb") as file:
+            file.write(data)
+        os.replace(temporaryPath, path)
+
+    def put(self, key, entry, body):
+        """
+            Save a response body (if its content is not stored yet) and the entry of the request key.
+        """
+        bodyHash = hashlib.sha256(body).hexdigest()
+        objectPath = os.path.join(self.directory, "objects", bodyHash[:2], bodyHash)
+        if not os.path.exists(objectPath):
+            self.__write_atomically(objectPath, body)
+        entry = dict(entry, bodyHash=bodyHash)
+        self.__write_atomically(os.path.join(self.directory, "entries", f"{key}.json"),
+                                json.dumps(entry, indent=2).encode("utf-8"))
+
+    def get(self, key):
+        """
+            Get the entry and the body recorded for a request key, or (None, None) if it was not recorded.
+        """
+        try:
+            with open(os.path.join(self.directory, "entries", f"{key}.json"), encoding="utf-8") as file:
+                entry = json.load(file)
+            with open(os.path.join(self.directory, "objects", entry["bodyHash"][:2], entry["bodyHash"]), "rb") as file:
+                return entry, file.read()
+        except FileNotFoundError:
+            return None, None
+
+
+class _CertificateAuthority:
+    def __init__(self, directory):
+        """
+            Initialize the generator of self-signed certificates used to record and replay HTTPS traffic.
+            The browser has to run with --ignore-certificate-errors. Requires the openssl command line tool.
+        """
+        self.directory = os.path.join(str(directory), "certificates")
+        os.makedirs(self.directory, exist_ok=True)
+        self.__contexts = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def is_available():
+        return shutil.which("openssl") is not None
+
+    def get_context(self, host):
+        """
+            Get a server-side TLS context with a certificate for the host, generating the certificate on first use.
+        """
+        with self.__lock:
+            context = self.__contexts.get(host)
+            if context is None:
+                certificatePath = os.path.join(self.directory, f"{host}.pem")
+                if not os.path.exists(certificatePath):
+                    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "365",
+                                    "-subj", f"/CN={host}", "-addext", f"subjectAltName=DNS:{host}",
+                                    "-keyout", certificatePath, "-out", certificatePath],
+                                   check=True, capture_output=True)
+                context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+                context.load_cert_chain(certificatePath)
+                self.__contexts[host] = context
+            return context
+
+
+class _ProxyRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    tunnelOrigin = None
+
+    def log_message(self, format, *args):
+        customLogger.logger("DEBUG", "Replay proxy: " + format, *args, event="replay_proxy")
+
+    def do_CONNECT(self):
+        """
+            Handle an HTTPS tunnel: decrypt it with a generated certificate when possible, otherwise relay it untouched
+            (such traffic is neither recorded nor replayed).
+        """
+        host, _, port = self.path.partition(":")
+        proxy = self.server.replayProxy
+        if proxy.certificateAuthority is None:
+            if proxy.mode == REPLAY:
+                self.send_error(502, "HTTPS replay requires openssl to generate certificates")
+                return
+            self.__relay_tunnel(host, int(port or 443))
+            return
+
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        self.wfile.flush()
+        self.connection = proxy.certificateAuthority.get_context(host).wrap_socket(self.connection, server_side=True)
+        self.rfile = self.connection.makefile("rb", self.rbufsize)
+        self.wfile = self.connection.makefile("wb")
+        self.tunnelOrigin = f"https://{host}" if port in ("", "443") else f"https://{host}:{port}"
+        self.close_connection = False
+
+    def __relay_tunnel(self, host, port):
+        """
+            Relay the raw bytes of a tunnel between the browser and the origin.
+        """
+        try:
+            upstream = socket.create_connection((host, port), timeout=30)
+        except OSError as e:
+            self.send_error(502, str(e))
+            return
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        self.wfile.flush()
+        sockets = [self.connection, upstream]
+        try:
+            while True:
+                readable, _, failed = select.select(sockets, [], sockets, 30)
+                if failed or not readable:
+                    break
+                for source in readable:
+                    data = source.recv(65536)
+                    if not data:
+                        return
+                    (upstream if source is self.connection else self.connection).sendall(data)
+        finally:
+            upstream.close()
+            self.close_connection = True
+
+    def __handle(self):
+        """
+            Handle one proxied request in the mode of the proxy.
+        """
+        url = self.tunnelOrigin + self.path if self.tunnelOrigin else self.path
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        headers = {name.lower(): value for name, value in self.headers.items()}
+        status, reason, responseHeaders, responseBody = self.server.replayProxy.handle(self.command, url, headers, body)
+
+        self.send_response(status, reason)
+        for name, value in responseHeaders:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(responseBody)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(responseBody)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = __handle
+
+
+class ReplayProxy:
+    def __init__(self, storeDirectory, mode=REPLAY, matcher=None, latency=0.0, host="127.0.0.1", port=0,
+                 decryptHttps=True):
+        """
+            Initialize a local record/replay HTTP proxy for the browser.
+
+            Args:
+                storeDirectory (str): The directory of the content-addressed response store.
+                mode (str): 'record' forwards requests to the origin and saves the responses, 'replay' serves them from
+                    the store and answers 404 for requests that were not recorded.
+                matcher (RequestMatcher): Decides which requests share a recorded response.
+                latency (float or str): Seconds added to every replayed response, or 'recorded' to replay the latency
+                    measured while recording.
+                host (str): The interface the proxy listens on.
+                port (int): The port the proxy listens on; 0 picks a free one.
+                decryptHttps (bool): Record and replay HTTPS with generated certificates (needs openssl and a browser
+                    ignoring certificate errors). Otherwise HTTPS is tunnelled untouched.
+
+            Attributes:
+                hits (int): The number of requests served from the store.
+                misses (int): The number of requests that were not found in the store in replay mode.
+                recorded (int): The number of responses saved in record mode.
+
+            Raises:
+                ValueError: The mode is neither 'record' nor 'replay'.
+        """
+        if mode not in MODES:
+            raise ValueError(f"The proxy mode must be one of {', '.join(MODES)}, not '{mode}'")
+        self.store = ContentStore(storeDirectory)
+        self.mode = mode
+        self.matcher = matcher or RequestMatcher()
+        self.latency = latency
+        self.certificateAuthority = _CertificateAuthority(storeDirectory) \
+            if decryptHttps and _CertificateAuthority.is_available() else None
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        self.__server = ThreadingHTTPServer((host, port), _ProxyRequestHandler)
+        self.__server.daemon_threads = True
+        self.__server.replayProxy = self
+        self.__thread = None
+
+    @property
+    def address(self):
+        """
+            The 'host:port' the proxy listens on, e.g. for Chrome's --proxy-server argument.
+        """
+        host, port = self.__server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self):
+        """
+            Start serving in a background thread.
+        """
+        self.__thread = threading.Thread(target=self.__server.serve_forever, name="replay-proxy", daemon=True)
+        self.__thread.start()
+        customLogger.logger("INFO", "The replay proxy is listening on %s in %s mode", self.address, self.mode,
+                            event="replay_proxy")
+        return self
+
+    def stop(self):
+        """
+            Stop serving and log how many requests were recorded or served from the store.
+        """
+        self.__server.shutdown()
+        self.__server.server_close()
+        customLogger.logger("INFO", "The replay proxy stopped: %s recorded, %s hits, %s misses",
+                            self.recorded, self.hits, self.misses, event="replay_proxy")
+
+    def handle(self, method, url, headers, body):
+        """
+            Get the response to a request: from the origin (recording it) or from the store.
+
+            Returns:
+                tuple: (status, reason, headers as a list of (name, value), body).
+        """
+        key = self.matcher.get_key(method, url, headers, body)
+        if self.mode == RECORD:
+            return self.__record(key, method, url, headers, body)
+
+        entry, responseBody = self.store.get(key)
+        if entry is None:
+            self.misses += 1
+            return 404, "Not Recorded", [("Content-Type", "text/plain")], f"Not recorded: {method} {url}".encode("utf-8")
+        self.hits += 1
+        delay = entry.get("elapsed", 0.0) if self.latency == "recorded" else self.latency
+        if delay:
+            time.sleep(delay)
+        return entry["status"], entry["reason"], [tuple(header) for header in entry["headers"]], responseBody
+
+    def __record(self, key, method, url, headers, body):
+        """
+            Forward a request to the origin and save the response under the request key.
+        """
+        parts = urlsplit(url)
+        connectionClass = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        connection = connectionClass(parts.netloc, timeout=60)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        forwardedHeaders = {name: value for name, value in headers.items() if name not in HOP_BY_HOP_HEADERS}
+
+        startTime = time.perf_counter()
+        try:
+            connection.request(method, path, body=body or None, headers=forwardedHeaders)
+            response = connection.getresponse()
+            responseBody = response.read()
+        except OSError as e:
+            return 502, "Bad Gateway", [("Content-Type", "text/plain")], str(e).encode("utf-8")
+        finally:
+            connection.close()
+        elapsed = time.perf_counter() - startTime
+
+        responseHeaders = [(name, value) for name, value in response.getheaders() if name.lower() not in HOP_BY_HOP_HEADERS]
+        self.store.put(key, {"method": method, "url": url, "status": response.status, "reason": response.reason,
+                             "headers": responseHeaders, "elapsed": round(elapsed, 4)}, responseBody)
+        self.recorded += 1
+        return response.status, response.reason, responseHeaders, responseBody
+
+
+_sharedProxy = None
+_sharedProxyLock = threading.Lock()
+
+
+def get_shared_proxy():
+    """
+        Get the process-wide proxy configured by REPLAY_PROXY_MODE ('record' or 'replay'), starting it on first use.
+        Returns None when REPLAY_PROXY_MODE is not set.
+
+        REPLAY_PROXY_STORE sets the store directory (default: testData_/replayStore_), REPLAY_PROXY_LATENCY the added
+        latency in seconds or 'recorded', and REPLAY_PROXY_IGNORED_QUERY a comma-separated list of ignored query parameters.
+
+        Raises:
+            ValueError: REPLAY_PROXY_MODE is set to anything else than 'record' or 'replay'.
+    """
+    global _sharedProxy
+    mode = os.environ.get("REPLAY_PROXY_MODE")
+    if not mode:
+        return None
+    if mode not in MODES:
+        # A misspelt mode must not silently replay (and answer 404 to everything that was not recorded)
+        raise ValueError(f"REPLAY_PROXY_MODE must be one of {', '.join(MODES)}, not '{mode}'")
+    with _sharedProxyLock:
+        if _sharedProxy is None:
+            latency = os.environ.get("REPLAY_PROXY_LATENCY", "0")
+            ignoredQueryParameters = [name for name in os.environ.get("REPLAY_PROXY_IGNORED_QUERY", "").split(",") if name]
+            _sharedProxy = ReplayProxy(
+                os.environ.get("REPLAY_PROXY_STORE", os.path.join(projectPaths.get_root_directory(), "testData_", "replayStore_")),
+                mode=mode,
+                matcher=RequestMatcher(ignoredQueryParameters=ignoredQueryParameters),
+                latency=latency if latency == "recorded" else float(latency),
+            ).start()
+        return _sharedProxy
+
+
+def get_chrome_arguments():
+    """
+        Get the Chrome arguments routing the browser through the shared proxy, or an empty list if it is not enabled.
+    """
+    proxy = get_shared_proxy()
+    if proxy is None:
+        return []
+    return [f"--proxy-server=http://{proxy.address}", "--proxy-bypass-list=<-loopback>", "--ignore-certificate-errors"]
@@ -0,0 +1,274 @@
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from selenium.common.exceptions import WebDriverException
+
+from common_.utilities_ import customLogger, projectPaths
+
+RESOURCES_DIRECTORY = "resources_"
+# The recycling thresholds of a session, each set with its environment variable; unset or 0 means no limit
+THRESHOLDS = {
+    "rssMb": "RESOURCE_MAX_RSS_MB",
+    "jsHeapUsedMb": "RESOURCE_MAX_JS_HEAP_MB",
+    "domNodes": "RESOURCE_MAX_DOM_NODES",
+    "listeners": "RESOURCE_MAX_LISTENERS",
+}
+# The metrics checked for leaks in the summary, growing in most samples taken at the same point of the tests
+LEAK_METRICS = ("rssMb", "jsHeapUsedMb", "domNodes", "listeners", "documents")
+LEAK_MIN_SAMPLES = 4
+LEAK_MIN_GROWTH = 0.2
+
+# The Performance.getMetrics names of the sampled metrics, with the factor to the recorded unit
+_CDP_METRICS = {
+    "JSHeapUsedSize": ("jsHeapUsedMb", 1 / 1024 / 1024),
+    "JSHeapTotalSize": ("jsHeapTotalMb", 1 / 1024 / 1024),
+    "Nodes": ("domNodes", 1),
+    "JSEventListeners": ("listeners", 1),
+    "Documents": ("documents", 1),
+    "Frames": ("frames", 1),
+    "LayoutCount": ("layoutCount", 1),
+    "RecalcStyleCount": ("recalcStyleCount", 1),
+    "TaskDuration": ("taskSeconds", 1),
+}
+# The page metrics of browsers without the DevTools protocol
+_PAGE_METRICS_JS = """
+var memory = window.performance && window.performance.memory;
+return {
+    jsHeapUsedMb: memory ? memory.usedJSHeapSize / 1024 / 1024 : null,
+    jsHeapTotalMb: memory ? memory.totalJSHeapSize / 1024 / 1024 : null,
+    domNodes: document.getElementsByTagName('*').length,
+    frames: window.frames.length + 1
+};
+"""
+
+_series = {}
+_lock = threading.Lock()
+_runDirectory = None
+
+
+def is_enabled():
+    """
+        Check whether sessions are sampled: with RESOURCE_MONITOR=1 or any recycling threshold set.
+    """
+    return os.environ.get("RESOURCE_MONITOR", "") not in ("", "0") or bool(get_thresholds())
+
+
+def get_thresholds():
+    """
+        Get the recycling thresholds set in the environment, as {metric: limit}.
+    """
+    thresholds = {}
+    for metric, variable in THRESHOLDS.items():
+        limit = float(os.environ.get(variable, "0") or 0)
+        if limit > 0:
+            thresholds[metric] = limit
+    return thresholds
+
+
+def get_run_directory():
+    """
+        Get the directory the time series of this run are written to (one per process).
+    """
+    global _runDirectory
+    if _runDirectory is None:
+        runName = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_worker-{os.environ.get('WORKER_ID') or os.getpid()}"
+        _runDirectory = os.path.join(projectPaths.get_project_directory("reports_"), RESOURCES_DIRECTORY, runName)
+        os.makedirs(_runDirectory, exist_ok=True)
+    return _runDirectory
+
+
+def get_process_ids(rootProcessId):
+    """
+        Get the id of a process and of all its descendants from /proc (Linux only).
+    """
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as file:
+                # The command name in parentheses may contain spaces, the parent id is the second field after it
+                parentId = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parentId, []).append(int(entry))
+    processIds, pending = [], [rootProcessId]
+    while pending:
+        processId = pending.pop()
+        processIds.append(processId)
+        pending.extend(children.get(processId, ()))
+    return processIds
+
+
+def get_process_stats(driver):
+    """
+        Get the resident memory of the browser: the driver server process and every process it started (the browser,
+        its renderers and helpers). Shared pages are counted once per process, so the sum is an upper bound.
+
+        Returns:
+            dict: {'rssMb', 'processes'}, or an empty dict for remote sessions or outside Linux.
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None or not os.path.isdir("/proc"):
+        return {}
+    rssKb, processes = 0, 0
+    for processId in get_process_ids(process.pid):
+        try:
+            with open(f"/proc/{processId}/status", encoding="utf-8") as file:
+                for line in file:
+                    if line.startswith("VmRSS:"):
+                        rssKb += int(line.split()[1])
+                        break
+            processes += 1
+        except (OSError, ValueError):
+            continue
+    return {"rssMb": round(rssKb / 1024, 1), "processes": processes}
+
+
+def get_page_metrics(driver):
+    """
+        Get the JS heap, DOM node, document, frame and event listener counts of the current page with the DevTools
+        Performance.getMetrics, or the subset a script can read for browsers without the DevTools protocol.
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return {name: round(value, 1) for name, value in driver.execute_script(_PAGE_METRICS_JS).items() if value is not None}
+    driver.execute_cdp_cmd("Performance.enable", {})
+    metrics = {}
+    for metric in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]:
+        if metric["name"] in _CDP_METRICS:
+            name, factor = _CDP_METRICS[metric["name"]]
+            metrics[name] = round(metric["value"] * factor, 3 if name == "taskSeconds" else 1)
+    return metrics
+
+
+def sample(driver, testId, label, **details):
+    """
+        Sample the resources of a session and append them to its time series (reports_/resources_/<run>/<session>.jsonl).
+        A session that no longer answers is sampled for its process stats only.
+
+        Args:
+            driver: The raw WebDriver session.
+            testId (str): The test running in the session.
+            label (str): Where in the test the sample is taken: 'start', 'row' or 'end'.
+            details: Other fields of the sample, e.g. the row number.
+
+        Returns:
+            dict: The sample.
+    """
+    sessionId = driver.session_id
+    entry = {"time": round(time.time(), 3), "test": testId, "label": label, **details}
+    entry.update(get_process_stats(driver))
+    try:
+        entry.update(get_page_metrics(driver))
+    except WebDriverException as e:
+        customLogger.logger("WARNING", "Warning: The page metrics of the session %s could not be read: %s", sessionId, e)
+    with _lock:
+        series = _series.setdefault(sessionId, {"startTime": entry["time"], "tests": set(), "samples": [], "recycled": None})
+        entry["elapsed"] = round(entry["time"] - series["startTime"], 3)
+        series["tests"].add(testId)
+        series["samples"].append(entry)
+    with open(os.path.join(get_run_directory(), f"{sessionId}.jsonl"), "a", encoding="utf-8") as file:
+        file.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def get_exceeded_thresholds(entry, thresholds=None):
+    """
+        Get the thresholds a sample crossed, as readable strings (e.g. 'rssMb 2210.4 > 2000').
+    """
+    thresholds = get_thresholds() if thresholds is None else thresholds
+    return [f"{metric} {entry[metric]} > {limit:g}" for metric, limit in thresholds.items()
+            if entry.get(metric) is not None and entry[metric] > limit]
+
+
+def check_session(driver, testId, label, **details):
+    """
+        Sample a session and tell whether it crossed a threshold and should be recycled, which is logged.
+
+        Returns:
+            list: The crossed thresholds, empty if the session can be kept.
+    """
+    exceeded = get_exceeded_thresholds(sample(driver, testId, label, **details))
+    if exceeded:
+        with _lock:
+            _series[driver.session_id]["recycled"] = {"test": testId, "label": label, **details, "reasons": exceeded}
+        customLogger.logger("WARNING", "Warning: The session %s is recycled after %s (%s): %s", driver.session_id, testId,
+                            label, ", ".join(exceeded), event="session_recycled", session=driver.session_id,
+                            test=testId, label=label, reasons=exceeded, **details)
+    return exceeded
+
+
+def find_leaks(samples):
+    """
+        Find the metrics of a time series that keep growing: compared between samples with the same label (so the
+        start of every test is compared with the start of the others), a metric is a leak suspect when it grew in at
+        least three quarters of the steps and by LEAK_MIN_GROWTH overall.
+
+        Returns:
+            dict: {metric: {'first', 'last', 'growthPerSample'}}
+    """
+    byLabel = {}
+    for entry in samples:
+        byLabel.setdefault(entry["label"], []).append(entry)
+    leaks = {}
+    for entries in byLabel.values():
+        if len(entries) < LEAK_MIN_SAMPLES:
+            continue
+        for metric in LEAK_METRICS:
+            values = [entry[metric] for entry in entries if entry.get(metric) is not None]
+            if len(values) < LEAK_MIN_SAMPLES or metric in leaks:
+                continue
+            increases = sum(1 for before, after in zip(values, values[1:]) if after > before)
+            if increases >= 0.75 * (len(values) - 1) and values[-1] > values[0] * (1 + LEAK_MIN_GROWTH):
+                leaks[metric] = {"first": values[0], "last": values[-1],
+                                 "growthPerSample": round((values[-1] - values[0]) / (len(values) - 1), 3)}
+    return leaks
+
+
+def get_summary():
+    """
+        Get the summary of every sampled session: its samples, tests, first, last and peak values, leak suspects and
+        the reason it was recycled.
+    """
+    with _lock:
+        sessions = {sessionId: {**series, "tests": sorted(series["tests"]), "samples": list(series["samples"])}
+                    for sessionId, series in _series.items()}
+    summary = {}
+    for sessionId, series in sessions.items():
+        samples = series["samples"]
+        metrics = sorted({name for entry in samples for name, value in entry.items() if isinstance(value, (int, float))}
+                         - {"time", "elapsed", "row"})
+        summary[sessionId] = {
+            "samples": len(samples),
+            "tests": len(series["tests"]),
+            "seconds": samples[-1]["elapsed"],
+            "first": {name: samples[0].get(name) for name in metrics},
+            "last": {name: samples[-1].get(name) for name in metrics},
+            "peak": {name: max(entry[name] for entry in samples if entry.get(name) is not None) for name in metrics},
+            "leakSuspects": find_leaks(samples),
+            "recycled": series["recycled"],
+        }
+    return summary
+
+
+@atexit.register
+def _write_summary_at_exit():
+    """
+        Write the summary next to the time series and log the leak suspects, if any session was sampled.
+    """
+    if not _series:
+        return
+    summary = get_summary()
+    fileName = os.path.join(get_run_directory(), "summary.json")
+    with open(fileName, "w", encoding="utf-8") as file:
+        json.dump(summary, file, indent=2)
+    for sessionId, session in summary.items():
+        if session["leakSuspects"]:
+            customLogger.logger("WARNING", "Warning: The session %s may leak: %s", sessionId, session["leakSuspects"],
+                                event="resource_leak", session=sessionId, leaks=session["leakSuspects"])
+    customLogger.logger("INFO", "The resource usage of %s sessions was written to %s", len(summary), fileName,
+                        event="resource_summary")
@@ -0,0 +1,188 @@
+import ast
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+from common_.utilities_ import fileLock, projectPaths
+
+CACHE_FILE = "resultCache.json"
+# The project packages whose changes can change a test's result, the framework (common_) included
+TRACKED_PACKAGES = ("tests_", "pages_", "apiClients_", "testData_", "common_")
+# Data files a test names in its source, e.g. run_for_each_row("zipCodes.csv", ...)
+DATA_FILE_PATTERN = re.compile(r"""["']([\w./-]+\.(?:csv|jsonl|json))["']""")
+
+
+def _get_cache_file():
+    return os.path.join(projectPaths.get_project_directory("reports_"), CACHE_FILE)
+
+
+def _load(fileName):
+    try:
+        with open(fileName, encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def load_cache():
+    """
+        Load the cached results: {testId: {"key": ..., "status": ..., "time": ...}}.
+    """
+    fileName = _get_cache_file()
+    # Parallel runners read and write the cache one at a time
+    with fileLock.locked(fileName):
+        return _load(fileName)
+
+
+def save_results(results, keys):
+    """
+        Merge the results of a run into the cache, under the input hashes the tests ran with.
+        The cache is read, updated and replaced atomically under the lock, so concurrent runs do not lose entries.
+    """
+    # A test with failed sub-tests is reported once per failed sub-test; the test keeps its worst status
+    severity = {"passed": 0, "skipped": 1, "failed": 2, "error": 3}
+    statuses = {}
+    for result in results:
+        testId = result["id"].split(" ")[0]
+        if testId in keys and severity[result["status"]] >= severity[statuses.get(testId, "passed")]:
+            statuses[testId] = result["status"]
+
+    fileName = _get_cache_file()
+    now = datetime.now().isoformat(timespec="seconds")
+    with fileLock.locked(fileName):
+        cache = _load(fileName)
+        for testId, status in statuses.items():
+            cache[testId] = {"key": keys[testId], "status": status, "time": now}
+        temporaryFileName = f"{fileName}.{os.getpid()}.tmp"
+        with open(temporaryFileName, "w", encoding="utf-8") as file:
+            json.dump(cache, file, indent=2, sort_keys=True)
+        os.replace(temporaryFileName, fileName)
+
+
+def get_site_fingerprint():
+    """
+        Get a fingerprint of the site the tests run against: SITE_FINGERPRINT if it is set, the recorded responses
+        when the record/replay proxy replays, or None for the live site (then only the code is compared).
+    """
+    if os.environ.get("SITE_FINGERPRINT"):
+        return os.environ["SITE_FINGERPRINT"]
+    if os.environ.get("REPLAY_PROXY_MODE") != "replay":
+        return None
+    storeDirectory = os.environ.get("REPLAY_PROXY_STORE", os.path.join(projectPaths.get_root_directory(), "testData_", "replayStore_"))
+    entriesDirectory = os.path.join(storeDirectory, "entries")
+    if not os.path.isdir(entriesDirectory):
+        return None
+    digest = hashlib.sha256()
+    for fileName in sorted(os.listdir(entriesDirectory)):
+        digest.update(fileName.encode("utf-8"))
+        digest.update(str(os.path.getsize(os.path.join(entriesDirectory, fileName))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class InputHasher:
+    def __init__(self, siteFingerprint=None):
+        """
+            Initialize the hasher of test inputs. File hashes and module imports are computed once per run.
+        """
+        self.siteFingerprint = siteFingerprint
+        self.rootDirectory = projectPaths.get_root_directory()
+        self.__fileHashes = {}
+        self.__moduleFiles = {}
+
+    def __hash_file(self, path):
+        if path not in self.__fileHashes:
+            with open(path, "rb") as file:
+                self.__fileHashes[path] = hashlib.sha256(file.read()).hexdigest()
+        return self.__fileHashes[path]
+
+    def __get_module_file(self, moduleName):
+        """
+            Get the source file of a tracked project module, or None.
+        """
+        if moduleName.split(".")[0] not in TRACKED_PACKAGES:
+            return None
+        path = self.rootDirectory.joinpath(*moduleName.split(".")).with_suffix(".py")
+        return path if path.is_file() else None
+
+    def __get_imported_files(self, path):
+        """
+            Get the tracked project files a module imports, directly or through other tracked modules.
+        """
+        if path in self.__moduleFiles:
+            return self.__moduleFiles[path]
+        self.__moduleFiles[path] = files = {path}
+        with open(path, encoding="utf-8") as file:
+            tree = ast.parse(file.read(), str(path))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                moduleNames = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                # 'from package import name' may import a module or a name defined in the package
+                moduleNames = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for moduleName in moduleNames:
+                moduleFile = self.__get_module_file(moduleName)
+                if moduleFile is not None:
+                    files |= self.__get_imported_files(moduleFile)
+        return files
+
+    def __get_data_files(self, path):
+        with open(path, encoding="utf-8") as file:
+            names = DATA_FILE_PATTERN.findall(file.read())
+        dataFiles = (self.rootDirectory / "testData_" / name for name in names)
+        return {dataFile for dataFile in dataFiles if dataFile.is_file()}
+
+    def get_key(self, testId):
+        """
+            Get the hash of everything the result of a test depends on: its module, the tracked modules it imports
+            (page objects, test data, base classes, framework utilities), the data files it names and the site fingerprint.
+            Returns None if the module of the test cannot be found.
+        """
+        parts = testId.split(".")
+        for index in range(len(parts), 0, -1):
+            testFile = self.__get_module_file(".".join(parts[:index]))
+            if testFile is not None:
+                break
+        else:
+            return None
+        files = set(self.__get_imported_files(testFile))
+        for moduleFile in list(files):
+            files |= self.__get_data_files(moduleFile)
+        digest = hashlib.sha256(f"{testId}\n{self.siteFingerprint}\n".encode("utf-8"))
+        for path in sorted(files):
+            digest.update(f"{path.relative_to(self.rootDirectory).as_posix()} {self.__hash_file(path)}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+
+def plan_run(testIds, mode="skip", siteFingerprint=None):
+    """
+        Decide which tests to run from the cached results.
+
+        Args:
+            testIds (list): The tests to plan.
+            mode (str): 'skip' leaves out the tests whose inputs are unchanged and that passed last time, 'last' runs
+                them after all other tests.
+            siteFingerprint (str): The fingerprint of the target site, see get_site_fingerprint.
+
+        Returns:
+            dict: 'run' (the tests to run, the ones that failed last time first), 'failedFirst' (those failed tests),
+                'cached' (the tests left out) and 'keys' (the input hash of every test).
+    """
+    hasher = InputHasher(siteFingerprint)
+    cache = load_cache()
+    keys = {testId: hasher.get_key(testId) for testId in testIds}
+    failed, changed, unchanged = [], [], []
+    for testId in testIds:
+        entry = cache.get(testId)
+        if entry is not None and entry["status"] in ("failed", "error"):
+            failed.append(testId)
+        elif entry is not None and keys[testId] is not None and entry["key"] == keys[testId] and entry["status"] == "passed":
+            unchanged.append(testId)
+        else:
+            changed.append(testId)
+    if mode == "last":
+        return {"run": failed + changed + unchanged, "failedFirst": failed, "cached": [], "keys": keys}
+    return {"run": failed + changed, "failedFirst": failed, "cached": unchanged, "keys": keys}
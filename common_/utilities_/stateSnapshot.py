@@ -0,0 +1,130 @@
+import json
+import os
+import time
+from urllib.parse import urlsplit
+
+from common_.utilities_ import customLogger, projectPaths
+
+SNAPSHOTS_DIRECTORY = "snapshots_"
+DEFAULT_MAX_AGE_SECONDS = 3600
+
+READ_STORAGE_JS = """
+function read(storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) { items[storage.key(i)] = storage.getItem(storage.key(i)); }
+    return items;
+}
+return {localStorage: read(window.localStorage), sessionStorage: read(window.sessionStorage)};
+"""
+
+# Seeds the storage of the snapshot's origin before any page script runs, then does nothing on later documents
+WRITE_STORAGE_JS = """
+(function (origin, state) {
+    if (window.location.origin !== origin || window.sessionStorage.getItem('__stateSnapshotInjected')) { return; }
+    Object.keys(state.localStorage).forEach(function (key) { window.localStorage.setItem(key, state.localStorage[key]); });
+    Object.keys(state.sessionStorage).forEach(function (key) { window.sessionStorage.setItem(key, state.sessionStorage[key]); });
+    window.sessionStorage.setItem('__stateSnapshotInjected', '1');
+})(%s, %s);
+"""
+
+
+def _get_snapshot_file(name):
+    """
+        Get the file of a named snapshot in testData_/snapshots_/.
+    """
+    return os.path.join(projectPaths.get_project_directory(os.path.join("testData_", SNAPSHOTS_DIRECTORY)), f"{name}.json")
+
+
+def capture_state(driver):
+    """
+        Capture the cookies, localStorage and sessionStorage of the current page.
+    """
+    state = driver.execute_script(READ_STORAGE_JS)
+    parts = urlsplit(driver.current_url)
+    state.update({"url": driver.current_url, "origin": f"{parts.scheme}://{parts.netloc}", "cookies": driver.get_cookies(),
+                  "createdAt": time.time()})
+    return state
+
+
+def save_snapshot(name, state):
+    """
+        Save a captured state as a named fixture.
+    """
+    fileName = _get_snapshot_file(name)
+    temporaryFileName = f"{fileName}.{os.getpid()}.tmp"
+    with open(temporaryFileName, "w", encoding="utf-8") as file:
+        json.dump(state, file, indent=2)
+    os.replace(temporaryFileName, fileName)
+
+
+def load_snapshot(name, maxAgeSeconds=DEFAULT_MAX_AGE_SECONDS):
+    """
+        Load a named snapshot, or None if there is none or it is older than maxAgeSeconds.
+    """
+    try:
+        with open(_get_snapshot_file(name), encoding="utf-8") as file:
+            state = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if time.time() - state["createdAt"] > maxAgeSeconds:
+        customLogger.logger("INFO", "The state snapshot '%s' is outdated and will be rebuilt", name, event="state_snapshot")
+        return None
+    return state
+
+
+def inject_state(driver, state, url=None):
+    """
+        Put a captured state into the browser and load the URL (the snapshot's URL by default).
+        With the DevTools protocol this takes a single navigation: cookies are set for their domains without visiting
+        them and the storage is seeded by a script that runs before the page's own scripts.
+        Other drivers visit the origin first to set the cookies and the storage.
+    """
+    url = url or state["url"]
+    if hasattr(driver, "execute_cdp_cmd"):
+        cookies = []
+        for cookie in state["cookies"]:
+            cdpCookie = {key: cookie[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")
+                         if key in cookie}
+            if "expiry" in cookie:
+                cdpCookie["expires"] = cookie["expiry"]
+            cookies.append(cdpCookie)
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        script = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                                        {"source": WRITE_STORAGE_JS % (json.dumps(state["origin"]), json.dumps(state))})
+        try:
+            driver.get(url)
+        finally:
+            driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script["identifier"]})
+        return
+
+    driver.get(state["origin"])
+    for cookie in state["cookies"]:
+        driver.add_cookie(cookie)
+    driver.execute_script(
+        "var state = arguments[0];"
+        "Object.keys(state.localStorage).forEach(function (key) { localStorage.setItem(key, state.localStorage[key]); });"
+        "Object.keys(state.sessionStorage).forEach(function (key) { sessionStorage.setItem(key, state.sessionStorage[key]); });",
+        state)
+    driver.get(url)
+
+
+def apply_snapshot(driver, name, builder, maxAgeSeconds=DEFAULT_MAX_AGE_SECONDS, url=None):
+    """
+        Bring the browser to the state of a named precondition: inject the saved snapshot if it is fresh enough,
+        otherwise run the builder (the UI steps of the precondition) and save the resulting state for the next tests.
+
+        Returns:
+            bool: True if the snapshot was injected, False if the builder had to run.
+    """
+    state = load_snapshot(name, maxAgeSeconds)
+    if state is not None:
+        inject_state(driver, state, url)
+        customLogger.logger("INFO", "The state snapshot '%s' was injected", name, event="state_snapshot", snapshot=name,
+                            injected=True)
+        return True
+
+    builder(driver)
+    save_snapshot(name, capture_state(driver))
+    customLogger.logger("INFO", "The state snapshot '%s' was built through the UI and saved", name, event="state_snapshot",
+                        snapshot=name, injected=False)
+    return False
@@ -0,0 +1,111 @@
+import time
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+from common_.utilities_ import commandTimer
+
+# The time budget of one page object step (e.g. NavigationBar.click_update_location_button), shared by all its waits
+STEP_TIMEOUT = 10
+# The budget of negative checks ("is it there?") that should not wait for an element that is not coming
+QUICK_CHECK_TIMEOUT = 2
+INITIAL_POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 0.5
+POLL_BACKOFF = 1.5
+
+_waitSeconds = {}
+
+
+def get_wait_seconds(driver):
+    """
+        Get the total time spent in waits of the driver's session since the last reset.
+    """
+    return _waitSeconds.get(driver.session_id, 0.0)
+
+
+def add_wait_seconds(driver, seconds):
+    """
+        Add time spent waiting outside the engine (e.g. in an in-browser wait) to the driver's session.
+    """
+    _waitSeconds[driver.session_id] = _waitSeconds.get(driver.session_id, 0.0) + seconds
+
+
+def reset_wait_seconds(driver):
+    """
+        Reset the wait time of the driver's session, e.g. at the start of a test.
+    """
+    _waitSeconds[driver.session_id] = 0.0
+
+
+class WaitEngine:
+    def __init__(self, driver, stepTimeout=STEP_TIMEOUT):
+        """
+            Initialize the wait engine used by all BasePage waits.
+
+            Args:
+                driver (webdriver.Chrome): The WebDriver instance the conditions are checked against.
+                stepTimeout (float): The time budget of one page object step. All waits of the same step share it, so a
+                    find followed by a clickability check can not wait twice as long as the step is allowed to.
+        """
+        self.driver = driver
+        self.stepTimeout = stepTimeout
+
+    def __get_deadline(self, timeout):
+        """
+            Get the deadline of a wait: the requested timeout, capped by what is left of the current step's budget.
+        """
+        now = time.perf_counter()
+        stepStartTime = commandTimer.get_step_start_time()
+        if stepStartTime is None:
+            return now + timeout
+        return min(now + timeout, stepStartTime + self.stepTimeout)
+
+    def until(self, condition, timeout=STEP_TIMEOUT, message="", ignoredExceptions=(NoSuchElementException,)):
+        """
+            Wait until the condition returns a truthy value and return it.
+            The condition is checked immediately, then polled at an interval that starts at 50 ms and backs off to 500 ms,
+            so fast conditions return without the fixed polling slack of WebDriverWait.
+            Like WebDriverWait, only NoSuchElementException is ignored by default.
+
+            Raises:
+                TimeoutException: If the condition is still not met at the deadline.
+        """
+        startTime = time.perf_counter()
+        deadline = self.__get_deadline(timeout)
+        interval = INITIAL_POLL_INTERVAL
+        try:
+            while True:
+                try:
+                    value = condition(self.driver)
+                    if value:
+                        return value
+                except ignoredExceptions:
+                    pass
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutException(message or f"The condition was not met within {timeout} s")
+                time.sleep(min(interval, remaining))
+                interval = min(interval * POLL_BACKOFF, MAX_POLL_INTERVAL)
+        finally:
+            add_wait_seconds(self.driver, time.perf_counter() - startTime)
+
+    def is_met(self, condition, timeout=QUICK_CHECK_TIMEOUT):
+        """
+            Check if the condition is met within the (short, by default) timeout, without raising.
+        """
+        try:
+            return bool(self.until(condition, timeout))
+        except TimeoutException:
+            return False
+
+    def expect_absent(self, locator, timeout=QUICK_CHECK_TIMEOUT):
+        """
+            Check that the element is not visible. Returns True as soon as it is absent or hidden (usually on the first
+            check), and False if it is still visible at the deadline.
+        """
+        def is_absent(driver):
+            elements = driver.find_elements(*locator)
+            return not elements or not elements[0].is_displayed()
+        try:
+            return bool(self.until(is_absent, timeout, ignoredExceptions=(NoSuchElementException, StaleElementReferenceException)))
+        except TimeoutException:
+            return False
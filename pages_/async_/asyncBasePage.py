@@ -0,0 +1,216 @@
+import asyncio
+
+from selenium.common.exceptions import ElementClickInterceptedException, JavascriptException, TimeoutException
+
+from common_.utilities_ import commandTimer, customLogger
+from common_.utilities_.waitEngine import QUICK_CHECK_TIMEOUT
+from pages_.basePage import FIND_ELEMENTS_JS, MAX_ASYNC_WAIT_SECONDS, RESOLVE_LOCATORS_JS, WAIT_FOR_DOM_CHANGE_JS
+
+# Resolves with the first element of the locator once it meets the condition ('present', 'visible', 'clickable'),
+# with true once it is gone ('absent'), or with null at the timeout. Checked on every DOM change and every 100 ms.
+WAIT_FOR_ELEMENT_JS = FIND_ELEMENTS_JS + """
+var by = arguments[0], value = arguments[1], condition = arguments[2], timeoutMs = arguments[3],
+    done = arguments[arguments.length - 1];
+
+function isVisible(element) {
+    var style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity || '1') > 0 &&
+        element.getClientRects().length > 0;
+}
+
+function check() {
+    var element = findElements(by, value)[0];
+    switch (condition) {
+        case 'present': return element || null;
+        case 'visible': return element && isVisible(element) ? element : null;
+        case 'clickable': return element && isVisible(element) && !element.disabled ? element : null;
+        case 'absent': return !element || !isVisible(element) ? true : null;
+    }
+    return null;
+}
+
+var result = check();
+if (result) { done(result); return; }
+var finished = false;
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearInterval(poller);
+    clearTimeout(timer);
+    done(result);
+}
+function recheck() { var result = check(); if (result) { finish(result); } }
+var observer = new MutationObserver(recheck);
+observer.observe(document.documentElement, {subtree: true, childList: true, attributes: true});
+// Style changes through stylesheets or animations are not mutations
+var poller = setInterval(recheck, 100);
+var timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+# Resolves with true once the given element is visible and enabled, or with false at the timeout
+WAIT_FOR_CLICKABLE_JS = """
+var element = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var deadline = Date.now() + timeoutMs;
+(function check() {
+    var style = window.getComputedStyle(element);
+    var isClickable = !element.disabled && style.visibility !== 'hidden' && style.display !== 'none' &&
+        element.getClientRects().length > 0;
+    if (isClickable || Date.now() > deadline) { done(isClickable); } else { setTimeout(check, 50); }
+})();
+"""
+
+
+@commandTimer.register_step_class
+class AsyncBasePage:
+    """
+        The asyncio counterpart of BasePage, for page objects driven by an AsyncWebDriver session.
+        Every wait is a single in-browser script (MutationObserver) instead of a polling loop, so one event loop can
+        drive many sessions. Failures raise the Selenium exceptions instead of exiting, since exiting would end every
+        session of the loop; they are logged like in BasePage.
+    """
+    # The sync page object whose registered locators this page uses, see locatorRegistry
+    locators = {}
+
+    def __init__(self, driver):
+        """
+            Initialize the AsyncBasePage with an AsyncWebDriver session.
+        """
+        self.driver = driver
+
+    async def __wait_for_element(self, locator, condition, timeout):
+        """
+            Wait in the browser until the element of the locator meets the condition, in slices of at most
+            MAX_ASYNC_WAIT_SECONDS (below the session's script timeout).
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            try:
+                result = await self.driver.execute_async_script(WAIT_FOR_ELEMENT_JS, locator[0], locator[1], condition,
+                                                                int(max(min(remaining, MAX_ASYNC_WAIT_SECONDS), 0) * 1000))
+            except JavascriptException as e:
+                # The page was reloaded while the script was waiting, so wait on the new document
+                if "unloaded" not in str(e) and "context" not in str(e):
+                    raise
+                result = None
+            if result or deadline - loop.time() <= 0:
+                return result
+
+    async def _find_element(self, locator, timeout=10, condition="visible"):
+        """
+            Find and return a web element based on the provided locator, waiting for a specified condition
+            ('present', 'visible' or 'clickable').
+        """
+        element = await self.__wait_for_element(locator, condition, timeout)
+        if element is None:
+            customLogger.logger("ERROR", f"Error: Timeout waiting for element: {locator} is not {condition} after {timeout} s")
+            raise TimeoutException(f"The element {locator} is not {condition} after {timeout} s")
+        return element
+
+    async def _find_elements(self, locator, timeout=10):
+        """
+            Find and return all elements of the locator once at least one of them is present.
+        """
+        await self._find_element(locator, timeout, "present")
+        return await self.driver.find_elements(*locator)
+
+    async def _is_element_visible(self, locator, timeout=10):
+        """
+            Check if an element identified by the given locator is visible within a specified time.
+        """
+        if await self.__wait_for_element(locator, "visible", timeout):
+            return True
+        customLogger.logger("WARNING", "Warning: Element was not visible within the specified time.")
+        return False
+
+    async def _is_element_absent(self, locator, timeout=QUICK_CHECK_TIMEOUT):
+        """
+            Check if an element identified by the given locator is missing or hidden, returning as soon as it is.
+        """
+        return bool(await self.__wait_for_element(locator, "absent", timeout))
+
+    async def _fill_field(self, element, text):
+        """
+            Fill a text input field with the provided text after clearing its current content.
+        """
+        await element.clear()
+        await element.send_keys(text)
+
+    async def _fill_field_and_apply(self, element, text, key):
+        """
+            Fill a form field with text and apply a key action.
+        """
+        await self._fill_field(element, text)
+        await element.send_keys(key)
+
+    async def _get_element_text(self, element):
+        """
+            Get the text content of a web element.
+        """
+        return await element.get_text()
+
+    async def _click_to_element(self, element, timeout=10):
+        """
+            Perform a click on a web element after ensuring it is clickable (enabled and displayed).
+        """
+        if not await self.driver.execute_async_script(WAIT_FOR_CLICKABLE_JS, element, int(min(timeout, MAX_ASYNC_WAIT_SECONDS) * 1000)):
+            customLogger.logger("ERROR", "Error: Timeout waiting for the element to be clickable")
+            raise TimeoutException("The element was not clickable in time")
+        try:
+            await element.click()
+        except ElementClickInterceptedException as e:
+            customLogger.logger("ERROR", f"Error: Element is not clickable due to interception: {str(e)}")
+            raise
+
+    async def _mouse_move_to_element(self, element):
+        """
+            Move the mouse cursor to a specified element on the web page.
+        """
+        await self.driver.execute("POST", "/actions", {"actions": [{
+            "type": "pointer", "id": "mouse", "parameters": {"pointerType": "mouse"},
+            "actions": [{"type": "pointerMove", "duration": 0, "origin": element.to_json(), "x": 0, "y": 0}]}]})
+
+    async def _wait_for_dom_change(self, locator, expected=None, match="changed", attribute=None, initial=None, timeout=10):
+        """
+            Wait until the text (or the given attribute) of an element changes or matches the expected value, with the
+            MutationObserver script of BasePage._wait_for_dom_change.
+
+            Returns:
+                str: The value that satisfied the condition, or the last observed value if the deadline was reached.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        current = initial
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                customLogger.logger("WARNING", "Warning: The element %s did not change as expected (%s %s) within %s s",
+                                    locator, match, expected, timeout)
+                return current
+            try:
+                result = await self.driver.execute_async_script(WAIT_FOR_DOM_CHANGE_JS, locator[0], locator[1], match, expected,
+                                                                attribute, initial if match == "changed" else None,
+                                                                int(min(remaining, MAX_ASYNC_WAIT_SECONDS) * 1000))
+            except JavascriptException as e:
+                if "unloaded" not in str(e) and "context" not in str(e):
+                    raise
+                continue
+            current = result["value"]
+            if result["matched"]:
+                return current
+
+    async def _resolve_locators(self, locators, attributes=()):
+        """
+            Resolve many locators in a single script call, see BasePage._resolve_locators.
+        """
+        names = list(locators)
+        results = await self.driver.execute_script(RESOLVE_LOCATORS_JS, [list(locators[name]) for name in names], list(attributes))
+        return dict(zip(names, results))
+
+    async def _snapshot_locators(self, attributes=()):
+        """
+            Resolve the whole locator set of the page object in one round trip.
+        """
+        return await self._resolve_locators(self.locators, attributes)
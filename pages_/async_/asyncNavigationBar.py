@@ -0,0 +1,146 @@
+from selenium.webdriver.common.keys import Keys
+
+from common_.utilities_ import locatorRegistry
+from pages_.async_.asyncBasePage import AsyncBasePage
+from pages_.navigationBar_.navigationBar import NavigationBar
+
+
+class AsyncNavigationBar(AsyncBasePage):
+    """
+        The asyncio counterpart of NavigationBar, with the same locators.
+    """
+    locators = locatorRegistry.get_page_locators(NavigationBar)
+
+    async def __click(self, name):
+        element = await self._find_element(self.locators[name])
+        await self._click_to_element(element)
+
+    async def __get_nav_bar_element_text_(self, name):
+        """
+            Gets the text of an element by its locator name, in one round trip when it is already visible.
+        """
+        resolved = (await self._resolve_locators({"element": self.locators[name]}))["element"]
+        if resolved["visible"]:
+            return resolved["text"]
+        element = await self._find_element(self.locators[name])
+        return await self._get_element_text(element)
+
+    async def get_hello_username_text_from_accounts_and_lists(self):
+        """
+            Gets the "Hello {current_user_name}" text from the navigation bar's accounts and lists section.
+        """
+        return await self.__get_nav_bar_element_text_("usernameFromAccountsAndLists")
+
+    async def get_delivery_country_text_from_location_change_button(self):
+        """
+            Gets the delivery country name from the navigation bar's 'deliver to' section.
+        """
+        return await self.__get_nav_bar_element_text_("deliveryCountry")
+
+    async def wait_for_delivery_country_text_change(self, expectedText=None, match="contains", initialText=None, timeout=10):
+        """
+            Waits until the delivery country text of the 'deliver to' section matches the expected text, or differs from
+            initialText (by default, the text when the wait starts) if no text is given, and returns it.
+        """
+        if expectedText is None:
+            return await self._wait_for_dom_change(self.locators["deliveryCountry"], initial=initialText, timeout=timeout)
+        return await self._wait_for_dom_change(self.locators["deliveryCountry"], expectedText, match, timeout=timeout)
+
+    async def get_nav_bar_snapshot(self, attributes=()):
+        """
+            Gets the existence, visibility, text and the given attributes of every navigation bar element in one round trip.
+        """
+        return await self._snapshot_locators(attributes)
+
+    async def click_home_page_logo(self):
+        """
+            Clicks on the Amazon logo(home page)
+        """
+        await self.__click("homePageLogo")
+
+    async def click_update_location_button(self):
+        """
+            Clicks on the update location(deliver to) button
+        """
+        await self.__click("updateLocationButton")
+
+    async def is_update_location_button_visible(self, timeout=10):
+        """
+            Checks if the update location(deliver to) button is visible.
+        """
+        return await self._is_element_visible(self.locators["updateLocationButton"], timeout)
+
+    async def click_search_filters_dropdown(self):
+        """
+            Clicks on the search categories(filter) dropdown button.
+        """
+        await self.__click("searchFiltersDropdown")
+
+    async def fill_search_field(self, searchText):
+        """
+            Fills the search field with the provided text
+        """
+        searchFieldElement = await self._find_element(self.locators["searchField"])
+        await self._fill_field(searchFieldElement, searchText)
+
+    async def fill_search_field_and_apply(self, searchText):
+        """
+            Fills the search field with the provided text and applies it by pressing the ENTER key on the keyboard.
+        """
+        searchFieldElement = await self._find_element(self.locators["searchField"])
+        await self._fill_field_and_apply(searchFieldElement, searchText, Keys.ENTER)
+
+    async def click_search_button(self):
+        """
+            Clicks on the search button
+        """
+        await self.__click("searchButton")
+
+    async def click_language_change_dropdown(self):
+        """
+            Clicks on the languages dropdown.
+        """
+        await self.__click("languageChangeDropdown")
+
+    async def hover_over_language_change_dropdown(self):
+        """
+            Hovering over the language dropdown list.
+        """
+        await self._mouse_move_to_element(await self._find_element(self.locators["languageChangeDropdown"]))
+
+    async def click_account_lists_dropdown(self):
+        """
+            Clicks on the Account & Lists dropdown.
+        """
+        await self.__click("accountListsDropdown")
+
+    async def hover_over_account_lists_dropdown(self):
+        """
+            Hovering over the Account & Lists dropdown list.
+        """
+        await self._mouse_move_to_element(await self._find_element(self.locators["accountListsDropdown"]))
+
+    async def click_return_and_orders_button(self):
+        """
+            Clicks on the Returns & Orders button.
+        """
+        await self.__click("returnAndOrdersButton")
+
+    async def click_cart_button(self):
+        """
+            Clicks on the Cart button.
+        """
+        await self.__click("cartButton")
+
+    async def get_cart_products_quantity(self):
+        """
+            Gets the quantity from the Cart button.
+        """
+        productsQuantityElement = await self._find_element(self.locators["cartButtonQuantity"])
+        return int(await self._get_element_text(productsQuantityElement))
+
+    async def click_hamburger_menu_button(self):
+        """
+            Clicks on the hamburger menu button.
+        """
+        await self.__click("hamburgerMenuButton")
@@ -0,0 +1,124 @@
+from common_.utilities_ import locatorRegistry
+from common_.utilities_.waitEngine import QUICK_CHECK_TIMEOUT
+from pages_.async_.asyncBasePage import AsyncBasePage
+from pages_.navigationBar_.updateDeliveryLocationPopup import UpdateDeliveryLocationPopup
+
+
+class AsyncUpdateDeliveryLocationPopup(AsyncBasePage):
+    """
+        The asyncio counterpart of UpdateDeliveryLocationPopup, with the same locators.
+    """
+    locators = locatorRegistry.get_page_locators(UpdateDeliveryLocationPopup)
+
+    async def __click(self, name):
+        element = await self._find_element(self.locators[name])
+        await self._click_to_element(element)
+
+    async def __get_text(self, name):
+        element = await self._find_element(self.locators[name])
+        return await self._get_element_text(element)
+
+    async def fill_zip_code_field(self, zipCode):
+        """
+            Fills the zip code field with the provided text
+        """
+        zipCodeFieldElement = await self._find_element(self.locators["zipCodeField"])
+        await self._fill_field(zipCodeFieldElement, zipCode)
+
+    async def click_apply_button(self):
+        """
+            Clicks on the apply button.
+        """
+        await self.__click("applyButton")
+
+    async def click_continue_button(self):
+        """
+            Clicks on the continue button.
+        """
+        await self.__click("continueButton")
+
+    async def open_country_dropdown(self):
+        """
+            Opens a country drop-down list by clicking on it, but before opening, clicks the pop-up title to clear the default selection.
+        """
+        await self.__click("popupTitle")
+        await self.__click("countryDropdown")
+
+    async def select_country_from_dropdown(self):
+        """
+            Clicks on the 17's item from the countries list.
+        """
+        await self.__click("countryItem")
+
+    async def click_done_button(self):
+        """
+            Clicks on the Done button.
+        """
+        await self.__click("doneButton")
+
+    async def click_change_button(self):
+        """
+            Clicks on the Change button, but before clicking, it clicks the pop-up title to clear the default selection.
+        """
+        await self.__click("popupTitle")
+        await self.__click("changeButton")
+
+    async def check_the_change_button_existence(self, timeout=QUICK_CHECK_TIMEOUT):
+        """
+            Checks if the Change button is visible, waiting only for a short time.
+        """
+        return await self._is_element_visible(self.locators["changeButton"], timeout)
+
+    async def click_sign_in_to_see_address_button(self):
+        """
+            Clicks on the "Sign in to see your addresses" button
+        """
+        await self.__click("signInToSeeAddressButton")
+
+    async def click_manage_address_book_button(self):
+        """
+            Clicks on the "Manage address book" button.
+        """
+        await self.__click("manageAddressBookButton")
+
+    async def get_country_dropdown_placeholder_text(self):
+        """
+            Gets the text from the countries dropdown.
+        """
+        return await self.__get_text("countryDropdownPlaceholder")
+
+    async def get_delivery_country_name(self):
+        """
+            Gets the delivery country name from the navigation bar.
+        """
+        return await self.__get_text("deliveryCountryName")
+
+    async def wait_for_delivery_country_name(self, expectedText=None, match="contains", timeout=10):
+        """
+            Waits until the delivery country name in the navigation bar matches the expected text (or changes, if no text
+            is given) and returns it. Returns the last seen name if it was not updated within the timeout.
+        """
+        return await self._wait_for_dom_change(self.locators["deliveryCountryName"], expectedText,
+                                               match if expectedText is not None else "changed", timeout=timeout)
+
+    async def get_popup_snapshot(self, attributes=()):
+        """
+            Gets the existence, visibility, text and the given attributes of every popup element in one round trip.
+        """
+        return await self._snapshot_locators(attributes)
+
+    async def is_ready_for_zip_code_entry(self):
+        """
+            Checks in one round trip that the popup is open and clean: the zip code field is visible and empty, and no
+            Continue button or invalid zip code alert is visible.
+        """
+        snapshot = await self._resolve_locators({name: self.locators[name] for name in
+                                                 ("zipCodeField", "continueButton", "invalidZipCodeValidationAlert")})
+        return (snapshot["zipCodeField"]["visible"] and not snapshot["zipCodeField"]["value"]
+                and not snapshot["continueButton"]["visible"] and not snapshot["invalidZipCodeValidationAlert"]["visible"])
+
+    async def get_invalid_zip_code_validation_alert_text(self):
+        """
+            Gets the text from an invalid zip code validation alert message.
+        """
+        return await self.__get_text("invalidZipCodeValidationAlert")
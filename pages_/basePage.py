@@ -1,31 +1,179 @@
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementClickInterceptedException
+import inspect
+import time
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementClickInterceptedException, \
+    JavascriptException, StaleElementReferenceException
 from selenium.webdriver.common.action_chains import ActionChains
 
-from common_.utilities_ import customLogger
+from common_.utilities_ import commandTimer, customLogger, failureArtifacts, locatorRegistry, waitEngine
+from common_.utilities_.elementCache import ElementCache
+from common_.utilities_.waitEngine import WaitEngine, QUICK_CHECK_TIMEOUT
+
+# Resolves a Selenium (by, value) locator to a list of elements inside the browser
+FIND_ELEMENTS_JS = """
+function findElements(by, value) {
+    switch (by) {
+        case 'id': var element = document.getElementById(value); return element ? [element] : [];
+        case 'name': return Array.prototype.slice.call(document.getElementsByName(value));
+        case 'class name': return Array.prototype.slice.call(document.getElementsByClassName(value));
+        case 'tag name': return Array.prototype.slice.call(document.getElementsByTagName(value));
+        case 'css selector': return Array.prototype.slice.call(document.querySelectorAll(value));
+        case 'link text':
+        case 'partial link text':
+            return Array.prototype.filter.call(document.getElementsByTagName('a'), function (link) {
+                var text = (link.innerText || '').trim();
+                return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+            });
+        case 'xpath':
+            var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var elements = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) { elements.push(snapshot.snapshotItem(i)); }
+            return elements;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+"""
+
+# Resolves when the text (or an attribute) of the located element satisfies the mode, as reported by a MutationObserver
+WAIT_FOR_DOM_CHANGE_JS = FIND_ELEMENTS_JS + """
+var by = arguments[0], value = arguments[1], mode = arguments[2], expected = arguments[3], attribute = arguments[4],
+    initial = arguments[5], timeoutMs = arguments[6], done = arguments[arguments.length - 1];
+
+function read() {
+    var element = findElements(by, value)[0];
+    if (!element) { return null; }
+    return attribute ? element.getAttribute(attribute) : (element.innerText || element.textContent || '').trim();
+}
+
+function isSatisfied(current) {
+    if (current === null) { return false; }
+    switch (mode) {
+        case 'changed': return current !== initial;
+        case 'equals': return current === expected;
+        case 'contains': return current.indexOf(expected) !== -1;
+        case 'matches': return new RegExp(expected).test(current);
+    }
+    return false;
+}
+
+var current = read();
+if (initial === null && mode === 'changed') { initial = current; } else if (isSatisfied(current)) { done({matched: true, value: current}); return; }
+
+var finished = false, timer = null;
+var observer = new MutationObserver(function () {
+    var current = read();
+    if (!finished && isSatisfied(current)) { finish(true, current); }
+});
+function finish(matched, current) {
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done({matched: matched, value: current});
+}
+observer.observe(document.documentElement, {subtree: true, childList: true, characterData: true, attributes: true});
+timer = setTimeout(function () { finish(false, read()); }, timeoutMs);
+"""
+
+# Reads existence, visibility, text and attributes of many locators in one round trip
+RESOLVE_LOCATORS_JS = FIND_ELEMENTS_JS + """
+var locators = arguments[0], attributes = arguments[1];
+
+function isVisible(element) {
+    var style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity || '1') > 0 &&
+        element.getClientRects().length > 0;
+}
+
+return locators.map(function (locator) {
+    var elements = findElements(locator[0], locator[1]);
+    var element = elements[0];
+    var result = {exists: !!element, count: elements.length, visible: false, text: null, value: null, attributes: {}};
+    if (element) {
+        result.visible = isVisible(element);
+        result.text = (element.innerText || '').trim();
+        // The current value of form fields, which the value attribute does not follow once the field is typed into
+        result.value = 'value' in element ? element.value : null;
+        attributes.forEach(function (name) { result.attributes[name] = element.getAttribute(name); });
+    }
+    return result;
+});
+"""
+
+# The longest single in-browser wait, kept below the default WebDriver script timeout (30 s)
+MAX_ASYNC_WAIT_SECONDS = 20
 
 
+@commandTimer.register_step_class
 class BasePage:
-    def __init__(self, driver):
+    def __init_subclass__(cls, **kwargs):
+        """
+            Register the locators every page object declares as class attributes in the central locator registry, and
+            run every public method of the page object as one step (see commandTimer.step).
+        """
+        super().__init_subclass__(**kwargs)
+        locatorRegistry.register_page_locators(cls)
+        for name, value in list(vars(cls).items()):
+            if inspect.isfunction(value) and not name.startswith("_"):
+                setattr(cls, name, commandTimer.step(value))
+
+    def __init__(self, driver, useElementCache=False):
         """
             Initialize the BasePage with a Selenium WebDriver instance.
+            With useElementCache, found elements are reused by locator until they go stale or the page is navigated.
         """
         self.driver = driver
+        self.elementCache = ElementCache(driver) if useElementCache else None
+        self.waitEngine = WaitEngine(driver)
+
+    def __get_cached_element(self, locator, condition):
+        """
+            Get the cached element of the locator if it is still attached (and visible, for the visibility condition).
+            Checking a cached element costs one round trip, while finding it again costs a find plus the condition check.
+        """
+        if condition not in (EC.visibility_of_element_located, EC.presence_of_element_located):
+            return None
+        element = self.elementCache.get(locator)
+        if element is None:
+            return None
+        try:
+            if condition is EC.visibility_of_element_located:
+                isUsable = element.is_displayed()
+            else:
+                # Any command on a detached element raises StaleElementReferenceException
+                element.is_enabled()
+                isUsable = True
+        except StaleElementReferenceException:
+            self.elementCache.invalidate(locator)
+            return None
+        if not isUsable:
+            return None
+        self.elementCache.count_hit()
+        return element
 
     def _find_element(self, locator, timeout=10, condition=EC.visibility_of_element_located):
         """
             Find and return a web element based on the provided locator, waiting for a specified condition.
         """
+        if self.elementCache is not None:
+            element = self.__get_cached_element(locator, condition)
+            if element is not None:
+                return element
+            self.elementCache.count_miss()
         try:
-            element = WebDriverWait(self.driver, timeout).until(condition(locator))
+            element = self.waitEngine.until(condition(locator), timeout)
+            commandTimer.remember_locator(element, locator)
+            if self.elementCache is not None:
+                self.elementCache.put(locator, element)
             return element
         except NoSuchElementException as e:
             customLogger.logger("ERROR", f"Error: An error occurred: {str(e)} - The element was not found on the page.")
+            failureArtifacts.capture(self.driver, "element_not_found")
             exit(2)
         except TimeoutException as e:
             customLogger.logger("ERROR", f"Error: Timeout waiting for element: {str(e)}")
+            failureArtifacts.capture(self.driver, "timeout")
             exit(3)
 
     def _find_elements(self, locator, timeout=10, condition=EC.presence_of_all_elements_located):
@@ -33,38 +181,49 @@ class BasePage:
             Find and return a multiple elements on the web page using the provided locators and wait for their presence.
         """
         try:
-            elements = WebDriverWait(self.driver, timeout).until(condition(locator))
+            elements = self.waitEngine.until(condition(locator), timeout)
+            for element in elements:
+                commandTimer.remember_locator(element, locator)
             return elements
         except NoSuchElementException as e:
             customLogger.logger("ERROR", f"Error: An error occurred: {str(e)} - The element(s) was not found on the page.")
+            failureArtifacts.capture(self.driver, "element_not_found")
             exit(2)
         except TimeoutException as e:
             customLogger.logger("ERROR", f"Error: Timeout waiting for element(s): {str(e)}")
+            failureArtifacts.capture(self.driver, "timeout")
             exit(3)
 
-    def _is_element_visible(self, locator):
+    def _is_element_visible(self, locator, timeout=10):
         """
             Check if an element identified by the given locator is visible within a specified time.
         """
-        try:
-            WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located(locator))
+        if self.waitEngine.is_met(EC.visibility_of_element_located(locator), timeout):
             return True
-        except:
-            customLogger.logger("WARNING", "Warning: Element was not visible within the specified time.")
-            return False
+        customLogger.logger("WARNING", "Warning: Element was not visible within the specified time.")
+        return False
+
+    def _is_element_absent(self, locator, timeout=QUICK_CHECK_TIMEOUT):
+        """
+            Check if an element identified by the given locator is missing or hidden.
+            Returns as soon as it is, instead of waiting the whole timeout for an element that is not coming.
+        """
+        return self.waitEngine.expect_absent(locator, timeout)
 
-    def _element_should_be_visible(self, locator):
+    def _element_should_be_visible(self, locator, timeout=10):
         """
             Check if an element identified by the given locator is visible within a specified time.
             If the element is not visible, log an error and exit the script.
         """
         try:
-            WebDriverWait(self.driver, 10).until(EC.visibility_of_element_located(locator))
+            self.waitEngine.until(EC.visibility_of_element_located(locator), timeout)
         except TimeoutException:
             customLogger.logger("ERROR", "Error: Element is not visible within the specified time, but should be")
+            failureArtifacts.capture(self.driver, "timeout")
             exit(3)
         except Exception as e:
             customLogger.logger("ERROR", f"Error: An unexpected error occurred: {str(e)}")
+            failureArtifacts.capture(self.driver, "unexpected_error")
             exit(5)
 
     def _drag_and_drop_by_element(self, sourceElement, targetElement):
@@ -130,17 +289,18 @@ class BasePage:
             Perform a click on a web element after ensuring it is clickable(enabled and displayed).
         """
         try:
-            WebDriverWait(self.driver, 10).until(
-                lambda driver: element.is_enabled() and element.is_displayed()
-            )
+            self.waitEngine.until(lambda driver: element.is_enabled() and element.is_displayed())
         except TimeoutException as e:
             customLogger.logger("ERROR", f"Error: Timeout waiting for the element to be clickable: {str(e)}")
+            failureArtifacts.capture(self.driver, "timeout")
             exit(3)
         except ElementClickInterceptedException as e:
             customLogger.logger("ERROR", f"Error: Element is not clickable due to interception: {str(e)}")
+            failureArtifacts.capture(self.driver, "click_intercepted")
             exit(4)
         except Exception as e:
             customLogger.logger("ERROR", f"Error: An unexpected error occurred: {str(e)}")
+            failureArtifacts.capture(self.driver, "unexpected_error")
             exit(5)
         element.click()
 
@@ -149,18 +309,108 @@ class BasePage:
             Perform a double click on a web element after ensuring it is clickable(enabled and displayed).
         """
         try:
-            WebDriverWait(self.driver, 10).until(
-                lambda driver: element.is_enabled() and element.is_displayed()
-            )
+            self.waitEngine.until(lambda driver: element.is_enabled() and element.is_displayed())
         except TimeoutException as e:
             customLogger.logger("ERROR", f"Error: Timeout waiting for the element to be clickable: {str(e)}")
+            failureArtifacts.capture(self.driver, "timeout")
             exit(3)
         except ElementClickInterceptedException as e:
             customLogger.logger("ERROR", f"Error: Element is not clickable due to interception: {str(e)}")
+            failureArtifacts.capture(self.driver, "click_intercepted")
             exit(4)
         except Exception as e:
             customLogger.logger("ERROR", f"Error: An unexpected error occurred: {str(e)}")
+            failureArtifacts.capture(self.driver, "unexpected_error")
             exit(5)
         action = ActionChains(self.driver)
         action.double_click(element)
         action.perform()
+
+    def _wait_for_dom_change(self, locator, expected=None, match="changed", attribute=None, initial=None,
+                             predicate=None, timeout=10):
+        """
+            Wait until the text (or the given attribute) of an element changes or matches the expected value, without
+            polling: a MutationObserver installed by an async script returns as soon as the DOM satisfies the condition.
+
+            Args:
+                locator (tuple): The (By, value) locator of the observed element.
+                expected (str): The expected value for the 'equals', 'contains' and 'matches' (regular expression) modes.
+                match (str): One of 'changed', 'equals', 'contains' or 'matches'.
+                attribute (str): The attribute to observe instead of the element text.
+                initial (str): The value to compare against in the 'changed' mode, e.g. read before the triggering action.
+                    Defaults to the value when the wait starts.
+                predicate (callable): An extra check on the new value, evaluated in Python. If it fails, the wait goes on
+                    until the next change of the value.
+                timeout (float): The deadline of the whole wait in seconds.
+
+            Returns:
+                str: The value that satisfied the condition, or the last observed value if the deadline was reached.
+        """
+        startTime = time.perf_counter()
+        try:
+            return self.__observe_dom_change(locator, expected, match, attribute, initial, predicate, timeout)
+        finally:
+            waitEngine.add_wait_seconds(self.driver, time.perf_counter() - startTime)
+
+    def __observe_dom_change(self, locator, expected, match, attribute, initial, predicate, timeout):
+        """
+            Run the MutationObserver script until the condition of _wait_for_dom_change is met or the deadline is reached.
+        """
+        deadline = time.perf_counter() + timeout
+        current = initial
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                customLogger.logger("WARNING", "Warning: The element %s did not change as expected (%s %s) within %s s",
+                                    locator, match, expected, timeout)
+                return current
+            try:
+                result = self.driver.execute_async_script(WAIT_FOR_DOM_CHANGE_JS, locator[0], locator[1], match, expected,
+                                                          attribute, initial if match == "changed" else None,
+                                                          int(min(remaining, MAX_ASYNC_WAIT_SECONDS) * 1000))
+            except JavascriptException as e:
+                # The page was reloaded while the observer was waiting, so observe the new document
+                if "unloaded" not in str(e) and "context" not in str(e):
+                    raise
+                continue
+            current = result["value"]
+            if result["matched"]:
+                if predicate is None or predicate(current):
+                    return current
+                # Keep observing until the next change of the value that failed the predicate
+                match, expected, initial = "changed", None, current
+
+    def _resolve_locators(self, locators, attributes=()):
+        """
+            Resolve many locators (ID, NAME, CSS, XPath, ...) in a single execute_script call instead of a wait, a find
+            and a text read per element.
+
+            Args:
+                locators (dict): The (By, value) locators to resolve, by name.
+                attributes (iterable): The names of the attributes to read from every found element.
+
+            Returns:
+                dict: For every name, a dict with 'exists', 'count', 'visible', 'text', 'value' (of form fields) and
+                    'attributes' of the first match.
+        """
+        names = list(locators)
+        results = self.driver.execute_script(RESOLVE_LOCATORS_JS, [list(locators[name]) for name in names], list(attributes))
+        return dict(zip(names, results))
+
+    def _get_locators(self):
+        """
+            Get all locators declared by the page object, by attribute name without the 'Locator' suffix: the class level
+            ones from the locator registry and any set on the instance.
+            Name-mangled private locators (e.g. NavigationBar.__searchFieldLocator) are included.
+        """
+        locators = locatorRegistry.get_page_locators(type(self))
+        for name, value in vars(self).items():
+            if name.endswith("Locator") and isinstance(value, tuple) and len(value) == 2:
+                locators[name.rsplit("__", 1)[-1][:-len("Locator")]] = value
+        return locators
+
+    def _snapshot_locators(self, attributes=()):
+        """
+            Resolve the whole locator set of the page object in one round trip (see _resolve_locators).
+        """
+        return self._resolve_locators(self._get_locators(), attributes)
@@ -6,30 +6,35 @@ from pages_.basePage import BasePage
 
 
 class NavigationBar(BasePage):
-    def __init__(self, driver: webdriver.Chrome):
+    __usernameFromAccountsAndListsLocator = (By.ID, "nav-link-accountList-nav-line-1")
+    __deliveryCountryLocator = (By.ID, "glow-ingress-line2")
+    __homePageLogoLocator = (By.ID, "nav-logo-sprites")
+    __updateLocationButtonLocator = (By.ID, "glow-ingress-block")
+    __searchFiltersDropdownLocator = (By.ID, "searchDropdownBox")
+    __searchFieldLocator = (By.ID, "twotabsearchtextbox")
+    __searchButtonLocator = (By.ID, "nav-search-submit-button")
+    __languageChangeDropdownLocator = (By.ID, "icp-nav-flyout")
+    __accountListsDropdownLocator = (By.ID, "nav-link-accountList")
+    __returnAndOrdersButtonLocator = (By.ID, "nav-orders")
+    __cartButtonLocator = (By.ID, "nav-cart")
+    __cartButtonQuantityLocator = (By.ID, "nav-cart-count")
+    __hamburgerMenuButtonLocator = (By.ID, "nav-hamburger-menu")
+
+    def __init__(self, driver: webdriver.Chrome, useElementCache=False):
         """
             Initialize the NavigationBar class.
+            With useElementCache, found elements are reused until they go stale or the page is navigated.
         """
-        super().__init__(driver)
-
-        self.__usernameFromAccountsAndListsLocator = (By.ID, "nav-link-accountList-nav-line-1")
-        self.__deliveryCountryLocator = (By.ID, "glow-ingress-line2")
-        self.__homePageLogoLocator = (By.ID, "nav-logo-sprites")
-        self.__updateLocationButtonLocator = (By.ID, "glow-ingress-block")
-        self.__searchFiltersDropdownLocator = (By.ID, "searchDropdownBox")
-        self.__searchFieldLocator = (By.ID, "twotabsearchtextbox")
-        self.__searchButtonLocator = (By.ID, "nav-search-submit-button")
-        self.__languageChangeDropdownLocator = (By.ID, "icp-nav-flyout")
-        self.__accountListsDropdownLocator = (By.ID, "nav-link-accountList")
-        self.__returnAndOrdersButtonLocator = (By.ID, "nav-orders")
-        self.__cartButtonLocator = (By.ID, "nav-cart")
-        self.__cartButtonQuantityLocator = (By.ID, "nav-cart-count")
-        self.__hamburgerMenuButtonLocator = (By.ID, "nav-hamburger-menu")
+        super().__init__(driver, useElementCache)
 
     def __get_nav_bar_element_text_(self, locator):
         """
-            Gets the text of an element by the provided locator
+            Gets the text of an element by the provided locator.
+            The element is read in one round trip when it is already visible, otherwise it is waited for.
         """
+        resolved = self._resolve_locators({"element": locator})["element"]
+        if resolved["visible"]:
+            return resolved["text"]
         self._element_should_be_visible(locator)
         element = self._find_element(locator)
         return self._get_element_text(element)
@@ -46,6 +51,21 @@ class NavigationBar(BasePage):
         """
         return self.__get_nav_bar_element_text_(self.__deliveryCountryLocator)
 
+    def wait_for_delivery_country_text_change(self, expectedText=None, match="contains", initialText=None, timeout=10):
+        """
+            Waits until the delivery country text of the 'deliver to' section matches the expected text, or differs from
+            initialText (by default, the text when the wait starts) if no text is given, and returns it.
+        """
+        if expectedText is None:
+            return self._wait_for_dom_change(self.__deliveryCountryLocator, initial=initialText, timeout=timeout)
+        return self._wait_for_dom_change(self.__deliveryCountryLocator, expectedText, match, timeout=timeout)
+
+    def get_nav_bar_snapshot(self, attributes=()):
+        """
+            Gets the existence, visibility, text and the given attributes of every navigation bar element in one round trip.
+        """
+        return self._snapshot_locators(attributes)
+
     def click_home_page_logo(self):
         """
             Clicks on the Amazon logo(home page)
@@ -60,11 +80,11 @@ class NavigationBar(BasePage):
         updateLocationButtonElement = self._find_element(self.__updateLocationButtonLocator)
         self._click_to_element(updateLocationButtonElement)
 
-    def is_update_location_button_visible(self):
+    def is_update_location_button_visible(self, timeout=10):
         """
             Checks if the delivery location update popup is open.
         """
-        if self._is_element_visible(self.__updateLocationButtonLocator):
+        if self._is_element_visible(self.__updateLocationButtonLocator, timeout):
             return True
         else:
             return False
@@ -1,30 +1,32 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 
+from common_.utilities_.waitEngine import QUICK_CHECK_TIMEOUT
 from pages_.basePage import BasePage
 
 
 class UpdateDeliveryLocationPopup(BasePage):
-    def __init__(self, driver: webdriver.Chrome):
+    popupTitleLocator = (By.ID, "a-popover-header-1")
+    zipCodeFieldLocator = (By.ID, "GLUXZipUpdateInput")
+    applyButtonLocator = (By.XPATH, "//div[@class='a-column a-span4 a-span-last']/span/span/input")
+    continueButtonLocator = (By.CSS_SELECTOR, ".a-popover-footer #GLUXConfirmClose")
+    countryDropdownLocator = (By.ID, "GLUXCountryValue")
+    countryItemLocator = (By.XPATH, "(//li[@class='a-dropdown-item'])[17]")
+    doneButtonLocator = (By.NAME, "glowDoneButton")
+    changeButtonLocator = (By.ID, "GLUXChangePostalCodeLink")
+    signInToSeeAddressButtonLocator = (By.ID, "GLUXSignInButton")
+    manageAddressBookButtonLocator = (By.ID, "GLUXManageAddressLink")
+
+    countryDropdownPlaceholderLocator = (By.ID, "GLUXCountryValue")
+    deliveryCountryNameLocator = (By.ID, "glow-ingress-line2")
+    invalidZipCodeValidationAlertLocator = (By.ID, "GLUXZipError")
+
+    def __init__(self, driver: webdriver.Chrome, useElementCache=False):
         """
             Initialize the UpdateDeliveryLocationPopup class.
+            With useElementCache, found elements are reused until they go stale or the page is navigated.
         """
-        super().__init__(driver)
-
-        self.popupTitleLocator = (By.ID, "a-popover-header-1")
-        self.zipCodeFieldLocator = (By.ID, "GLUXZipUpdateInput")
-        self.applyButtonLocator = (By.XPATH, "//div[@class='a-column a-span4 a-span-last']/span/span/input")
-        self.continueButtonLocator = (By.CSS_SELECTOR, ".a-popover-footer #GLUXConfirmClose")
-        self.countryDropdownLocator = (By.ID, "GLUXCountryValue")
-        self.countryItemLocator = (By.XPATH, "(//li[@class='a-dropdown-item'])[17]")
-        self.doneButtonLocator = (By.NAME, "glowDoneButton")
-        self.changeButtonLocator = (By.ID, "GLUXChangePostalCodeLink")
-        self.signInToSeeAddressButtonLocator = (By.ID, "GLUXSignInButton")
-        self.manageAddressBookButtonLocator = (By.ID, "GLUXManageAddressLink")
-
-        self.countryDropdownPlaceholderLocator = (By.ID, "GLUXCountryValue")
-        self.deliveryCountryNameLocator = (By.ID, "glow-ingress-line2")
-        self.invalidZipCodeValidationAlertLocator = (By.ID, "GLUXZipError")
+        super().__init__(driver, useElementCache)
 
     def fill_zip_code_field(self, zipCode):
         """
@@ -79,11 +81,12 @@ class UpdateDeliveryLocationPopup(BasePage):
         self._click_to_element(popupTitleElement)
         self._click_to_element(changeButtonElement)
 
-    def check_the_change_button_existence(self):
+    def check_the_change_button_existence(self, timeout=QUICK_CHECK_TIMEOUT):
         """
-            Checks if the Change button is visible.
+            Checks if the Change button is visible. This is a negative check as often as a positive one, so it only waits
+            for a short time instead of the whole step timeout.
         """
-        if self._is_element_visible(self.changeButtonLocator):
+        if self._is_element_visible(self.changeButtonLocator, timeout):
             return True
         else:
             return False
@@ -116,6 +119,32 @@ class UpdateDeliveryLocationPopup(BasePage):
         deliveryCountryNameElement = self._find_element(self.deliveryCountryNameLocator)
         return self._get_element_text(deliveryCountryNameElement)
 
+    def wait_for_delivery_country_name(self, expectedText=None, match="contains", timeout=10):
+        """
+            Waits until the delivery country name in the navigation bar matches the expected text (or changes, if no text
+            is given) and returns it. Returns the last seen name if it was not updated within the timeout.
+        """
+        return self._wait_for_dom_change(self.deliveryCountryNameLocator, expectedText,
+                                         match if expectedText is not None else "changed", timeout=timeout)
+
+    def get_popup_snapshot(self, attributes=()):
+        """
+            Gets the existence, visibility, text and the given attributes of every popup element in one round trip.
+        """
+        return self._snapshot_locators(attributes)
+
+    def is_ready_for_zip_code_entry(self):
+        """
+            Checks in one round trip that the popup is open and clean, waiting for a zip code: the zip code field is
+            visible and empty, and neither the Continue button of an applied zip code nor the alert of a rejected one
+            is visible.
+        """
+        snapshot = self._resolve_locators({"zipCodeField": self.zipCodeFieldLocator,
+                                           "continueButton": self.continueButtonLocator,
+                                           "invalidZipCodeValidationAlert": self.invalidZipCodeValidationAlertLocator})
+        return (snapshot["zipCodeField"]["visible"] and not snapshot["zipCodeField"]["value"]
+                and not snapshot["continueButton"]["visible"] and not snapshot["invalidZipCodeValidationAlert"]["visible"])
+
     def get_invalid_zip_code_validation_alert_text(self):
         """
             Gets the text from an invalid zip code validation alert message.
@@ -4,5 +4,9 @@ mainPageUrl = "https://www.amazon.com/"
 # Zip codes are used when changing the delivery location
 zipCodeData = {"validZipCode": 90001, "otherValidZipCode": 90002, "invalidZipCode": 10000}
 
+# Zip codes checked over HTTP by the delivery location API tests
+zipCodeMatrixData = {"validZipCodes": [90001, 90002, 10001, 60601, 94105, 33101, 98101, 30301],
+                     "invalidZipCodes": [10000, 1234, 123456, "abcde", "9000A"]}
+
 # Search keywords
 searchTextData = {"validText": "Agv pista GP RR", "invalidText": "@#$%^&*"}
@@ -0,0 +1,66 @@
+import unittest
+
+from apiClients_.deliveryLocationApi import DeliveryLocationApi
+from tests_.baseTest import BaseTest
+from tests_.statePreconditions import refresh_page
+from pages_.navigationBar_.navigationBar import NavigationBar
+from testData_.data import zipCodeData, zipCodeMatrixData
+
+
+class DeliveryLocationApiTest(unittest.TestCase):
+    """
+        The zip code validation of the delivery location popup, checked over HTTP without a browser.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.deliveryLocationApiObj = DeliveryLocationApi()
+
+    def test_update_location_by_valid_zip_codes(self):
+        """
+            Test Case: Update the delivery location by many valid zip codes
+        """
+        # Act
+        results = self.deliveryLocationApiObj.check_zip_codes(zipCodeMatrixData["validZipCodes"])
+        # Assertion
+        for zipCode, result in results.items():
+            with self.subTest(zipCode=zipCode):
+                self.assertTrue(result["isValid"], "AssertionError: The given valid zip code was rejected")
+                self.assertIn(str(zipCode), result["deliveryLocation"],
+                              "AssertionError: The given valid zip code has not been updated")
+
+    def test_negative_update_location_by_invalid_zip_codes(self):
+        """
+            Test Case: Trying to update the delivery location by many invalid zip codes
+        """
+        # Act
+        results = self.deliveryLocationApiObj.check_zip_codes(zipCodeMatrixData["invalidZipCodes"])
+        # Assertion
+        for zipCode, result in results.items():
+            with self.subTest(zipCode=zipCode):
+                self.assertFalse(result["isValid"], "AssertionError: The given invalid zip code was accepted")
+
+
+class DeliveryLocationApiCrossCheckTest(BaseTest):
+    """
+        Checks that the API path and the UI path agree: a location set over HTTP is the one the nav bar shows.
+    """
+    launchProfile = "lean"
+
+    def test_zip_code_updated_by_api_is_shown_in_nav_bar(self):
+        """
+            Test Case: Update the delivery location over HTTP as the browser's visitor and check it in the nav bar
+        """
+        # Pre-conditions
+        deliveryLocationApiObj = DeliveryLocationApi()
+        deliveryLocationApiObj.share_cookies_from_driver(self.driver)
+        # Act
+        isValid = deliveryLocationApiObj.update_location_by_zip_code(zipCodeData["validZipCode"])
+        apiDeliveryLocation = deliveryLocationApiObj.get_delivery_location_label()
+        refresh_page(self.driver)
+        # Assertion
+        navigationBarObj = NavigationBar(self.driver)
+        deliveryCountryName = navigationBarObj.wait_for_delivery_country_text_change(str(zipCodeData["validZipCode"]))
+        self.assertTrue(isValid, "AssertionError: The given valid zip code was rejected")
+        self.assertEqual(apiDeliveryLocation, deliveryCountryName.strip(),
+                         "AssertionError: The API and the nav bar show different delivery locations")
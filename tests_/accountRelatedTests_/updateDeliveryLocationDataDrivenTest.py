@@ -0,0 +1,35 @@
+from tests_.baseTest import BaseTest
+from pages_.navigationBar_.navigationBar import NavigationBar
+from pages_.navigationBar_.updateDeliveryLocationPopup import UpdateDeliveryLocationPopup
+
+
+class UpdateDeliveryLocationDataDrivenTest(BaseTest):
+    # The nav bar and the GLUX popup do not need images, fonts or third-party scripts
+    launchProfile = "lean"
+
+    def check_zip_code_row(self, row):
+        """
+            Updates the delivery location by the row's zip code and checks the result the row expects.
+        """
+        # Pre-conditions
+        navigationBarObj = NavigationBar(self.driver)
+        navigationBarObj.click_update_location_button()
+        # Act
+        updateDeliveryLocationPopupObj = UpdateDeliveryLocationPopup(self.driver, useElementCache=True)
+        updateDeliveryLocationPopupObj.fill_zip_code_field(row["zipCode"])
+        updateDeliveryLocationPopupObj.click_apply_button()
+        # Assertion
+        if row["isValid"] == "1":
+            updateDeliveryLocationPopupObj.click_continue_button()
+            deliveryCountryName = updateDeliveryLocationPopupObj.wait_for_delivery_country_name(row["zipCode"])
+            self.assertIn(row["zipCode"], deliveryCountryName, "AssertionError: The given valid zip code has not been updated")
+        else:
+            invalidZipCodeAlertText = updateDeliveryLocationPopupObj.get_invalid_zip_code_validation_alert_text()
+            self.assertEqual(invalidZipCodeAlertText, "Please enter a valid US zip code",
+                             "AssertionError: Validation message for invalid zip code was not displayed")
+
+    def test_update_location_by_zip_codes_from_file(self):
+        """
+            Test Case: Update the delivery location by every zip code of testData_/zipCodes.csv
+        """
+        self.run_for_each_row("zipCodes.csv", self.check_zip_code_row)
@@ -1,5 +1,3 @@
-import time
-
 from tests_.baseTest import BaseTest
 from pages_.navigationBar_.navigationBar import NavigationBar
 from pages_.navigationBar_.updateDeliveryLocationPopup import UpdateDeliveryLocationPopup
@@ -7,22 +5,22 @@ from testData_.data import zipCodeData
 
 
 class UpdateDeliveryLocationTest(BaseTest):
+    # The nav bar and the GLUX popup do not need images, fonts or third-party scripts
+    launchProfile = "lean"
+    # Every test starts with the GLUX popup open (see tests_/statePreconditions.py)
+    precondition = "glux_popup_open"
+
     def test_update_location_by_valid_zip_code(self):
         """
             Test Case: Update the delivery location by entering a valid zip code
         """
-        # Pre-conditions
-        navigationBarObj = NavigationBar(self.driver)
-        navigationBarObj.click_update_location_button()
         # Act
-        updateDeliveryLocationPopupObj = UpdateDeliveryLocationPopup(self.driver)
+        updateDeliveryLocationPopupObj = UpdateDeliveryLocationPopup(self.driver, useElementCache=True)
         updateDeliveryLocationPopupObj.fill_zip_code_field(zipCodeData["validZipCode"])
         updateDeliveryLocationPopupObj.click_apply_button()
         updateDeliveryLocationPopupObj.click_continue_button()
-        # todo improve logic for wait until the content will be updated to get rid of time sleep
-        time.sleep(2)
         # Assertion
-        deliveryCountryName = updateDeliveryLocationPopupObj.get_delivery_country_name()
+        deliveryCountryName = updateDeliveryLocationPopupObj.wait_for_delivery_country_name(str(zipCodeData["validZipCode"]))
         self.assertIn(str(zipCodeData["validZipCode"]), deliveryCountryName,
                       "AssertionError: The given valid zip code has not been updated")
 
@@ -30,20 +28,15 @@ class UpdateDeliveryLocationTest(BaseTest):
         """
             Test Case: Update the delivery location by selecting country from the list
         """
-        # Pre-Conditions
-        navigationBarObj = NavigationBar(self.driver)
-        navigationBarObj.click_update_location_button()
         # Act
-        updateDeliveryLocationPopupObj = UpdateDeliveryLocationPopup(self.driver)
+        updateDeliveryLocationPopupObj = UpdateDeliveryLocationPopup(self.driver, useElementCache=True)
         updateDeliveryLocationPopupObj.open_country_dropdown()
         updateDeliveryLocationPopupObj.select_country_from_dropdown()
         countryDropdownPlaceholder = updateDeliveryLocationPopupObj.get_country_dropdown_placeholder_text()
         updateDeliveryLocationPopupObj.click_done_button()
-
-        # todo improve logic for wait until the content will be updated to get rid of time sleep
-        time.sleep(2)
         # Assertion
-        deliveryCountryName = updateDeliveryLocationPopupObj.get_delivery_country_name()
+        deliveryCountryName = updateDeliveryLocationPopupObj.wait_for_delivery_country_name(countryDropdownPlaceholder,
+                                                                                             match="equals")
         self.assertEqual(countryDropdownPlaceholder, deliveryCountryName,
                          "AssertionError: The delivery country has not been updated.")
 
@@ -51,14 +44,37 @@ class UpdateDeliveryLocationTest(BaseTest):
         """
             Test Case: Trying to update the delivery location by entering some invalid zip code
         """
-        # Pre-Conditions
-        navigationBarObj = NavigationBar(self.driver)
-        navigationBarObj.click_update_location_button()
         # Act
-        updateDeliveryLocationPopupObj = UpdateDeliveryLocationPopup(self.driver)
+        updateDeliveryLocationPopupObj = UpdateDeliveryLocationPopup(self.driver, useElementCache=True)
         updateDeliveryLocationPopupObj.fill_zip_code_field(zipCodeData["invalidZipCode"])
         updateDeliveryLocationPopupObj.click_apply_button()
         # Assertion
         invalidZipCodeAlertText = updateDeliveryLocationPopupObj.get_invalid_zip_code_validation_alert_text()
         self.assertEqual(invalidZipCodeAlertText, "Please enter a valid US zip code",
                          "AssertionError: Validation message for invalid zip code was not displayed")
+
+
+class UpdateDeliveryLocationFromSetLocationTest(BaseTest):
+    launchProfile = "lean"
+    # Starts with the delivery location already set to the valid zip code, injected from the saved state snapshot
+    statePrecondition = "location_set_to_valid_zip_code"
+
+    def test_change_location_to_other_valid_zip_code(self):
+        """
+            Test Case: Change an already set delivery location to another valid zip code
+        """
+        # Pre-Conditions
+        navigationBarObj = NavigationBar(self.driver)
+        navigationBarObj.click_update_location_button()
+        # Act
+        updateDeliveryLocationPopupObj = UpdateDeliveryLocationPopup(self.driver, useElementCache=True)
+        if updateDeliveryLocationPopupObj.check_the_change_button_existence():
+            updateDeliveryLocationPopupObj.click_change_button()
+        updateDeliveryLocationPopupObj.fill_zip_code_field(zipCodeData["otherValidZipCode"])
+        updateDeliveryLocationPopupObj.click_apply_button()
+        updateDeliveryLocationPopupObj.click_continue_button()
+        # Assertion
+        deliveryCountryName = updateDeliveryLocationPopupObj.wait_for_delivery_country_name(
+            str(zipCodeData["otherValidZipCode"]))
+        self.assertIn(str(zipCodeData["otherValidZipCode"]), deliveryCountryName,
+                      "AssertionError: The delivery location has not been changed to the other zip code")
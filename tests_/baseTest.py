@@ -1,28 +1,131 @@
 import unittest
-from selenium import webdriver
 from selenium.webdriver.support.events import EventFiringWebDriver
+from common_.utilities_ import commandTrace, customLogger, dataStream, driverPool, pageMetrics, preconditionGraph, \
+    resourceMonitor, stateSnapshot, waitEngine
 from common_.utilities_.customListener import CustomListener
-from pages_.navigationBar_.navigationBar import NavigationBar
 
 from testData_.data import mainPageUrl
+from tests_.statePreconditions import STATE_PRECONDITIONS, refresh_if_home_page_is_broken
 
 
 class BaseTest(unittest.TestCase):
     """
-        Base test class for setting up and tearing down the test environment.
+        Base test class for setting up and tearing down the test environment. Browser sessions are leased from the
+        shared driver pool, so a warm browser is reused across tests (see the README for the class attributes).
     """
+    # The browser launch profile: page load strategy and blocked requests (see launchProfiles)
+    launchProfile = "default"
+    # A named precondition whose saved state snapshot is injected instead of repeating the UI steps (see stateSnapshot)
+    statePrecondition = None
+    # The step of the precondition graph the tests start from, e.g. 'glux_popup_open' (see tests_/statePreconditions.py),
+    # or per method with @requires_precondition; consecutive tests of a session continue from the state reached before
+    precondition = None
+    stateSnapshotMaxAgeSeconds = stateSnapshot.DEFAULT_MAX_AGE_SECONDS
+    # The page load budgets of the class, e.g. {"lcpMs": 2500}, on top of PAGE_LOAD_BUDGETS (see pageMetrics)
+    pageLoadBudgets = None
 
     def setUp(self):
-        self.simpleDriver = webdriver.Chrome()
+        # A malformed budget fails the test here, before a browser is leased, instead of in tearDown
+        pageMetrics.get_budgets(self.pageLoadBudgets)
+        self.driverPool = driverPool.get_shared_pool(self.launchProfile)
+        self.graphPrecondition = preconditionGraph.get_test_precondition(self)
+        self.sessionCount = 0
+        self.__start_session()
+
+    def __start_session(self):
+        """
+            Lease a session and bring it to the state the test starts from. The page metrics of its navigations are
+            collected from here on, and with the resource monitor on (see resourceMonitor) the session is sampled first.
+        """
+        self.simpleDriver = self.driverPool.acquire(keepState=self.graphPrecondition is not None)
+        self.sessionCount += 1
+        pageMetrics.start_test(self.simpleDriver, self.id())
+        if resourceMonitor.is_enabled():
+            resourceMonitor.sample(self.simpleDriver, self.id(), "start")
+        # With COMMAND_TRACE set, the commands of the test (setUp included) are recorded for benchmarks_/traceReplayer.py
+        # A test whose session was recycled records the commands of every further session to a trace of its own
+        traceId = self.id() if self.sessionCount == 1 else f"{self.id()}.session-{self.sessionCount}"
+        self.commandTrace = commandTrace.start_test_trace(self.simpleDriver, traceId)
+        if self.commandTrace is not None:
+            self.addCleanup(self.commandTrace.stop)
         self.driver = EventFiringWebDriver(self.simpleDriver, CustomListener(self.simpleDriver))
-        self.driver.delete_all_cookies()
-        self.driver.implicitly_wait(10)
-        self.driver.maximize_window()
-        self.driver.get(mainPageUrl)
+        # All waiting is done by the explicit waits of the wait engine; an implicit wait would stack on top of them
+        self.driver.implicitly_wait(0)
+        waitEngine.reset_wait_seconds(self.driver)
+        if self.graphPrecondition is not None:
+            preconditionGraph.reach(self.driver, self.graphPrecondition)
+            return
+        preconditionGraph.forget(self.driver)
+        if self.statePrecondition:
+            stateSnapshot.apply_snapshot(self.driver, self.statePrecondition, STATE_PRECONDITIONS[self.statePrecondition],
+                                         self.stateSnapshotMaxAgeSeconds, url=mainPageUrl)
+        else:
+            self.driver.get(mainPageUrl)
         # If the page was loaded incorrectly this logic will refresh the page
-        navigationBarObj = NavigationBar(self.driver)
-        if not navigationBarObj.is_update_location_button_visible():
-            self.driver.refresh()
+        refresh_if_home_page_is_broken(self.driver)
+
+    def __end_session(self):
+        """
+            Return the session to the pool, or recycle it if it crossed a resource threshold.
+        """
+        if resourceMonitor.is_enabled() and resourceMonitor.check_session(self.simpleDriver, self.id(), "end"):
+            self.__recycle_session()
+            return
+        if self.commandTrace is not None:
+            self.commandTrace.stop()
+        # The session goes back to the pool, which resets it (tabs, cookies, storage) for the next test
+        # Tests of the precondition graph keep the state for the next test, which rolls back only as far as it needs
+        self.driverPool.release(self.simpleDriver, keepState=self.graphPrecondition is not None)
+
+    def __recycle_session(self):
+        """
+            Quit the session instead of returning it to the pool, so the next lease starts a fresh browser.
+        """
+        if self.commandTrace is not None:
+            self.commandTrace.stop()
+        self.driverPool.recycle(self.simpleDriver)
+
+    def run_for_each_row(self, fileName, check):
+        """
+            Run a check for every row of a CSV or JSON lines file in testData_/, streamed one row at a time.
+            Every row is a separate sub-test, so it passes or fails on its own, and all rows share this test's browser
+            session: between rows the home page is loaded again, and after a failed row the cookies are cleared as well.
+            A session that crossed a resource threshold is replaced by a fresh one before the next row.
+            DATA_ROWS=start:stop or DATA_SHARD=index/count limit the rows this process runs.
+
+            Args:
+                fileName (str): The data file.
+                check (callable): Called with the row (a dict) and makes the assertions for it.
+        """
+        start, stop = dataStream.get_row_range(fileName)
+        rowNumber = None
+        for rowNumber, row in dataStream.stream_rows(fileName, start, stop):
+            passed = False
+            # The columns are passed as one parameter, so a column may be named like a subTest argument (e.g. 'msg')
+            with self.subTest(row=rowNumber, data=row):
+                check(row)
+                passed = True
+            customLogger.logger("INFO", "Row %s of %s %s", rowNumber, fileName, "passed" if passed else "failed",
+                                event="data_row", test=self.id(), file=fileName, row=rowNumber, passed=passed)
+            if resourceMonitor.is_enabled() and resourceMonitor.check_session(self.simpleDriver, self.id(), "row", row=rowNumber):
+                # The next rows continue on a fresh session, from the state the test starts from
+                self.__recycle_session()
+                self.__start_session()
+                continue
+            if not passed:
+                self.driver.delete_all_cookies()
+            self.driver.get(mainPageUrl)
+        if rowNumber is None:
+            self.skipTest(f"There are no rows in {fileName} for the range {start}:{stop}")
 
     def tearDown(self):
-        self.driver.close()
+        """
+            Return the session to the pool and fail the test when one of its navigations exceeded the page load budgets
+            or was much slower than the PAGE_LOAD_BASELINE run (see pageMetrics.pop_budget_violations).
+        """
+        customLogger.logger("INFO", "The test %s spent %.3f s waiting", self.id(), waitEngine.get_wait_seconds(self.driver),
+                            event="wait_time", test=self.id(), waitSeconds=round(waitEngine.get_wait_seconds(self.driver), 3))
+        self.__end_session()
+        budgetViolations = pageMetrics.pop_budget_violations(self.id(), self.pageLoadBudgets)
+        if budgetViolations:
+            self.fail("The pages loaded slower than their budgets: " + "; ".join(budgetViolations))
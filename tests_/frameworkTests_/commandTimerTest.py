@@ -0,0 +1,80 @@
+import random
+import unittest
+
+from common_.utilities_ import commandTimer
+from common_.utilities_.commandTimer import LatencyHistogram
+
+
+def _build_histogram(samples):
+    histogram = LatencyHistogram()
+    for seconds in samples:
+        histogram.add(seconds)
+    return histogram
+
+
+class CommandTimerTest(unittest.TestCase):
+    """
+        Unit tests of the latency histograms and of merging the timings of several processes.
+    """
+
+    def setUp(self):
+        generator = random.Random(7)
+        self.samples = [generator.lognormvariate(-4, 1) for _ in range(1000)]
+        commandTimer.reset()
+        self.addCleanup(commandTimer.reset)
+
+    def test_percentiles_are_within_one_bucket(self):
+        """
+            Test Case: The estimated percentiles are at most one bucket (about 9%) above the exact ones
+        """
+        histogram = _build_histogram(self.samples)
+        exact = sorted(self.samples)
+        for fraction in (0.5, 0.95, 0.99):
+            exactValue = exact[int(fraction * len(exact)) - 1]
+            self.assertGreaterEqual(histogram.percentile(fraction), exactValue)
+            self.assertLessEqual(histogram.percentile(fraction), exactValue * 2 ** (1 / commandTimer.BUCKETS_PER_DOUBLING) * 1.01)
+        self.assertEqual(histogram.percentile(1.0), max(self.samples))
+        self.assertEqual(LatencyHistogram().percentile(0.5), 0.0)
+
+    def test_merge_equals_one_histogram_of_all_samples(self):
+        """
+            Test Case: Merging the histograms of two halves gives the histogram of all samples, empty ones included
+        """
+        merged = _build_histogram(self.samples[:300])
+        merged.merge(_build_histogram(self.samples[300:]))
+        merged.merge(LatencyHistogram())
+        expected = _build_histogram(self.samples)
+        self.assertEqual(merged.buckets, expected.buckets)
+        self.assertEqual((merged.count, merged.minimum, merged.maximum), (expected.count, expected.minimum, expected.maximum))
+        self.assertAlmostEqual(merged.total, expected.total)
+
+    def test_dict_round_trip_keeps_the_histogram(self):
+        """
+            Test Case: A histogram rebuilt from its dict has the same buckets and statistics, also when it is empty
+        """
+        histogram = _build_histogram(self.samples)
+        self.assertEqual(LatencyHistogram.from_dict(histogram.to_dict()).to_dict(), histogram.to_dict())
+        self.assertEqual(LatencyHistogram.from_dict(LatencyHistogram().to_dict()).to_dict(), LatencyHistogram().to_dict())
+
+    def test_snapshots_of_several_processes_are_merged_by_key(self):
+        """
+            Test Case: merge_snapshots adds up the timings recorded under the same command, locator and step
+        """
+        locator = ("id", "nav-search-submit-button")
+        snapshots = []
+        for samples in (self.samples[:500], self.samples[500:]):
+            commandTimer.reset()
+            for seconds in samples:
+                commandTimer.record("click", seconds, locator, "NavigationBar.click_search_button")
+            commandTimer.record("find", 0.01)
+            snapshots.append(commandTimer.get_snapshot())
+
+        merged = commandTimer.merge_snapshots(snapshots)
+        expected = _build_histogram(self.samples).to_dict()
+        for group, key in (("command", "click"), ("locator", "click id=nav-search-submit-button"),
+                           ("step", "NavigationBar.click_search_button")):
+            self.assertEqual(merged[group][key]["count"], len(self.samples))
+            self.assertEqual(merged[group][key]["buckets"], expected["buckets"])
+            self.assertEqual(merged[group][key]["p95Ms"], expected["p95Ms"])
+        self.assertEqual(merged["command"]["find"]["count"], 2)
+        self.assertEqual(set(merged["step"]), {"NavigationBar.click_search_button"})
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from common_.utilities_ import dataStream
+
+ROW_COUNT = 10
+
+
+class DataStreamTest(unittest.TestCase):
+    """
+        Unit tests of streaming data rows and of the row ranges and shards a process runs.
+    """
+
+    def setUp(self):
+        self.dataDirectory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dataDirectory)
+        cities = [f"City {index}" for index in range(ROW_COUNT)]
+        # The second row's city spans two lines, which is still one row; blank lines in the middle are not rows
+        cities[1] = "New\nYork"
+        self.csvFile = self.__write("zipCodes.csv", "zipCode,city\n" + "".join(
+            f'{10000 + index},"{city}"\n' + ("\n" if index == 4 else "") for index, city in enumerate(cities)))
+        self.jsonLinesFile = self.__write("zipCodes.jsonl", "".join(
+            f'{{"zipCode": "{10000 + index}"}}\n' + ("\n" if index == 4 else "") for index in range(ROW_COUNT)))
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for variable in ("DATA_ROWS", "DATA_SHARD"):
+            os.environ.pop(variable, None)
+
+    def __write(self, name, content):
+        fileName = os.path.join(self.dataDirectory, name)
+        with open(fileName, "w", encoding="utf-8", newline="") as file:
+            file.write(content)
+        return fileName
+
+    def test_rows_are_streamed_with_their_numbers(self):
+        """
+            Test Case: CSV rows come as dicts keyed by the header and JSON lines as objects, blank lines skipped
+        """
+        self.assertEqual(dataStream.count_rows(self.csvFile), ROW_COUNT)
+        self.assertEqual(dataStream.count_rows(self.jsonLinesFile), ROW_COUNT)
+        csvRows = list(dataStream.stream_rows(self.csvFile))
+        self.assertEqual(csvRows[1], (1, {"zipCode": "10001", "city": "New\nYork"}))
+        self.assertEqual([rowNumber for rowNumber, _ in csvRows], list(range(ROW_COUNT)))
+        self.assertEqual(list(dataStream.stream_rows(self.jsonLinesFile, 4, 6)), [(4, {"zipCode": "10004"}),
+                                                                                   (5, {"zipCode": "10005"})])
+
+    def test_explicit_row_ranges(self):
+        """
+            Test Case: 'start:stop' ranges with either end left open, from the argument or from DATA_ROWS
+        """
+        self.assertEqual(dataStream.get_row_range(self.csvFile, "2:5"), (2, 5))
+        self.assertEqual(dataStream.get_row_range(self.csvFile, ":3"), (0, 3))
+        self.assertEqual(dataStream.get_row_range(self.csvFile, "7:"), (7, None))
+        self.assertEqual(dataStream.get_row_range(self.csvFile), (0, None))
+        os.environ["DATA_ROWS"] = "3:4"
+        os.environ["DATA_SHARD"] = "1/2"
+        self.assertEqual(dataStream.get_row_range(self.csvFile), (3, 4), "AssertionError: DATA_ROWS must win over the shard")
+        self.assertEqual([rowNumber for rowNumber, _ in dataStream.stream_rows(self.csvFile, 7, None)], [7, 8, 9])
+
+    def test_shards_cover_every_row_once(self):
+        """
+            Test Case: The shards of a file are contiguous, about equally long and together cover every row once
+        """
+        for count in (1, 3, 4, ROW_COUNT + 2):
+            rowNumbers = []
+            for index in range(count):
+                start, stop = dataStream.get_row_range(self.jsonLinesFile, shard=f"{index}/{count}")
+                self.assertLessEqual(stop - start, -(-ROW_COUNT // count))
+                rowNumbers.extend(rowNumber for rowNumber, _ in dataStream.stream_rows(self.jsonLinesFile, start, stop))
+            self.assertEqual(rowNumbers, list(range(ROW_COUNT)), f"AssertionError: {count} shards do not cover the rows once")
+
+    def test_a_json_line_that_is_not_an_object_is_rejected(self):
+        """
+            Test Case: A JSON line that is not an object raises with its row number
+        """
+        fileName = self.__write("mixed.jsonl", '{"zipCode": "10001"}\n["10002"]\n')
+        rows = dataStream.stream_rows(fileName)
+        self.assertEqual(next(rows), (0, {"zipCode": "10001"}))
+        with self.assertRaisesRegex(ValueError, "Row 1 of"):
+            next(rows)
@@ -0,0 +1,28 @@
+import os
+import time
+import unittest
+
+from common_.utilities_ import customLogger
+
+# The tests the agents of distributedRunnerTest.py run; the file name does not match the *Test.py discovery pattern
+
+
+class DistributedRunnerSample(unittest.TestCase):
+    def passes(self):
+        customLogger.logger("INFO", "Running %s", self.id(), event="sample_test")
+        time.sleep(float(os.environ.get("SAMPLE_TEST_SECONDS", "0")))
+
+    def test_fails(self):
+        self.fail("This sample test fails on purpose")
+
+    def test_kills_its_agent_once(self):
+        # The first agent to run the test dies; the requeued test passes on another agent
+        markerFile = os.environ.get("SAMPLE_CRASH_MARKER")
+        if markerFile and not os.path.exists(markerFile):
+            open(markerFile, "w").close()
+            os._exit(1)
+
+
+# Eight passing tests: test_passes_0 ... test_passes_7
+for _index in range(8):
+    setattr(DistributedRunnerSample, f"test_passes_{_index}", DistributedRunnerSample.passes)
@@ -0,0 +1,114 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from common_.utilities_ import projectPaths
+from common_.utilities_.distributedRunner import TOKEN_VARIABLE, Coordinator
+
+SAMPLE_TESTS = "tests_.frameworkTests_.distributedRunnerSamples.DistributedRunnerSample"
+
+
+class DistributedRunnerTest(unittest.TestCase):
+    """
+        End to end tests of the distributed runner with a coordinator and worker agents on localhost.
+    """
+
+    def setUp(self):
+        self.runDirectory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.runDirectory)
+        self.environment = {**os.environ, "SAMPLE_CRASH_MARKER": os.path.join(self.runDirectory, "crashed")}
+        self.environment.pop("WORKER_ID", None)
+        self.environment.pop(TOKEN_VARIABLE, None)
+
+    def __start_coordinator(self, testIds, token=""):
+        coordinator = Coordinator(testIds, host="127.0.0.1", port=0, runDirectory=self.runDirectory, heartbeatTimeout=10,
+                                  token=token).start()
+        self.addCleanup(coordinator.stop)
+        return coordinator
+
+    def __start_agent(self, coordinator, agentId):
+        host, port = coordinator.address
+        agent = subprocess.Popen([sys.executable, "-m", "common_.utilities_.distributedRunner", "agent",
+                                  "--coordinator", f"{host}:{port}", "--agent-id", agentId],
+                                 cwd=projectPaths.get_root_directory(), env=self.environment,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.addCleanup(agent.wait, 10)
+        self.addCleanup(agent.kill)
+        return agent
+
+    def __wait_for(self, condition, timeout=30):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "AssertionError: The condition was not met in time")
+            time.sleep(0.05)
+
+    def test_agents_run_every_test_once_and_stream_their_logs(self):
+        """
+            Test Case: Every test is run exactly once across the agents and the agents' logs reach the coordinator
+        """
+        testIds = [f"{SAMPLE_TESTS}.test_passes_{index}" for index in range(5)] + [f"{SAMPLE_TESTS}.test_fails"]
+        coordinator = self.__start_coordinator(testIds)
+        for index in range(3):
+            self.__start_agent(coordinator, f"agent-{index}")
+        self.assertTrue(coordinator.wait(60), "AssertionError: The run did not finish")
+
+        report = coordinator.get_report()
+        statuses = {result["id"].rsplit(".", 1)[-1]: result["status"] for result in report["results"]}
+        self.assertEqual(len(report["results"]), 6)
+        self.assertEqual(statuses, {**{f"test_passes_{index}": "passed" for index in range(5)}, "test_fails": "failed"})
+        self.__wait_for(lambda: any("sample_test" in open(os.path.join(directory, fileName), encoding="utf-8").read()
+                                    for directory, _, fileNames in os.walk(os.path.join(self.runDirectory, "agents_"))
+                                    for fileName in fileNames))
+
+    def test_idle_agent_steals_queued_work(self):
+        """
+            Test Case: An agent that joins after the queue was handed out steals unstarted tests from the busy agent
+        """
+        self.environment["SAMPLE_TEST_SECONDS"] = "0.3"
+        coordinator = self.__start_coordinator([f"{SAMPLE_TESTS}.test_passes_{index}" for index in range(8)])
+        self.__start_agent(coordinator, "first-agent")
+        self.__wait_for(lambda: coordinator.get_report()["queued"] == 0 and coordinator.get_report()["agents"])
+        self.__start_agent(coordinator, "second-agent")
+        self.assertTrue(coordinator.wait(60), "AssertionError: The run did not finish")
+
+        report = coordinator.get_report()
+        finishedTests = {agent["agentId"]: agent["finishedTests"] for agent in report["agents"]}
+        self.assertGreaterEqual(report["steals"], 1)
+        self.assertGreater(finishedTests["second-agent"], 0, "AssertionError: The late agent got no work")
+        self.assertEqual(sum(finishedTests.values()), 8)
+
+    def test_tests_of_a_lost_agent_are_requeued(self):
+        """
+            Test Case: The tests of an agent that dies are run again by another agent
+        """
+        testIds = [f"{SAMPLE_TESTS}.test_kills_its_agent_once"] + [f"{SAMPLE_TESTS}.test_passes_{index}" for index in range(3)]
+        coordinator = self.__start_coordinator(testIds)
+        for index in range(2):
+            self.__start_agent(coordinator, f"agent-{index}")
+        self.assertTrue(coordinator.wait(60), "AssertionError: The run did not finish")
+
+        report = coordinator.get_report()
+        self.assertEqual(report["lostAgents"], 1)
+        self.assertGreaterEqual(report["requeuedTests"], 1)
+        self.assertEqual([result["status"] for result in report["results"]], ["passed"] * 4)
+
+    def test_agents_need_the_shared_token(self):
+        """
+            Test Case: A coordinator with a token drops agents without it and refuses to listen on all interfaces without one
+        """
+        with self.assertRaises(ValueError):
+            Coordinator([], host="0.0.0.0", port=0, runDirectory=self.runDirectory, token="")
+        coordinator = self.__start_coordinator([f"{SAMPLE_TESTS}.test_passes_0"], token="secret")
+        self.environment[TOKEN_VARIABLE] = "wrong"
+        rejectedAgent = self.__start_agent(coordinator, "rejected-agent")
+        self.assertEqual(rejectedAgent.wait(30), 0)
+        self.assertEqual(coordinator.get_report()["agents"], [])
+
+        self.environment[TOKEN_VARIABLE] = "secret"
+        self.__start_agent(coordinator, "trusted-agent")
+        self.assertTrue(coordinator.wait(60), "AssertionError: The run did not finish")
+        self.assertEqual([agent["agentId"] for agent in coordinator.get_report()["agents"]], ["trusted-agent"])
@@ -0,0 +1,159 @@
+import itertools
+import unittest
+
+from selenium.common.exceptions import WebDriverException
+
+from common_.utilities_.driverPool import DriverPool
+
+_sessionIds = itertools.count()
+
+
+class _FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.currentHandle = handle
+
+
+class _FakeDriver:
+    """
+        A WebDriver session that records the calls the pool makes; broken sessions fail every call.
+    """
+
+    def __init__(self):
+        self.session_id = f"fake-session-{next(_sessionIds)}"
+        self.handles = ["main"]
+        self.currentHandle = "main"
+        self.switch_to = _FakeSwitchTo(self)
+        self.url = "https://www.amazon.com/"
+        self.cookies = True
+        self.broken = False
+        self.failingReset = False
+        self.quitCount = 0
+
+    def __check(self):
+        if self.broken:
+            raise WebDriverException("The session is gone")
+
+    @property
+    def window_handles(self):
+        self.__check()
+        return list(self.handles)
+
+    def close(self):
+        self.handles.remove(self.currentHandle)
+
+    def execute_script(self, script, *args):
+        self.__check()
+
+    def delete_all_cookies(self):
+        self.__check()
+        if self.failingReset:
+            raise WebDriverException("The cookies could not be deleted")
+        self.cookies = False
+
+    def get(self, url):
+        self.__check()
+        self.url = url
+
+    def quit(self):
+        self.quitCount += 1
+
+
+class _FakeChromeDriver(_FakeDriver):
+    """
+        A Chrome session: the reset goes through CDP, and every tab shows a page with a frame from another origin.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.cdpCommands = []
+
+    def execute_cdp_cmd(self, command, parameters):
+        self.cdpCommands.append((command, parameters))
+        if command == "Page.getFrameTree":
+            return {"frameTree": {"frame": {"securityOrigin": f"https://{self.currentHandle}.example"},
+                                  "childFrames": [{"frame": {"securityOrigin": "https://ads.example"}},
+                                                  {"frame": {"securityOrigin": "null"}}]}}
+        return {}
+
+
+class DriverPoolTest(unittest.TestCase):
+    """
+        Unit tests of the driver pool's lease, release, reset and replacement paths with fake sessions.
+    """
+
+    def setUp(self):
+        self.pool = DriverPool(driverFactory=_FakeDriver, maxIdle=1)
+
+    def test_a_released_session_is_reset_and_reused(self):
+        """
+            Test Case: The next lease gets the released session back, reset to one blank tab without cookies
+        """
+        driver = self.pool.acquire()
+        driver.handles.append("popup")
+        self.pool.release(driver)
+        self.assertIs(self.pool.acquire(), driver)
+        self.assertEqual((driver.handles, driver.url, driver.cookies), (["main"], "about:blank", False))
+        stats = self.pool.get_stats()
+        self.assertEqual((stats["leases"], stats["hits"], stats["launches"], stats["hitRate"]), (2, 1, 1, 0.5))
+
+    def test_a_kept_state_is_only_handed_to_a_lease_that_keeps_it(self):
+        """
+            Test Case: A session released with keepState continues as it is for keepState leases and is reset otherwise
+        """
+        driver = self.pool.acquire(keepState=True)
+        self.pool.release(driver, keepState=True)
+        self.assertIs(self.pool.acquire(keepState=True), driver)
+        self.assertEqual(driver.url, "https://www.amazon.com/", "AssertionError: The kept state was reset")
+
+        self.pool.release(driver, keepState=True)
+        self.assertIs(self.pool.acquire(), driver)
+        self.assertEqual(driver.url, "about:blank", "AssertionError: A lease got another test's state")
+
+    def test_broken_sessions_are_replaced(self):
+        """
+            Test Case: An idle session that died, or whose reset fails, is quit and replaced with a new one
+        """
+        driver = self.pool.acquire()
+        self.pool.release(driver)
+        driver.broken = True
+        replacement = self.pool.acquire()
+        self.assertIsNot(replacement, driver)
+        self.assertEqual(driver.quitCount, 1)
+
+        replacement.failingReset = True
+        self.pool.release(replacement)
+        self.assertEqual(replacement.quitCount, 1)
+        self.assertEqual(self.pool.get_stats()["replacements"], 2)
+        self.assertNotIn(self.pool.acquire(), (driver, replacement))
+
+    def test_sessions_beyond_the_idle_limit_are_quit(self):
+        """
+            Test Case: With one idle slot, the second released session is quit and shutdown quits every session
+        """
+        first, second = self.pool.acquire(), self.pool.acquire()
+        leased = self.pool.acquire()
+        self.pool.release(first)
+        self.pool.release(second)
+        self.assertEqual((first.quitCount, second.quitCount), (0, 1))
+
+        self.pool.recycle(leased)
+        self.assertEqual((leased.quitCount, self.pool.get_stats()["recycles"]), (1, 1))
+        self.pool.shutdown()
+        self.assertEqual(first.quitCount, 1)
+
+    def test_chrome_sessions_clear_the_storage_of_every_open_origin(self):
+        """
+            Test Case: The reset clears all storage of the origins open in every tab and frame, and then the cookies
+        """
+        pool = DriverPool(driverFactory=_FakeChromeDriver, maxIdle=1)
+        driver = pool.acquire()
+        driver.handles.append("popup")
+        pool.release(driver)
+        clearedOrigins = [parameters for command, parameters in driver.cdpCommands if command == "Storage.clearDataForOrigin"]
+        self.assertEqual(clearedOrigins, [{"origin": origin, "storageTypes": "all"} for origin in
+                                          ("https://ads.example", "https://main.example", "https://popup.example")])
+        self.assertEqual(driver.cdpCommands[-1], ("Network.clearBrowserCookies", {}))
+        self.assertEqual((driver.handles, driver.url), (["main"], "about:blank"))
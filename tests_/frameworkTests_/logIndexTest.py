@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from common_.utilities_ import logIndex
+
+
+def _line(second, event, level="INFO", **fields):
+    return json.dumps({"time": f"2026-01-01T10:00:{second:02d}.000", "level": level, "event": event,
+                       "message": f"{event} at {second}", **fields}) + "\n"
+
+
+class LogIndexTest(unittest.TestCase):
+    """
+        Unit tests of indexing a logs directory incrementally, across rotations, and of querying the index.
+    """
+
+    def setUp(self):
+        self.logsDirectory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.logsDirectory)
+        self.logFile = os.path.join(self.logsDirectory, "log_worker-0.jsonl")
+
+    def __append(self, *lines, fileName=None):
+        with open(fileName or self.logFile, "a", encoding="utf-8") as file:
+            file.writelines(lines)
+
+    def test_only_new_lines_are_indexed(self):
+        """
+            Test Case: A second update indexes only the appended lines; a partly written line waits for the next one
+        """
+        self.__append(_line(1, "find"), _line(2, "click"))
+        self.assertEqual(logIndex.update_index(self.logsDirectory), 2)
+        self.assertEqual(logIndex.update_index(self.logsDirectory), 0)
+
+        self.__append(_line(3, "find"), '{"time": "2026-01-01T10:00:04.000"')
+        self.assertEqual(logIndex.update_index(self.logsDirectory), 1)
+        self.__append(', "event": "click"}\n')
+        self.assertEqual(logIndex.update_index(self.logsDirectory), 1)
+
+    def test_a_rotated_file_keeps_its_lines(self):
+        """
+            Test Case: After a rotation only the new file is indexed, and the old lines are read from the renamed file
+        """
+        self.__append(_line(1, "find"), _line(2, "find"))
+        logIndex.update_index(self.logsDirectory)
+        os.rename(self.logFile, f"{self.logFile}.1")
+        self.__append(_line(3, "find"))
+
+        self.assertEqual(logIndex.update_index(self.logsDirectory), 1, "AssertionError: The rotated file was indexed again")
+        entries = logIndex.query(self.logsDirectory, event="find")
+        self.assertEqual([(entry["message"], entry["file"]) for entry in entries],
+                         [("find at 1", "log_worker-0.jsonl.1"), ("find at 2", "log_worker-0.jsonl.1"),
+                          ("find at 3", "log_worker-0.jsonl")])
+
+        os.remove(f"{self.logFile}.1")
+        logIndex.update_index(self.logsDirectory)
+        self.assertEqual(len(logIndex.query(self.logsDirectory, event="find")), 1)
+
+    def test_query_and_count_by_the_indexed_fields(self):
+        """
+            Test Case: Lines are found by event, level, locator, time range and duration, and counted by event and level
+        """
+        self.__append(_line(1, "find", by="id", value="search", durationMs=5.0),
+                      _line(2, "find", by="id", value="search", durationMs=50.0),
+                      _line(3, "find", by="id", value="cart", durationMs=500.0),
+                      _line(4, "exception", level="ERROR", exception="TimeoutException"))
+        logIndex.update_index(self.logsDirectory)
+
+        slowest = logIndex.query(self.logsDirectory, event="find", locator="id=search", slowest=True)
+        self.assertEqual([entry["durationMs"] for entry in slowest], [50.0, 5.0])
+        self.assertEqual([entry["message"] for entry in logIndex.query(self.logsDirectory, level="ERROR")], ["exception at 4"])
+        self.assertEqual(len(logIndex.query(self.logsDirectory, since="2026-01-01T10:00:02", until="2026-01-01T10:00:04")), 2)
+        self.assertEqual(logIndex.query(self.logsDirectory, event="missing"), [])
+        self.assertEqual(logIndex.count_by(self.logsDirectory), [("find", "INFO", 3), ("exception", "ERROR", 1)])
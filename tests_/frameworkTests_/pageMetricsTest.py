@@ -0,0 +1,38 @@
+import os
+import unittest
+from unittest import mock
+
+from common_.utilities_ import pageMetrics
+
+
+class PageMetricsTest(unittest.TestCase):
+    """
+        Unit tests of reading the page load budgets from PAGE_LOAD_BUDGETS and the test classes.
+    """
+
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_budgets_of_the_environment_are_updated_with_the_class_budgets(self):
+        """
+            Test Case: PAGE_LOAD_BUDGETS is parsed with spaces and empty items, and the class budgets win
+        """
+        os.environ["PAGE_LOAD_BUDGETS"] = "lcpMs=2500, cls=0.1,"
+        self.assertEqual(pageMetrics.get_budgets({"lcpMs": 4000}), {"lcpMs": 4000, "cls": 0.1})
+        os.environ["PAGE_LOAD_BUDGETS"] = ""
+        self.assertEqual(pageMetrics.get_budgets(), {}, "AssertionError: The budgets of the earlier value were kept")
+
+    def test_malformed_budgets_are_rejected_with_a_clear_message(self):
+        """
+            Test Case: A budget that is not 'metric=number', names an unknown metric or is not a number raises ValueError
+        """
+        for value, message in (("lcpMs=2.5s", "'lcpMs=2.5s' is not 'metric=number'"), ("lcpMs", "is not 'metric=number'"),
+                               ("lcp=2500", "'lcp' is not a page metric")):
+            os.environ["PAGE_LOAD_BUDGETS"] = value
+            with self.assertRaisesRegex(ValueError, f"PAGE_LOAD_BUDGETS: .*{message}"):
+                pageMetrics.get_budgets()
+        os.environ["PAGE_LOAD_BUDGETS"] = ""
+        with self.assertRaisesRegex(ValueError, "pageLoadBudgets: the budget of loadMs must be a number"):
+            pageMetrics.get_budgets({"loadMs": "5s"})
@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from common_.utilities_ import parallelRunner
+from common_.utilities_.parallelRunner import RecordingResult
+
+SAMPLE_TESTS = "tests_.frameworkTests_.distributedRunnerSamples.DistributedRunnerSample"
+
+
+class ParallelRunnerTest(unittest.TestCase):
+    """
+        Unit tests of the parallel runner's result records, merged logs and failed shards.
+    """
+
+    def setUp(self):
+        self.reportsDirectory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.reportsDirectory)
+
+    def __write_log(self, name, times):
+        fileName = os.path.join(self.reportsDirectory, name)
+        with open(fileName, "w", encoding="utf-8") as file:
+            file.writelines(json.dumps({"time": time, "message": f"{name} {time}"}) + "\n" for time in times)
+        return fileName
+
+    def test_expected_failures_and_unexpected_successes_are_recorded(self):
+        """
+            Test Case: An expected failure is recorded as passed and an unexpected success as failed
+        """
+        # Defined here, so the runners of this suite do not collect the marked tests themselves
+        class MarkedTests(unittest.TestCase):
+            @unittest.expectedFailure
+            def test_fails_as_expected(self):
+                self.fail("This test fails on purpose")
+
+            @unittest.expectedFailure
+            def test_passes_unexpectedly(self):
+                pass
+
+        result = RecordingResult()
+        unittest.TestLoader().loadTestsFromTestCase(MarkedTests).run(result)
+        self.assertEqual({record["id"].rsplit(".", 1)[1]: record["status"] for record in result.records},
+                         {"test_fails_as_expected": "passed", "test_passes_unexpectedly": "failed"})
+
+    def test_worker_logs_are_merged_in_time_order(self):
+        """
+            Test Case: The logs of two workers, one of them rotated, are merged into one file ordered by time
+        """
+        firstLog = self.__write_log("log_worker-0.jsonl", ["2026-01-01T10:00:03.000"])
+        self.__write_log("log_worker-0.jsonl.1", ["2026-01-01T10:00:00.000", "2026-01-01T10:00:02.000"])
+        secondLog = self.__write_log("log_worker-1.jsonl", ["2026-01-01T10:00:01.000", "2026-01-01T10:00:04.000"])
+        mergedFile = os.path.join(self.reportsDirectory, "log.jsonl")
+
+        logFiles = parallelRunner.merge_log_files([firstLog, secondLog], mergedFile)
+        self.assertEqual(logFiles, [f"{firstLog}.1", firstLog, secondLog])
+        with open(mergedFile, encoding="utf-8") as file:
+            times = [json.loads(line)["time"][-6:-4] for line in file]
+        self.assertEqual(times, ["00", "01", "02", "03", "04"])
+
+    def test_a_dead_worker_fails_only_its_shard(self):
+        """
+            Test Case: The tests of a worker that died are reported as errors and the run still writes its report
+        """
+        testIds = [f"{SAMPLE_TESTS}.test_kills_its_agent_once", f"{SAMPLE_TESTS}.test_passes_0"]
+        with mock.patch.dict(os.environ, {"SAMPLE_CRASH_MARKER": os.path.join(self.reportsDirectory, "crashed")}):
+            os.environ.pop("WORKER_ID", None)
+            report = parallelRunner.run_in_parallel(testIds, 2, reportsDirectory=self.reportsDirectory)
+
+        statuses = {result["id"]: result["status"] for result in report["results"]}
+        self.assertEqual(set(statuses), set(testIds), "AssertionError: Every test must have a result")
+        self.assertEqual(statuses[testIds[0]], "error")
+        self.assertIn("BrokenProcessPool", next(result["traceback"] for result in report["results"]
+                                                if result["id"] == testIds[0]))
+        self.assertTrue(os.path.isfile(report["reportFile"]))
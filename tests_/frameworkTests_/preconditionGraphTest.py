@@ -0,0 +1,101 @@
+import unittest
+
+from common_.utilities_ import preconditionGraph
+from common_.utilities_.preconditionGraph import register_precondition
+
+
+class _FakeDriver:
+    def __init__(self, sessionId):
+        self.session_id = sessionId
+
+
+# Which registered states still hold in the browser, and every setup and restore in the order they ran
+_holds = {}
+_calls = []
+
+
+def _register(name, requires=None, restorable=False, failing=False):
+    """
+        Register a precondition of the sample graph under a name private to these tests.
+    """
+    def setup(driver):
+        _calls.append(f"setup {name}")
+        if failing:
+            raise RuntimeError(f"The setup of {name} failed")
+        _holds[name] = True
+
+    def restore(driver):
+        _calls.append(f"restore {name}")
+        _holds[name] = True
+
+    register_precondition(f"graphTest.{name}", requires=requires and f"graphTest.{requires}",
+                          restore=restore if restorable else None,
+                          verify=lambda driver: _holds.get(name, False))(setup)
+
+
+# home -> popup -> zipCode and home -> popup -> country share 'home' (restorable) and 'popup' (verify only)
+_register("home", restorable=True)
+_register("popup", requires="home")
+_register("zipCode", requires="popup")
+_register("country", requires="popup")
+_register("broken", requires="home", failing=True)
+
+
+class PreconditionGraphTest(unittest.TestCase):
+    """
+        Unit tests of how reach() reuses, verifies, restores and rebuilds the precondition chain of a session.
+    """
+
+    def setUp(self):
+        self.driver = _FakeDriver(f"session-{self.id()}")
+        _holds.clear()
+        del _calls[:]
+        preconditionGraph.reset_stats()
+
+    def __reach(self, name):
+        del _calls[:]
+        return preconditionGraph.reach(self.driver, f"graphTest.{name}")
+
+    def test_a_fresh_session_runs_the_whole_chain(self):
+        """
+            Test Case: Reaching a precondition in a new session runs every setup from the root down
+        """
+        self.assertEqual(self.__reach("zipCode"), 3)
+        self.assertEqual(_calls, ["setup home", "setup popup", "setup zipCode"])
+
+    def test_a_shared_prefix_that_still_holds_is_reused(self):
+        """
+            Test Case: The next test of the session only runs the steps below the deepest shared state that holds
+        """
+        self.__reach("zipCode")
+        self.assertEqual(self.__reach("country"), 1)
+        self.assertEqual(_calls, ["setup country"])
+        self.assertEqual(preconditionGraph.get_stats()["savedSteps"], 2)
+
+    def test_rolls_back_to_a_restorable_state(self):
+        """
+            Test Case: When the shared states no longer hold, the deepest restorable one is restored and the rest rebuilt
+        """
+        self.__reach("zipCode")
+        _holds.clear()
+        self.assertEqual(self.__reach("zipCode"), 3)
+        self.assertEqual(_calls, ["restore home", "setup popup", "setup zipCode"])
+
+    def test_rolls_back_to_the_deepest_state_that_holds(self):
+        """
+            Test Case: A state that no longer holds is skipped in favour of the shared state above it that does
+        """
+        self.__reach("zipCode")
+        _holds["zipCode"] = False
+        self.assertEqual(self.__reach("zipCode"), 1)
+        self.assertEqual(_calls, ["setup zipCode"])
+
+    def test_a_failed_setup_forgets_the_session_state(self):
+        """
+            Test Case: After a setup fails, the next reach does not trust the session and starts from the root
+        """
+        self.__reach("popup")
+        with self.assertRaises(RuntimeError):
+            self.__reach("broken")
+        self.assertEqual(self.__reach("popup"), 2)
+        self.assertEqual(_calls, ["setup home", "setup popup"])
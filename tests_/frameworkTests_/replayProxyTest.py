@@ -0,0 +1,124 @@
+import http.client
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from common_.utilities_.replayProxy import ReplayProxy, RequestMatcher, RECORD, REPLAY, get_shared_proxy
+
+
+class _OriginHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requestCount += 1
+        body = f"origin response for {self.path.split('?')[0]}".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("X-Origin", "local")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayProxyTest(unittest.TestCase):
+    """
+        End to end tests of the record/replay proxy against a local origin server.
+    """
+
+    def setUp(self):
+        self.storeDirectory = tempfile.mkdtemp()
+        self.origin = ThreadingHTTPServer(("127.0.0.1", 0), _OriginHandler)
+        self.origin.requestCount = 0
+        threading.Thread(target=self.origin.serve_forever, daemon=True).start()
+        self.originUrl = f"http://127.0.0.1:{self.origin.server_address[1]}"
+
+    def tearDown(self):
+        self.origin.shutdown()
+        self.origin.server_close()
+        shutil.rmtree(self.storeDirectory)
+
+    def __get_through_proxy(self, proxy, path):
+        host, port = proxy.address.split(":")
+        connection = http.client.HTTPConnection(host, int(port), timeout=10)
+        connection.request("GET", self.originUrl + path)
+        response = connection.getresponse()
+        result = response.status, response.getheader("X-Origin"), response.read()
+        connection.close()
+        return result
+
+    def __start_proxy(self, mode, **kwargs):
+        proxy = ReplayProxy(self.storeDirectory, mode=mode, decryptHttps=False, **kwargs).start()
+        self.addCleanup(proxy.stop)
+        return proxy
+
+    def test_replay_serves_recorded_responses_without_the_origin(self):
+        """
+            Test Case: A response recorded through the proxy is replayed from the store without contacting the origin
+        """
+        recordProxy = self.__start_proxy(RECORD)
+        recorded = self.__get_through_proxy(recordProxy, "/page")
+        self.assertEqual(self.origin.requestCount, 1)
+
+        replayProxy = self.__start_proxy(REPLAY)
+        replayed = self.__get_through_proxy(replayProxy, "/page")
+        self.assertEqual(recorded, replayed, "AssertionError: The replayed response differs from the recorded one")
+        self.assertEqual(self.origin.requestCount, 1, "AssertionError: The origin was contacted in replay mode")
+        self.assertEqual(replayProxy.hits, 1)
+
+    def test_replay_answers_not_recorded_requests_with_404(self):
+        """
+            Test Case: A request that was never recorded is answered with 404 in replay mode
+        """
+        replayProxy = self.__start_proxy(REPLAY)
+        status, _, _ = self.__get_through_proxy(replayProxy, "/missing")
+        self.assertEqual(status, 404)
+        self.assertEqual(replayProxy.misses, 1)
+
+    def test_ignored_query_parameters_match_the_same_recording(self):
+        """
+            Test Case: Requests that only differ in an ignored query parameter are served by the same recording
+        """
+        matcher = RequestMatcher(ignoredQueryParameters=["timestamp"])
+        self.__get_through_proxy(self.__start_proxy(RECORD, matcher=matcher), "/search?q=a&timestamp=1")
+        replayProxy = self.__start_proxy(REPLAY, matcher=matcher)
+        status, _, _ = self.__get_through_proxy(replayProxy, "/search?timestamp=2&q=a")
+        self.assertEqual(status, 200, "AssertionError: The ignored query parameter was part of the request key")
+
+    def test_identical_bodies_are_stored_once(self):
+        """
+            Test Case: Responses with the same content share one object in the content-addressed store
+        """
+        recordProxy = self.__start_proxy(RECORD)
+        self.__get_through_proxy(recordProxy, "/same?variant=1")
+        self.__get_through_proxy(recordProxy, "/same?variant=2")
+        objectCount = sum(len(files) for _, _, files in os.walk(os.path.join(self.storeDirectory, "objects")))
+        self.assertEqual(recordProxy.recorded, 2)
+        self.assertEqual(objectCount, 1, "AssertionError: Identical bodies were stored more than once")
+
+    def test_replay_injects_latency(self):
+        """
+            Test Case: The configured latency is added to every replayed response
+        """
+        self.__get_through_proxy(self.__start_proxy(RECORD), "/slow")
+        replayProxy = self.__start_proxy(REPLAY, latency=0.3)
+        startTime = time.perf_counter()
+        self.__get_through_proxy(replayProxy, "/slow")
+        self.assertGreaterEqual(time.perf_counter() - startTime, 0.3)
+
+    def test_an_unknown_mode_is_rejected(self):
+        """
+            Test Case: A proxy mode, or REPLAY_PROXY_MODE, that is neither record nor replay raises instead of replaying
+        """
+        with self.assertRaisesRegex(ValueError, "not 'Record'"):
+            ReplayProxy(self.storeDirectory, mode="Record", decryptHttps=False)
+        with mock.patch.dict(os.environ, {"REPLAY_PROXY_MODE": "recrod"}), \
+                self.assertRaisesRegex(ValueError, "REPLAY_PROXY_MODE must be one of record, replay"):
+            get_shared_proxy()
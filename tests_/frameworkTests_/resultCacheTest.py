@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from common_.utilities_ import resultCache
+
+PASSING_TEST = "tests_.sampleTest.SampleTest.test_passes"
+FAILING_TEST = "tests_.sampleTest.SampleTest.test_fails"
+OTHER_TEST = "tests_.otherTest.OtherTest.test_other"
+
+# A small project: two test modules, a page object imported by one of them and a data file that module names
+PROJECT_FILES = {
+    "tests_/sampleTest.py": "from pages_.samplePage import SamplePage\nROWS = 'rows.csv'\n",
+    "tests_/otherTest.py": "import json\n",
+    "pages_/samplePage.py": "class SamplePage:\n    pass\n",
+    "testData_/rows.csv": "zipCode\n10001\n",
+}
+
+
+class ResultCacheTest(unittest.TestCase):
+    """
+        Unit tests of the cache keys and the run plans of the result cache, on a throwaway project directory.
+    """
+
+    def setUp(self):
+        self.rootDirectory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.rootDirectory)
+        for name, content in PROJECT_FILES.items():
+            self.__write(name, content)
+        for patcher in (mock.patch.object(resultCache.projectPaths, "get_root_directory", return_value=self.rootDirectory),
+                        mock.patch.dict(os.environ)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for variable in ("SITE_FINGERPRINT", "REPLAY_PROXY_MODE"):
+            os.environ.pop(variable, None)
+
+    def __write(self, name, content):
+        path = self.rootDirectory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    def __run(self, testIds, results):
+        """
+            Plan a run and save the given statuses as its results.
+        """
+        plan = resultCache.plan_run(testIds)
+        resultCache.save_results([{"id": testId, "status": status} for testId, status in results.items()], plan["keys"])
+        return plan
+
+    def test_key_covers_imported_modules_and_named_data_files(self):
+        """
+            Test Case: The key of a test changes with its page objects and data files, and only with its own inputs
+        """
+        keys = resultCache.InputHasher().get_key(PASSING_TEST), resultCache.InputHasher().get_key(OTHER_TEST)
+        self.assertEqual(resultCache.InputHasher().get_key(PASSING_TEST), keys[0], "AssertionError: The key is not stable")
+        self.assertIsNone(resultCache.InputHasher().get_key("tests_.missingTest.MissingTest.test_missing"))
+
+        self.__write("pages_/samplePage.py", "class SamplePage:\n    timeout = 5\n")
+        changedKeys = resultCache.InputHasher().get_key(PASSING_TEST), resultCache.InputHasher().get_key(OTHER_TEST)
+        self.assertNotEqual(changedKeys[0], keys[0], "AssertionError: A page object change kept the key")
+        self.assertEqual(changedKeys[1], keys[1], "AssertionError: A test that does not import the page was invalidated")
+
+        self.__write("testData_/rows.csv", "zipCode\n10002\n")
+        self.assertNotEqual(resultCache.InputHasher().get_key(PASSING_TEST), changedKeys[0],
+                            "AssertionError: A data file change kept the key")
+        self.assertNotEqual(resultCache.InputHasher("site-b").get_key(OTHER_TEST), keys[1],
+                            "AssertionError: Another site fingerprint kept the key")
+
+    def test_unchanged_passed_tests_are_skipped_and_failed_tests_run_first(self):
+        """
+            Test Case: A passed test with unchanged inputs is left out, a failed one runs first, a new one runs
+        """
+        self.__run([PASSING_TEST, FAILING_TEST], {PASSING_TEST: "passed", FAILING_TEST: "failed"})
+
+        plan = resultCache.plan_run([OTHER_TEST, PASSING_TEST, FAILING_TEST])
+        self.assertEqual(plan["run"], [FAILING_TEST, OTHER_TEST])
+        self.assertEqual(plan["failedFirst"], [FAILING_TEST])
+        self.assertEqual(plan["cached"], [PASSING_TEST])
+
+        lastPlan = resultCache.plan_run([OTHER_TEST, PASSING_TEST, FAILING_TEST], mode="last")
+        self.assertEqual(lastPlan["run"], [FAILING_TEST, OTHER_TEST, PASSING_TEST])
+        self.assertEqual(lastPlan["cached"], [])
+
+    def test_changed_inputs_invalidate_a_passed_test(self):
+        """
+            Test Case: A passed test runs again once a module it imports changes, and is cached again after it passes
+        """
+        self.__run([PASSING_TEST], {PASSING_TEST: "passed"})
+        self.__write("pages_/samplePage.py", "class SamplePage:\n    timeout = 5\n")
+        self.assertEqual(self.__run([PASSING_TEST], {PASSING_TEST: "passed"})["run"], [PASSING_TEST])
+        self.assertEqual(resultCache.plan_run([PASSING_TEST])["cached"], [PASSING_TEST])
+
+    def test_a_failed_sub_test_fails_the_whole_test(self):
+        """
+            Test Case: A test with a passed and a failed sub-test is cached with the worst status and runs again
+        """
+        plan = resultCache.plan_run([PASSING_TEST])
+        resultCache.save_results([{"id": f"{PASSING_TEST} (row=2)", "status": "failed"},
+                                  {"id": PASSING_TEST, "status": "passed"}], plan["keys"])
+        self.assertEqual(resultCache.load_cache()[PASSING_TEST]["status"], "failed")
+        self.assertEqual(resultCache.plan_run([PASSING_TEST])["failedFirst"], [PASSING_TEST])
@@ -0,0 +1,132 @@
+import time
+import unittest
+
+from common_.utilities_ import waitEngine
+from common_.utilities_.waitEngine import WaitEngine
+from pages_.basePage import BasePage
+
+STEP_TIMEOUT = 0.3
+
+
+class _FakeDriver:
+    session_id = "wait-engine-test"
+
+
+def _never(driver):
+    return False
+
+
+class _SamplePage(BasePage):
+    def __init__(self, driver):
+        super().__init__(driver)
+        self.waitEngine = WaitEngine(driver, stepTimeout=STEP_TIMEOUT)
+
+    def wait_twice(self, timeout):
+        """
+            A step with two waits for conditions that are never met.
+        """
+        self.waitEngine.is_met(_never, timeout)
+        self.waitEngine.is_met(_never, timeout)
+
+    def wait_in_branch(self, early, timeout):
+        """
+            A step whose one wait is in either arm of an if.
+        """
+        if early:
+            self.waitEngine.is_met(_never, timeout)
+        else:
+            time.sleep(0)
+            self.waitEngine.is_met(_never, timeout)
+
+    def wait_in_loop(self, count, timeout):
+        """
+            A step that waits in a loop.
+        """
+        for _ in range(count):
+            self.waitEngine.is_met(_never, timeout)
+
+    def wait_in_nested_step(self, timeout):
+        """
+            A step that waits and then calls another step.
+        """
+        self.waitEngine.is_met(_never, timeout)
+        self.wait_twice(timeout)
+
+
+class WaitEngineTest(unittest.TestCase):
+    """
+        Unit tests of the step budget the waits of one page object step share.
+    """
+
+    def setUp(self):
+        self.driver = _FakeDriver()
+        waitEngine.reset_wait_seconds(self.driver)
+
+    def __time(self, function, *args):
+        startTime = time.perf_counter()
+        function(*args)
+        return time.perf_counter() - startTime
+
+    def test_waits_of_one_step_share_its_budget(self):
+        """
+            Test Case: Two waits of 1 s in one step end together when the 0.3 s step budget is used up
+        """
+        seconds = self.__time(_SamplePage(self.driver).wait_twice, 1.0)
+        self.assertGreaterEqual(seconds, STEP_TIMEOUT)
+        self.assertLess(seconds, STEP_TIMEOUT + 0.2, "AssertionError: The second wait got a budget of its own")
+
+    def test_every_call_of_a_step_gets_a_new_budget(self):
+        """
+            Test Case: Calling the same step again, from the same line, starts a new budget instead of the spent one
+        """
+        page = _SamplePage(self.driver)
+        durations = []
+        for _ in range(3):
+            startTime = time.perf_counter()
+            page.wait_twice(1.0)
+            durations.append(time.perf_counter() - startTime)
+        self.assertGreaterEqual(min(durations), STEP_TIMEOUT, "AssertionError: A later call inherited a spent budget")
+
+    def test_a_call_that_takes_another_branch_gets_a_new_budget(self):
+        """
+            Test Case: A call of a step that waits in another arm of an if than the previous call does not inherit its
+            spent budget
+        """
+        page = _SamplePage(self.driver)
+        page.wait_in_branch(True, 1.0)
+        startTime = time.perf_counter()
+        page.wait_in_branch(False, 1.0)
+        self.assertGreaterEqual(time.perf_counter() - startTime, STEP_TIMEOUT,
+                                "AssertionError: The call inherited the spent budget of the previous one")
+
+    def test_waits_in_a_loop_share_the_budget_of_the_step(self):
+        """
+            Test Case: Three waits of 1 s in a loop of one step end together when the step budget is used up
+        """
+        seconds = self.__time(_SamplePage(self.driver).wait_in_loop, 3, 1.0)
+        self.assertLess(seconds, STEP_TIMEOUT + 0.2, "AssertionError: Every iteration got a budget of its own")
+
+    def test_a_nested_step_shares_the_budget_of_the_outer_step(self):
+        """
+            Test Case: A step called by another step does not extend the outer step's budget
+        """
+        seconds = self.__time(_SamplePage(self.driver).wait_in_nested_step, 1.0)
+        self.assertLess(seconds, STEP_TIMEOUT + 0.2, "AssertionError: The nested step got a budget of its own")
+
+    def test_waits_outside_page_objects_use_their_own_timeout(self):
+        """
+            Test Case: A wait outside any page object step is only limited by its own timeout
+        """
+        engine = WaitEngine(self.driver, stepTimeout=0.05)
+        seconds = self.__time(engine.is_met, _never, 0.2)
+        self.assertGreaterEqual(seconds, 0.2)
+
+    def test_wait_time_is_added_to_the_session(self):
+        """
+            Test Case: The time spent in waits is added up per session until it is reset
+        """
+        WaitEngine(self.driver).is_met(_never, 0.1)
+        waitEngine.add_wait_seconds(self.driver, 0.5)
+        self.assertGreaterEqual(waitEngine.get_wait_seconds(self.driver), 0.6)
+        waitEngine.reset_wait_seconds(self.driver)
+        self.assertEqual(waitEngine.get_wait_seconds(self.driver), 0.0)
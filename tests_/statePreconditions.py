@@ -0,0 +1,66 @@
+from common_.utilities_ import elementCache, launchProfiles, pageMetrics, waitEngine
+from common_.utilities_.preconditionGraph import register_precondition
+from pages_.navigationBar_.navigationBar import NavigationBar
+from pages_.navigationBar_.updateDeliveryLocationPopup import UpdateDeliveryLocationPopup
+from testData_.data import mainPageUrl, zipCodeData
+
+
+def refresh_page(driver):
+    """
+        Reload the current page. refresh() does not go through the listener hooks, so the bytes of the page that is
+        left are counted, cached elements are invalidated and the page metrics of the reload are collected here.
+    """
+    launchProfiles.measure_pending_navigation(driver)
+    driver.refresh()
+    elementCache.notify_navigation(driver)
+    pageMetrics.record_navigation(driver, "refresh")
+
+
+def refresh_if_home_page_is_broken(driver):
+    """
+        Refresh the home page if it was loaded incorrectly (the nav bar's location block is missing).
+    """
+    navigationBarObj = NavigationBar(driver)
+    if not navigationBarObj.is_update_location_button_visible(waitEngine.QUICK_CHECK_TIMEOUT):
+        refresh_page(driver)
+
+
+def clear_session_and_load_home_page(driver):
+    """
+        Go back to a freshly loaded home page from any state: the cookies and the storage are cleared first, so nothing
+        a previous test changed (e.g. the delivery location) is carried over.
+    """
+    driver.delete_all_cookies()
+    driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+    load_home_page(driver)
+
+
+@register_precondition("home_loaded", restore=clear_session_and_load_home_page)
+def load_home_page(driver):
+    driver.get(mainPageUrl)
+    refresh_if_home_page_is_broken(driver)
+
+
+@register_precondition("glux_popup_open", requires="home_loaded",
+                       verify=lambda driver: UpdateDeliveryLocationPopup(driver).is_ready_for_zip_code_entry())
+def open_glux_popup(driver):
+    NavigationBar(driver).click_update_location_button()
+
+
+def set_delivery_location_by_zip_code(driver, zipCode):
+    """
+        Set the delivery location through the GLUX popup of the home page.
+    """
+    driver.get(mainPageUrl)
+    NavigationBar(driver).click_update_location_button()
+    updateDeliveryLocationPopupObj = UpdateDeliveryLocationPopup(driver)
+    updateDeliveryLocationPopupObj.fill_zip_code_field(zipCode)
+    updateDeliveryLocationPopupObj.click_apply_button()
+    updateDeliveryLocationPopupObj.click_continue_button()
+    updateDeliveryLocationPopupObj.wait_for_delivery_country_name(str(zipCode))
+
+
+# The UI steps of every named precondition, run once and then replaced by the saved state snapshot
+STATE_PRECONDITIONS = {
+    "location_set_to_valid_zip_code": lambda driver: set_delivery_location_by_zip_code(driver, zipCodeData["validZipCode"]),
+}